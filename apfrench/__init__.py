@@ -0,0 +1,27 @@
+"""
+AP French Practice Quiz - shared, display-free core.
+
+The quiz window is apfrench.gui and `python3 -m apfrench` runs it; the
+ap-french-quiz-1.py, -2.py and -3.py scripts are presets of that launcher
+(see apfrench.launch).
+"""
+
+# Public names are imported on first use so that `import apfrench` stays
+# cheap and `python3 -m apfrench.<module>` does not import that module twice.
+_EXPORTS = {
+    "Bank": "apfrench.bank",
+    "open_default_bank": "apfrench.bank",
+    "QuizEngine": "apfrench.engine",
+    "Question": "apfrench.question",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'apfrench' has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
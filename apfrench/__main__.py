@@ -0,0 +1,5 @@
+"""Run the quiz: python3 -m apfrench [options] (see apfrench.launch)."""
+
+from apfrench.launch import main
+
+main()
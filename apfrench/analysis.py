@@ -0,0 +1,320 @@
+"""
+Item analysis
+-------------
+Classical test statistics for every question, computed from the results
+journal so teachers can see which questions are too easy, which ones do
+not separate strong from weak students, and which distractors nobody
+falls for:
+
+    p-value         share of students who answered the question right
+    discrimination  point-biserial correlation between getting the
+                    question right and the student's score on the other
+                    questions they answered (the corrected item-rest
+                    correlation)
+    choice rates    share of students who picked each choice (timeouts
+                    make up the rest)
+    choice spread   for each choice, its rate among the top 27% of
+                    students minus its rate among the bottom 27%; the
+                    answer should be positive and the distractors
+                    negative
+
+Only each student's first attempt at a question counts. The students x
+questions matrix is kept in coordinate form, one entry per answered cell,
+because students only ever see a fraction of a large bank; every
+statistic is a NumPy bincount over those entries, so the cost is linear in
+the number of answers and no dense matrix is built.
+
+NumPy is needed to compute the statistics (`pip install numpy`), but not
+to read them: they are saved next to the bank (questions.apfq ->
+questions.stats) as flat arrays that ItemStats.load reads with the
+standard library, so the quiz can use them without NumPy.
+
+File layout (little-endian):
+
+    header   "<4sHHI"   magic b"APFI", format version, choices per
+             question, count
+    arrays   attempts "I" * count, p_value "f" * count,
+             discrimination "f" * count, choice_rate "f" * (count * choices),
+             choice_spread "f" * (count * choices)
+    NaN marks a statistic that could not be computed (no answers, or
+    everybody right / everybody wrong).
+
+Command line:
+    python3 -m apfrench.analysis [JOURNAL] [--bank PATH] [--show N] [--no-save]
+"""
+
+import math
+import os
+import struct
+import sys
+import time
+from array import array
+
+from apfrench.bank import DEFAULT_BANK_PATH
+from apfrench.journal import _HEADER as _JOURNAL_HEADER
+from apfrench.journal import DEFAULT_JOURNAL_PATH, RECORD, _check_header
+from apfrench.question import CHOICES_PER_QUESTION
+
+MAGIC = b"APFI"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHI")
+
+GROUP_FRACTION = 0.27       # size of the top / bottom groups for choice spread
+
+# Thresholds for the report (common rules of thumb for classroom tests)
+TOO_EASY = 0.95
+TOO_HARD = 0.20
+LOW_DISCRIMINATION = 0.20
+UNUSED_DISTRACTOR = 0.02
+
+
+def stats_path(bank_path=DEFAULT_BANK_PATH):
+    """Where the statistics of a bank are kept: next to it, with a .stats extension."""
+    return os.path.splitext(bank_path)[0] + ".stats"
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("item analysis needs NumPy: pip install numpy") from None
+    return numpy
+
+
+# ---------------------------
+# Results
+# ---------------------------
+class ItemStats:
+    """Per-question statistics in flat arrays, indexed by bank position."""
+    _ARRAYS = (("attempts", "I", 1), ("p_value", "f", 1), ("discrimination", "f", 1),
+               ("choice_rate", "f", CHOICES_PER_QUESTION), ("choice_spread", "f", CHOICES_PER_QUESTION))
+
+    def __init__(self, count):
+        self.attempts = array("I", bytes(4 * count))
+        self.p_value = array("f", [math.nan]) * count
+        self.discrimination = array("f", [math.nan]) * count
+        self.choice_rate = array("f", [math.nan]) * (count * CHOICES_PER_QUESTION)
+        self.choice_spread = array("f", [math.nan]) * (count * CHOICES_PER_QUESTION)
+        self.students = 0
+        self.elapsed = 0.0
+
+    def __len__(self):
+        return len(self.attempts)
+
+    def choices(self, qid):
+        """(rates, spreads) of question `qid`, one entry per choice."""
+        start = qid * CHOICES_PER_QUESTION
+        end = start + CHOICES_PER_QUESTION
+        return self.choice_rate[start:end].tolist(), self.choice_spread[start:end].tolist()
+
+    def flags(self, qid, answer):
+        """
+        Problems worth a teacher's look, as short phrases.
+        :param answer: index of the question's correct choice
+        """
+        if not self.attempts[qid]:
+            return []
+        found = []
+        p = self.p_value[qid]
+        r = self.discrimination[qid]
+        if p >= TOO_EASY:
+            found.append("too easy")
+        elif p <= TOO_HARD:
+            found.append("too hard")
+        if r < 0:
+            found.append("negative discrimination (check the answer key)")
+        elif r < LOW_DISCRIMINATION:
+            found.append("low discrimination")
+        rates, spreads = self.choices(qid)
+        for c in range(CHOICES_PER_QUESTION):
+            if c == answer:
+                continue
+            if rates[c] < UNUSED_DISTRACTOR:
+                found.append(f"choice {'ABCD'[c]} is never chosen")
+            elif spreads[c] > 0:
+                found.append(f"choice {'ABCD'[c]} attracts strong students")
+        return found
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+    def save(self, path):
+        """Write the statistics atomically."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, CHOICES_PER_QUESTION, len(self)))
+            for name, _, _ in self._ARRAYS:
+                arr = getattr(self, name)
+                if sys.byteorder == "big":
+                    arr = array(arr.typecode, arr)
+                    arr.byteswap()
+                arr.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read statistics saved by save() (no NumPy needed)."""
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{path}: not an item statistics file")
+        magic, version, choices, count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION or choices != CHOICES_PER_QUESTION:
+            raise ValueError(f"{path}: not an item statistics file")
+        stats = cls(0)
+        pos = _HEADER.size
+        for name, typecode, per_question in cls._ARRAYS:
+            arr = array(typecode)
+            end = pos + arr.itemsize * per_question * count
+            arr.frombytes(data[pos:end])
+            if sys.byteorder == "big":
+                arr.byteswap()
+            setattr(stats, name, arr)
+            pos = end
+        return stats
+
+
+# ---------------------------
+# Computation
+# ---------------------------
+def load_events(path=DEFAULT_JOURNAL_PATH):
+    """The whole journal as a NumPy structured array (one read, no per-event Python)."""
+    np = _numpy()
+    _check_header(path)
+    dtype = np.dtype([("student", "<u4"), ("question", "<u4"), ("chosen", "i1"), ("correct", "u1"),
+                      ("response_ms", "<u4"), ("timestamp", "<f8")])
+    assert dtype.itemsize == RECORD.size
+    # A truncated last record (see apfrench.journal) is left out
+    count = (os.path.getsize(path) - _JOURNAL_HEADER.size) // RECORD.size
+    return np.fromfile(path, dtype=dtype, count=count, offset=_JOURNAL_HEADER.size)
+
+
+def analyze(events, count=None):
+    """
+    :param events: structured array from load_events()
+    :param count: number of questions in the bank (default: highest id seen + 1);
+                  answers to questions beyond it are ignored
+    :return: ItemStats
+    """
+    np = _numpy()
+    t0 = time.perf_counter()
+    if count is None:
+        count = int(events["question"].max()) + 1 if len(events) else 0
+    events = events[events["question"] < count]
+
+    # First attempt per (student, question): the journal is in time order
+    # and np.unique reports the first occurrence of each key
+    students, student = np.unique(events["student"], return_inverse=True)
+    question = events["question"].astype(np.int64)
+    _, first = np.unique(student.astype(np.int64) * count + question, return_index=True)
+    student = student[first]
+    question = question[first]
+    chosen = events["chosen"][first].astype(np.int64)
+    correct = events["correct"][first].astype(np.float64)
+
+    # Student scores; students with a single answer have no rest score
+    answered = np.bincount(student, minlength=len(students)).astype(np.float64)
+    right = np.bincount(student, weights=correct, minlength=len(students))
+    keep = answered[student] >= 2
+    student, question, chosen, correct = student[keep], question[keep], chosen[keep], correct[keep]
+
+    n = np.bincount(question, minlength=count).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = np.bincount(question, weights=correct, minlength=count) / n
+
+        # Point-biserial against the rest score (share right on the other
+        # questions), from per-question sums of rest, rest^2 and rest * correct
+        rest = (right[student] - correct) / (answered[student] - 1)
+        mean_rest = np.bincount(question, weights=rest, minlength=count) / n
+        var_rest = np.bincount(question, weights=rest * rest, minlength=count) / n - mean_rest ** 2
+        cov = np.bincount(question, weights=rest * correct, minlength=count) / n - p * mean_rest
+        r = cov / np.sqrt(var_rest * p * (1 - p))
+
+        # Choice rates over all attempts, and top-minus-bottom group rates
+        picked = chosen >= 0
+        cell = question * CHOICES_PER_QUESTION + chosen
+        size = count * CHOICES_PER_QUESTION
+        rates = np.bincount(cell[picked], minlength=size).reshape(count, -1) / n[:, None]
+
+        score = right / answered
+        scored = answered >= 2
+        low, high = np.quantile(score[scored], [GROUP_FRACTION, 1 - GROUP_FRACTION]) if scored.any() else (0, 0)
+        spreads = np.zeros((count, CHOICES_PER_QUESTION))
+        for group, sign in ((score[student] >= high, 1), (score[student] <= low, -1)):
+            group_n = np.bincount(question[group], minlength=count)[:, None]
+            group_picked = group & picked
+            group_rates = np.bincount(cell[group_picked], minlength=size).reshape(count, -1) / group_n
+            spreads += sign * group_rates
+
+    stats = ItemStats(0)
+    stats.attempts = array("I", n.astype(np.uint32).tobytes())
+    stats.p_value = array("f", p.astype(np.float32).tobytes())
+    stats.discrimination = array("f", r.astype(np.float32).tobytes())
+    stats.choice_rate = array("f", rates.astype(np.float32).tobytes())
+    stats.choice_spread = array("f", spreads.astype(np.float32).tobytes())
+    stats.students = int(np.count_nonzero(scored))
+    stats.elapsed = time.perf_counter() - t0
+    return stats
+
+
+# ---------------------------
+# Command line
+# ---------------------------
+def _fmt(value, spec):
+    return "-" if math.isnan(value) else format(value, spec)
+
+
+def main(argv=None):
+    import argparse
+
+    from apfrench.bank import Bank, open_default_bank
+
+    parser = argparse.ArgumentParser(prog="python3 -m apfrench.analysis",
+                                     description="Item analysis: difficulty, discrimination and distractors.")
+    parser.add_argument("journal", nargs="?", default=DEFAULT_JOURNAL_PATH)
+    parser.add_argument("--bank", metavar="PATH",
+                        help="the bank the journal's answers refer to (default: the quiz's bank)")
+    parser.add_argument("--show", type=int, default=20, metavar="N",
+                        help="list the N questions with the most problems (default 20)")
+    parser.add_argument("--no-save", action="store_true", help="do not write the statistics next to the bank")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        events = load_events(args.journal)
+    except FileNotFoundError:
+        raise SystemExit(f"No journal at {args.journal} yet: answers are logged there as the quiz is taken.") from None
+    load_s = time.perf_counter() - t0
+    with Bank(args.bank) if args.bank else open_default_bank() as bank:
+        stats = analyze(events, len(bank))
+        flagged = []
+        for qid in range(len(bank)):
+            if stats.attempts[qid]:
+                found = stats.flags(qid, bank[qid].answer)
+                if found:
+                    flagged.append((len(found), qid, found))
+        flagged.sort(key=lambda entry: (-entry[0], entry[1]))
+
+        print(f"{'id':>8} {'answers':>8} {'p':>5} {'r_pb':>6}  {'A':>5} {'B':>5} {'C':>5} {'D':>5}  question")
+        for _, qid, found in flagged[:args.show]:
+            rates, _ = stats.choices(qid)
+            marks = " ".join(f"{_fmt(rate, '.0%'):>4}{'*' if c == bank[qid].answer else ' '}"
+                             for c, rate in enumerate(rates))
+            print(f"{qid:>8} {stats.attempts[qid]:>8,} {_fmt(stats.p_value[qid], '.2f'):>5} "
+                  f"{_fmt(stats.discrimination[qid], '.2f'):>6}  {marks}  {bank[qid].question[:40]}")
+            print(f"{'':>8} {'; '.join(found)}")
+
+    answered = sum(1 for a in stats.attempts if a)
+    print(f"\n{len(events):,} answers, {stats.students:,} students, {answered:,} of {len(stats):,} questions "
+          f"answered; {len(flagged):,} flagged")
+    print(f"journal read in {load_s:.2f}s, analysis {stats.elapsed:.2f}s")
+    if not args.no_save:
+        path = stats_path(bank.path)
+        stats.save(path)
+        print(f"Statistics saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Listening clips
+---------------
+Audio for listening questions (Question.audio): decoding, a cache of
+decoded clips, and playback on a background thread.
+
+Clips are .wav files (read with the standard library) or .ogg files
+(decoded with soundfile: pip install soundfile). Either way they are
+decoded a chunk at a time (CHUNK_FRAMES frames, about 0.1 s) and played
+as the chunks come, so playback starts after the first chunk instead of
+after the whole clip, and a long clip never has to fit in memory.
+
+Decoded clips are kept in an LRU with a byte budget (ClipCache): a clip
+played once is replayed from memory, and the GUI decodes the next
+question's clip on its prefetch thread while the feedback is shown, so a
+listening question starts playing at once. Clips larger than the budget
+are streamed every time.
+
+Sound goes to the first output available: the sounddevice package
+(PortAudio), or ALSA's aplay, which every Raspberry Pi OS has.
+
+Command line (plays a clip and reports how long playback took to start):
+    python3 -m apfrench.audio CLIP
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from collections import OrderedDict, namedtuple
+
+AUDIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio")
+CHUNK_FRAMES = 4096
+STOP_TIMEOUT = 0.5      # seconds play() waits for the previous clip to stop
+DEFAULT_BUDGET = 32 << 20     # bytes of decoded audio kept in memory
+
+ClipInfo = namedtuple("ClipInfo", "channels sample_width rate")
+Clip = namedtuple("Clip", "info chunks size")
+
+
+class AudioError(RuntimeError):
+    """A clip cannot be decoded or played."""
+
+
+def clip_path(name, root=AUDIO_DIR):
+    """Where a Question.audio clip is: absolute paths as they are, others under `root`."""
+    return name if os.path.isabs(name) else os.path.join(root, name)
+
+
+def _soundfile():
+    try:
+        import soundfile
+    except ImportError:
+        raise AudioError("OGG clips need soundfile: pip install soundfile") from None
+    return soundfile
+
+
+# ---------------------------
+# Decoding
+# ---------------------------
+def stream(path, chunk_frames=CHUNK_FRAMES):
+    """
+    Open a clip and decode it lazily.
+    :return: (ClipInfo, iterator of PCM chunks as bytes); the file is opened
+        now (so a missing or unreadable clip fails here) and read as the
+        iterator is consumed
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".wav":
+        try:
+            f = wave.open(path, "rb")
+        except wave.Error as e:
+            raise AudioError(f"{path}: {e}") from None
+        info = ClipInfo(f.getnchannels(), f.getsampwidth(), f.getframerate())
+        return info, _wave_chunks(f, chunk_frames)
+    if extension in (".ogg", ".oga"):
+        sf = _soundfile()
+        try:
+            f = sf.SoundFile(path)
+        except RuntimeError as e:
+            raise AudioError(f"{path}: {e}") from None
+        return ClipInfo(f.channels, 2, f.samplerate), _soundfile_chunks(f, chunk_frames)
+    raise AudioError(f"{path}: unsupported audio format (use .wav or .ogg)")
+
+
+def _wave_chunks(f, chunk_frames):
+    with f:
+        while True:
+            data = f.readframes(chunk_frames)
+            if not data:
+                return
+            yield data
+
+
+def _soundfile_chunks(f, chunk_frames):
+    with f:
+        for block in f.blocks(blocksize=chunk_frames, dtype="int16"):
+            yield block.tobytes()
+
+
+class ClipCache:
+    """Decoded clips, least recently used first out once over the byte budget."""
+    def __init__(self, max_bytes=DEFAULT_BUDGET, root=AUDIO_DIR):
+        self.max_bytes = max_bytes
+        self.root = root
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._clips = OrderedDict()
+        self._lock = threading.Lock()   # the GUI and its prefetch thread share the cache
+
+    def __len__(self):
+        return len(self._clips)
+
+    def __contains__(self, name):
+        return clip_path(name, self.root) in self._clips
+
+    def _get(self, path):
+        with self._lock:
+            clip = self._clips.get(path)
+            if clip is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._clips.move_to_end(path)
+            return clip
+
+    def _put(self, path, clip):
+        with self._lock:
+            old = self._clips.pop(path, None)
+            if old is not None:
+                self.size -= old.size
+            self._clips[path] = clip
+            self.size += clip.size
+            while self.size > self.max_bytes:
+                _, evicted = self._clips.popitem(last=False)
+                self.size -= evicted.size
+
+    def open(self, name):
+        """
+        (ClipInfo, iterator of PCM chunks) for a clip: from memory if it is
+        cached, otherwise decoded as it is played and cached once complete.
+        """
+        path = clip_path(name, self.root)
+        clip = self._get(path)
+        if clip is not None:
+            return clip.info, iter(clip.chunks)
+        info, chunks = stream(path)
+        return info, self._keep(path, info, chunks)
+
+    def _keep(self, path, info, chunks):
+        kept = []
+        size = 0
+        for chunk in chunks:
+            if kept is not None:
+                kept.append(chunk)
+                size += len(chunk)
+                if size > self.max_bytes:
+                    kept = None     # too big to cache: stream it every time
+            yield chunk
+        if kept is not None:
+            self._put(path, Clip(info, kept, size))
+
+    def load(self, name):
+        """Decode a whole clip into the cache (e.g. ahead of its question); returns it, or None if too big."""
+        path = clip_path(name, self.root)
+        clip = self._get(path)
+        if clip is None:
+            info, chunks = stream(path)
+            for _ in self._keep(path, info, chunks):
+                pass
+            with self._lock:
+                clip = self._clips.get(path)
+        return clip
+
+
+# ---------------------------
+# Playback
+# ---------------------------
+_SOUNDDEVICE_TYPES = {1: "uint8", 2: "int16", 3: "int24", 4: "int32"}
+_APLAY_FORMATS = {1: "U8", 2: "S16_LE", 3: "S24_3LE", 4: "S32_LE"}
+
+
+class _SoundDeviceOutput:
+    """PortAudio errors (no output device, device unplugged...) are raised as AudioError."""
+    def __init__(self, info):
+        import sounddevice
+        self._errors = sounddevice.PortAudioError
+        try:
+            self._stream = sounddevice.RawOutputStream(samplerate=info.rate, channels=info.channels,
+                                                       dtype=_SOUNDDEVICE_TYPES[info.sample_width])
+            self._stream.start()
+        except self._errors as e:
+            raise AudioError(f"cannot open the audio output: {e}") from e
+
+    def write(self, data):
+        try:
+            self._stream.write(data)
+        except self._errors as e:
+            raise AudioError(f"audio output failed: {e}") from e
+
+    def close(self):
+        try:
+            self._stream.stop()
+            self._stream.close()
+        except self._errors as e:
+            raise AudioError(f"audio output failed: {e}") from e
+
+
+class _AplayOutput:
+    def __init__(self, info):
+        self._process = subprocess.Popen(
+            ["aplay", "-q", "-t", "raw", "-f", _APLAY_FORMATS[info.sample_width],
+             "-c", str(info.channels), "-r", str(info.rate)],
+            stdin=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def write(self, data):
+        self._process.stdin.write(data)
+
+    def close(self):
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._process.wait()
+
+
+def default_output(info):
+    """An open audio output for clips of this format (sounddevice, else aplay)."""
+    try:
+        import sounddevice  # noqa: F401
+    except (ImportError, OSError):   # OSError: PortAudio itself is missing
+        pass
+    else:
+        return _SoundDeviceOutput(info)
+    if shutil.which("aplay"):
+        return _AplayOutput(info)
+    raise AudioError("no audio output: pip install sounddevice, or install ALSA's aplay")
+
+
+class Player:
+    """Plays one clip at a time on a background thread."""
+    def __init__(self, clips=None, output=default_output):
+        """
+        :param clips: ClipCache to play from (default: a new one)
+        :param output: function(ClipInfo) -> object with write(bytes) and close()
+        """
+        self.clips = ClipCache() if clips is None else clips
+        self.output = output
+        self.error = None           # what stopped the last clip, if anything did
+        self.start_latency = None   # seconds from play() to the first chunk being written
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def playing(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def play(self, name):
+        """Stop any clip being played and start this one (opening errors are raised here)."""
+        self.stop()
+        if self._thread is not None:
+            # The previous clip ends after its current chunk; wait for it so two clips never overlap
+            self._thread.join(STOP_TIMEOUT)
+        requested = time.perf_counter()
+        info, chunks = self.clips.open(name)
+        self.error = None
+        self.start_latency = None
+        stop = self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(info, chunks, stop, requested),
+                                        name="audio", daemon=True)
+        self._thread.start()
+
+    def _run(self, info, chunks, stop, requested):
+        out = None
+        try:
+            for chunk in chunks:
+                if stop.is_set():
+                    break
+                if out is None:
+                    out = self.output(info)
+                out.write(chunk)
+                if self.start_latency is None:
+                    self.start_latency = time.perf_counter() - requested
+        except (AudioError, OSError) as e:
+            self.error = e
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+            if out is not None:
+                try:
+                    out.close()
+                except (AudioError, OSError) as e:
+                    if self.error is None:
+                        self.error = e
+
+    def stop(self):
+        """Stop the clip being played (returns at once; the thread ends after its current chunk)."""
+        self._stop.set()
+
+    def wait(self):
+        """Block until the clip being played has ended."""
+        if self._thread is not None:
+            self._thread.join()
+
+
+# ---------------------------
+# Command line
+# ---------------------------
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python3 -m apfrench.audio", description="Play a listening clip.")
+    parser.add_argument("clip", help=f".wav or .ogg file (relative paths: under {AUDIO_DIR} or the current folder)")
+    args = parser.parse_args(argv)
+
+    name = args.clip if os.path.exists(args.clip) else clip_path(args.clip)
+    player = Player()
+    try:
+        player.play(os.path.abspath(name))
+        player.wait()
+    except (AudioError, OSError) as e:
+        raise SystemExit(str(e)) from None
+    if player.error is not None:
+        raise SystemExit(str(player.error))
+    print(f"Playback started after {player.start_latency * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
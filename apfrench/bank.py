@@ -0,0 +1,326 @@
+"""
+Indexed on-disk question bank
+-----------------------------
+A compact binary file with an offset index, opened through mmap so that a
+session only decodes the questions it actually samples. Opening a bank
+costs the same whether it holds 20 or 200,000 questions.
+
+File layout (all integers little-endian):
+
+    header     "<4sHHI"   magic b"APFQ", format version, number of
+               categories, count
+    index      "<Q" * (count + 1)
+               byte offset of each record; record i spans
+               index[i] .. index[i + 1]
+    categories per category: "<I"-length-prefixed UTF-8 name, "<I" number
+               of questions, then their positions as "<I" each
+               (the inverted index used by apfrench.categories)
+    records    "<BBB" answer, number of choices, category number (255 =
+               none), then the question text, each choice, the
+               explanation and the audio clip (empty if none) as
+               "<I"-length-prefixed UTF-8
+
+Version 2 files (records without the audio clip) are still read.
+
+Command line:
+    python3 -m apfrench.bank build [--out PATH]   # compile apfrench/questions.py
+    python3 -m apfrench.bank info [PATH]
+"""
+
+import mmap
+import os
+import shutil
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Sequence
+
+from apfrench.question import Question, validate_question
+
+MAGIC = b"APFQ"
+VERSION = 3
+_READABLE_VERSIONS = (2, 3)
+
+_HEADER = struct.Struct("<4sHHI")
+_OFFSET = struct.Struct("<Q")
+_RECORD_HEAD = struct.Struct("<BBB")
+_STR_LEN = struct.Struct("<I")
+_NO_CATEGORY = 255
+
+DEFAULT_BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "questions.apfq")
+
+
+class BankFormatError(ValueError):
+    """Raised when a file is not a readable question bank."""
+
+
+# ---------------------------
+# Writing
+# ---------------------------
+def _encode_str(text):
+    data = text.encode("utf-8")
+    return _STR_LEN.pack(len(data)) + data
+
+
+def encode_question(q, category_code=_NO_CATEGORY):
+    """Serialize one Question into a bank record."""
+    parts = [_RECORD_HEAD.pack(q.answer, len(q.choices), category_code), _encode_str(q.question)]
+    parts.extend(_encode_str(c) for c in q.choices)
+    parts.append(_encode_str(q.explain))
+    parts.append(_encode_str(q.audio))
+    return b"".join(parts)
+
+
+class BankWriter:
+    """
+    Streaming bank writer: records are spooled to a temporary file as they
+    are added, and the header, index and category section are put in
+    front of them on close(). Memory holds 12 bytes per question (offset
+    and category entry), never the question texts.
+    """
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._records_path = f"{path}.records.tmp"
+        self._records = open(self._records_path, "w+b")
+        self._offsets = array("Q", [0])   # relative to the start of the records
+        self._categories = {}             # name -> array of positions
+        self._codes = {}                  # name -> category number
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def add(self, q):
+        """
+        Validate and append one question (its id is ignored: questions are
+        numbered by position).
+        :return: the question's position in the bank
+        """
+        validate_question(q)
+        position = len(self)
+        code = _NO_CATEGORY
+        if q.category:
+            code = self._codes.get(q.category)
+            if code is None:
+                if len(self._codes) >= _NO_CATEGORY - 1:
+                    raise ValueError(f"too many categories, at most {_NO_CATEGORY - 1} are supported")
+                code = self._codes[q.category] = len(self._codes)
+                self._categories[q.category] = array("I")
+            self._categories[q.category].append(position)
+        record = encode_question(q, code)
+        self._records.write(record)
+        self._offsets.append(self._offsets[-1] + len(record))
+        return position
+
+    def close(self):
+        """Write the bank file (atomically) and remove the spool file."""
+        count = len(self)
+        if self._records.closed:
+            return count
+        category_section = []
+        for name, ids in self._categories.items():
+            if sys.byteorder == "big":
+                ids = array("I", ids)
+                ids.byteswap()
+            category_section.append(_encode_str(name) + _STR_LEN.pack(len(ids)) + ids.tobytes())
+        category_section = b"".join(category_section)
+        data_start = _HEADER.size + _OFFSET.size * (count + 1) + len(category_section)
+
+        offsets = self._offsets
+        for i in range(len(offsets)):
+            offsets[i] += data_start
+        if sys.byteorder == "big":
+            offsets.byteswap()
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, VERSION, len(self._categories), count))
+                offsets.tofile(f)
+                f.write(category_section)
+                self._records.seek(0)
+                shutil.copyfileobj(self._records, f, 1 << 20)
+            os.replace(tmp_path, self.path)
+        finally:
+            self.abort()
+        return count
+
+    def abort(self):
+        """Discard everything written so far."""
+        if not self._records.closed:
+            self._records.close()
+            os.remove(self._records_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_bank(path, questions):
+    """
+    Write questions to a bank file (atomically replaces any existing file).
+    Every question is validated first, so a bank file only ever holds
+    questions the engine can ask and opening one needs no checks.
+    :param path: destination file
+    :param questions: iterable of Question objects or question dicts
+    :return: number of questions written
+    """
+    with BankWriter(path) as writer:
+        for i, q in enumerate(questions):
+            writer.add(Question.from_dict(q, i) if isinstance(q, dict) else q)
+    return len(writer)
+
+
+# ---------------------------
+# Reading
+# ---------------------------
+class Bank(Sequence):
+    """
+    Read-only, memory-mapped question bank.
+
+    Behaves like a list of Question objects, but records are decoded only
+    when indexed, so random.sample(bank, 5) touches just 5 records.
+    `categories` maps each category to the positions of its questions,
+    read straight from the file's prebuilt index.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size:
+                raise BankFormatError(f"{path}: file too small to be a question bank")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, n_categories, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise BankFormatError(f"{path}: not a question bank (bad magic)")
+        if version not in _READABLE_VERSIONS:
+            raise BankFormatError(f"{path}: unsupported bank version {version}")
+        self._strings = 3 if version >= 3 else 2   # per record, besides the choices
+        self._count = count
+        self._read_categories(n_categories)
+
+    def _read_categories(self, n_categories):
+        """Map the category section: names plus zero-copy views of the id lists."""
+        mm = self._mm
+        pos = _HEADER.size + _OFFSET.size * (self._count + 1)
+        self.category_names = []
+        self.categories = {}
+        self._views = []
+        for _ in range(n_categories):
+            (length,) = _STR_LEN.unpack_from(mm, pos)
+            pos += _STR_LEN.size
+            name = mm[pos:pos + length].decode("utf-8")
+            pos += length
+            (n_ids,) = _STR_LEN.unpack_from(mm, pos)
+            pos += _STR_LEN.size
+            end = pos + _STR_LEN.size * n_ids
+            if sys.byteorder == "little":
+                ids = memoryview(mm)[pos:end].cast("I")
+                self._views.append(ids)
+            else:
+                ids = array("I", mm[pos:end])
+                ids.byteswap()
+            self.category_names.append(name)
+            self.categories[name] = ids
+            pos = end
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("question index out of range")
+        (start,) = _OFFSET.unpack_from(self._mm, _HEADER.size + _OFFSET.size * index)
+        return self._decode(index, start)
+
+    def _decode(self, index, pos):
+        mm = self._mm
+        answer, n_choices, category_code = _RECORD_HEAD.unpack_from(mm, pos)
+        pos += _RECORD_HEAD.size
+        texts = []
+        for _ in range(n_choices + self._strings):
+            (length,) = _STR_LEN.unpack_from(mm, pos)
+            pos += _STR_LEN.size
+            texts.append(mm[pos:pos + length].decode("utf-8"))
+            pos += length
+        category = "" if category_code == _NO_CATEGORY else self.category_names[category_code]
+        audio = texts[n_choices + 2] if self._strings == 3 else ""
+        return Question(index, texts[0], texts[1:n_choices + 1], answer, texts[n_choices + 1], category, audio)
+
+    def checksum(self, count=None):
+        """crc32 of the records of the first `count` questions (default: all); changes if any of them does."""
+        if count is None:
+            count = self._count
+        start, end = (_OFFSET.unpack_from(self._mm, _HEADER.size + _OFFSET.size * i)[0] for i in (0, count))
+        with memoryview(self._mm) as view:
+            return zlib.crc32(view[start:end])
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        self._views = []
+        self.categories = {}
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_default_bank(path=DEFAULT_BANK_PATH):
+    """
+    Open the bank the GUIs use, (re)building it from apfrench/questions.py
+    when the file is missing (e.g. right after cloning the repo), older
+    than the source, or written in an older format.
+    """
+    source = os.path.join(os.path.dirname(os.path.abspath(__file__)), "questions.py")
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(source):
+        try:
+            return Bank(path)
+        except BankFormatError:
+            pass
+    from apfrench.questions import QUESTIONS
+    write_bank(path, QUESTIONS)
+    return Bank(path)
+
+
+# ---------------------------
+# Command line
+# ---------------------------
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python3 -m apfrench.bank", description="Build or inspect question bank files.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="compile apfrench/questions.py into a bank file")
+    build.add_argument("--out", default=DEFAULT_BANK_PATH)
+    info = sub.add_parser("info", help="show what a bank file contains")
+    info.add_argument("path", nargs="?", default=DEFAULT_BANK_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        from apfrench.questions import QUESTIONS
+        count = write_bank(args.out, QUESTIONS)
+        print(f"Wrote {count} questions to {args.out}")
+    else:
+        with Bank(args.path) as bank:
+            print(f"{args.path}: {len(bank)} questions, {os.path.getsize(args.path):,} bytes")
+            for name, ids in bank.categories.items():
+                print(f"  {name:<12} {len(ids):>8,}")
+
+
+if __name__ == "__main__":
+    main()
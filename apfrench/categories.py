@@ -0,0 +1,79 @@
+"""
+Question categories
+-------------------
+Inverted index (category -> question ids) and the filtered session builder.
+Bank files store the index prebuilt, so building a category-weighted
+session only samples from the id lists it needs and never scans the bank.
+"""
+
+import random
+from array import array
+
+CATEGORIES = ("vocabulary", "grammar", "culture", "reading", "listening")
+
+
+def build_category_index(questions):
+    """
+    Build {category: array of question positions} in one pass.
+    Questions without a category are left out.
+    """
+    index = {}
+    for pos, q in enumerate(questions):
+        if q.category:
+            index.setdefault(q.category, array("I")).append(pos)
+    return index
+
+
+def category_index(questions):
+    """Return the prebuilt index of a Bank, or build one for a plain list."""
+    index = getattr(questions, "categories", None)
+    if index is None:
+        index = build_category_index(questions)
+    return index
+
+
+def allocate(weights, size, available):
+    """
+    Split `size` questions between categories in proportion to `weights`
+    (largest remainder), never asking a category for more than it has.
+    :param weights: {category: weight}; categories with weight <= 0 are skipped
+    :param size: total number of questions wanted
+    :param available: {category: number of questions in that category}
+    :return: {category: count}
+    """
+    weights = {c: w for c, w in weights.items() if w > 0}
+    unknown = [c for c in weights if c not in available]
+    if unknown:
+        raise ValueError(f"unknown categories {unknown}; the bank has {sorted(available)}")
+    total = sum(weights.values())
+    if not total:
+        raise ValueError("at least one category needs a positive weight")
+
+    quotas = {c: size * w / total for c, w in weights.items()}
+    counts = {c: min(int(quotas[c]), available[c]) for c in weights}
+    left = size - sum(counts.values())
+    while left > 0:
+        room = [c for c in counts if counts[c] < available[c]]
+        if not room:
+            raise ValueError(f"only {sum(counts.values())} questions in the selected categories, {size} requested")
+        best = max(room, key=lambda c: quotas[c] - counts[c])
+        counts[best] += 1
+        left -= 1
+    return counts
+
+
+def pick_session_ids(index, weights, size, rng=random):
+    """
+    Sample a category-weighted session without replacement.
+    :param index: {category: sequence of question positions}
+    :param weights: {category: weight}
+    :param size: number of questions in the session
+    :param rng: random.Random-like source (defaults to the random module)
+    :return: array of question positions in random order
+    """
+    counts = allocate(weights, size, {c: len(ids) for c, ids in index.items()})
+    picked = []
+    for category, count in counts.items():
+        picked.extend(rng.sample(index[category], count))
+    rng.shuffle(picked)
+    return array("I", picked)
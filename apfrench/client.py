@@ -0,0 +1,145 @@
+"""
+Quiz server client
+------------------
+RemoteEngine talks to apfrench.server over a socket and offers the same
+interface the GUIs use on a local QuizEngine, so a QuizApp can run against
+a shared server by swapping the engine. Each call is one blocking round
+trip (a few hundred microseconds on a LAN).
+
+The correct answer is only known after answer() has been called.
+"""
+
+import socket
+
+from apfrench import protocol
+from apfrench.freeresponse import Verdict
+
+
+class RemoteError(RuntimeError):
+    """The server rejected a request."""
+
+
+class RemoteQuestion:
+    """Question as received from the server (no answer key)."""
+    __slots__ = ("id", "question", "category", "explain", "audio")
+
+    def __init__(self, id, question, category, explain="", audio=""):
+        self.id = id
+        self.question = question
+        self.category = category
+        self.explain = explain
+        self.audio = audio
+
+
+class RemoteEngine:
+    """QuizEngine stand-in backed by a quiz server."""
+    def __init__(self, host=protocol.DEFAULT_HOST, port=protocol.DEFAULT_PORT,
+                 session_size=5, student_id=0, category_weights=None, timeout=10.0, seed=None, student_name=None):
+        """
+        :param student_name: the student's name, which the server looks up in
+            its progress store (instead of sending student_id)
+        """
+        self.session_size = session_size
+        self.student_id = student_id
+        self.student_name = student_name
+        self.category_weights = category_weights
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._sock.makefile("rwb")
+        self.reset(seed)
+
+    def _call(self, **request):
+        self._file.write(protocol.encode(request))
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("quiz server closed the connection")
+        reply = protocol.decode(line)
+        if "error" in reply:
+            raise RemoteError(reply["error"])
+        return reply
+
+    def _take_question(self, reply):
+        self.finished = reply["finished"]
+        self.session_length = reply["length"]
+        self.session_seed = reply["seed"]
+        if self.finished:
+            self.current = None
+            self.current_choices = []
+        else:
+            self.current_index = reply["index"]
+            self.current = RemoteQuestion(reply["id"], reply["question"], reply["category"],
+                                          audio=reply.get("audio", ""))
+            self.current_choices = reply["choices"]
+        self.current_answer_index = None
+        self.answered = False
+
+    # ---------------------------
+    # QuizEngine interface
+    # ---------------------------
+    def reset(self, seed=None):
+        # session_size None (sent as null) asks for the whole bank
+        request = {"op": "start", "student": self.student_id, "session_size": self.session_size}
+        if self.student_name:
+            request["name"] = self.student_name
+        if self.category_weights:
+            request["categories"] = self.category_weights
+        if seed is not None:
+            request["seed"] = seed
+        self.current_index = 0
+        self.score_correct = 0
+        self.total_attempted = 0
+        self._take_question(self._call(**request))
+
+    def mark_shown(self):
+        """The server starts the response timer when it sends the question."""
+
+    def answer(self, chosen_index):
+        reply = self._call(op="answer", choice=chosen_index)
+        self.current_answer_index = reply["correct_index"]
+        self.current.explain = reply["explain"]
+        self.score_correct = reply["score"]
+        self.total_attempted = reply["attempted"]
+        self.answered = True
+        return reply["correct"]
+
+    def answer_text(self, text):
+        reply = self._call(op="answer", text=text)
+        self.current_answer_index = reply["correct_index"]
+        self.current.explain = reply["explain"]
+        self.score_correct = reply["score"]
+        self.total_attempted = reply["attempted"]
+        self.answered = True
+        return Verdict(reply["correct"], reply["verdict"], reply["chosen"], reply["distance"], reply["expected"])
+
+    def grade(self, answers):
+        """Grade a batch of (question id, typed text) on the server; returns a list of Verdicts."""
+        reply = self._call(op="grade", answers=[[qid, text] for qid, text in answers])
+        return [Verdict(r["correct"], r["verdict"], r["chosen"], r["distance"], r["expected"])
+                if "error" not in r else None for r in reply["results"]]
+
+    def time_up(self):
+        reply = self._call(op="time_up")
+        self.total_attempted = reply["attempted"]
+        self.answered = True
+
+    def advance(self):
+        self._take_question(self._call(op="next"))
+        if self.finished:
+            self.current_index = self.session_length
+        return not self.finished
+
+    def percent(self, attempted=None):
+        if attempted is None:
+            attempted = self.total_attempted
+        return (self.score_correct / attempted) * 100 if attempted > 0 else 0.0
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,235 @@
+"""
+Near-duplicate detection
+------------------------
+Finds questions that are almost the same (a reworded stem, a typo fixed,
+choices reordered) in a bank, in roughly linear time instead of comparing
+every pair.
+
+1. Shingles: each question's normalized text plus its sorted choices is
+   cut into overlapping 5-byte pieces.
+2. MinHash signature: one-permutation hashing. Every shingle is hashed
+   once (crc32) and dropped into one of `num_hashes` bins by its hash;
+   each bin keeps its minimum, and an empty bin borrows from the next
+   non-empty one, plus an offset for each bin it had to skip (rotation
+   densification), so two texts only agree on a borrowed value when they
+   borrowed it from the same distance. That is O(shingles + num_hashes) per question rather
+   than O(shingles * num_hashes) for classic MinHash, and the fraction of
+   equal slots between two signatures still estimates their Jaccard
+   similarity.
+3. LSH: the signature is split into bands; questions sharing any band
+   exactly land in the same bucket and become candidate pairs. The number
+   of bands is picked so that pairs around `threshold` similarity are
+   caught with high probability.
+4. Candidates (every pair in a bucket, up to MAX_BUCKET members per
+   bucket) are verified on their signatures and grouped with a union-find
+   into clusters. Listening questions only match questions on the same
+   clip, as in the importer.
+
+Signatures are stored flat in one array('I') (num_hashes * 4 bytes per
+question).
+
+Command line:
+    python3 -m apfrench.dedup [BANK] [--threshold 0.7] [--write PATH]
+"""
+
+import time
+import zlib
+from array import array
+from operator import eq
+
+SHINGLE = 5
+NUM_HASHES = 64
+MAX_BUCKET = 64         # bucket members compared pairwise; later ones are compared with these
+_EMPTY = 0xFFFFFFFF
+_ROTATION = 0x9E3779B1  # densification offset per skipped bin
+
+
+def normalize(q):
+    """Text compared for a question: stem + sorted choices (+ clip), case and spacing folded."""
+    parts = [" ".join(q.question.casefold().split())]
+    parts.extend(sorted(" ".join(c.casefold().split()) for c in q.choices))
+    if q.audio:
+        # Listening questions often share their text; the clip tells them apart
+        parts.append(q.audio)
+    return " | ".join(parts)
+
+
+def signature(text, num_hashes=NUM_HASHES):
+    """One-permutation MinHash signature of `text` (array('I') of num_hashes values)."""
+    data = text.encode("utf-8")
+    sig = array("I", [_EMPTY]) * num_hashes
+    crc32 = zlib.crc32
+    for i in range(max(1, len(data) - SHINGLE + 1)):
+        h = crc32(data[i:i + SHINGLE])
+        b = h % num_hashes
+        if h < sig[b]:
+            sig[b] = h
+    # Densify: an empty bin takes the value of the next non-empty bin
+    # (rotating) plus an offset per step, so that sparse texts still
+    # compare bin for bin without looking more alike than they are
+    if _EMPTY in sig:
+        filled = sig.tolist()
+        for b in range(num_hashes):
+            if filled[b] == _EMPTY:
+                for step in range(1, num_hashes):
+                    value = filled[(b + step) % num_hashes]
+                    if value != _EMPTY:
+                        sig[b] = (value + step * _ROTATION) & 0xFFFFFFFF
+                        break
+    return sig
+
+
+def choose_bands(num_hashes, threshold):
+    """
+    Pick (bands, rows) with bands * rows == num_hashes whose LSH threshold
+    (1/bands) ** (1/rows) is at or just below `threshold`, so that pairs at
+    the threshold are rarely missed.
+    """
+    best = (num_hashes, 1)
+    for rows in range(1, num_hashes + 1):
+        if num_hashes % rows:
+            continue
+        bands = num_hashes // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+def similarity(signatures, num_hashes, a, b):
+    """Estimated Jaccard similarity of questions a and b."""
+    sa = a * num_hashes
+    sb = b * num_hashes
+    same = sum(map(eq, signatures[sa:sa + num_hashes], signatures[sb:sb + num_hashes]))
+    return same / num_hashes
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        parent = self.parent
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while x != root:
+            parent[x], x = root, parent.get(x, x)
+        return root
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # Keep the smaller id as the root so clusters are led by their first question
+            if rb < ra:
+                ra, rb = rb, ra
+            self.parent.setdefault(ra, ra)
+            self.parent[rb] = ra
+
+
+class DedupReport:
+    """Clusters of near-duplicate question ids, plus timing."""
+    def __init__(self):
+        self.clusters = []        # lists of ids, first id = the one to keep
+        self.pairs = 0            # verified near-duplicate pairs
+        self.candidates = 0       # pairs proposed by LSH
+        self.signature_s = 0.0
+        self.lsh_s = 0.0
+
+    @property
+    def duplicates(self):
+        """Ids that could be dropped (all but the first of each cluster)."""
+        return sorted(i for cluster in self.clusters for i in cluster[1:])
+
+
+def find_near_duplicates(questions, threshold=0.7, num_hashes=NUM_HASHES):
+    """
+    :param questions: sequence of Question objects (a list or a Bank)
+    :param threshold: estimated Jaccard similarity at which two questions count as near-duplicates
+    :return: DedupReport
+    """
+    report = DedupReport()
+    t0 = time.perf_counter()
+    signatures = array("I")
+    clips = []
+    for q in questions:
+        signatures.extend(signature(normalize(q), num_hashes))
+        clips.append(q.audio)
+    report.signature_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    bands, rows = choose_bands(num_hashes, threshold)
+    count = len(signatures) // num_hashes
+    checked = set()
+    groups = _UnionFind()
+    for band in range(bands):
+        buckets = {}
+        offset = band * rows
+        for qid in range(count):
+            start = qid * num_hashes + offset
+            key = signatures[start:start + rows].tobytes()
+            members = buckets.setdefault(key, [])
+            # Every pair in the bucket: sharing a band with a third question
+            # says nothing about how similar two questions are to each other
+            for other in members:
+                pair = (other, qid)
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                report.candidates += 1
+                # Clip names are too short to move the similarity much, so
+                # questions on different clips are never duplicates
+                if clips[other] != clips[qid]:
+                    continue
+                if similarity(signatures, num_hashes, other, qid) >= threshold:
+                    report.pairs += 1
+                    groups.union(other, qid)
+            if len(members) < MAX_BUCKET:
+                members.append(qid)
+    clusters = {}
+    for qid in groups.parent:
+        clusters.setdefault(groups.find(qid), []).append(qid)
+    report.clusters = sorted(sorted(members) for members in clusters.values())
+    report.lsh_s = time.perf_counter() - t0
+    return report
+
+
+# ---------------------------
+# Command line
+# ---------------------------
+def main(argv=None):
+    import argparse
+
+    from apfrench.bank import Bank, BankWriter, open_default_bank
+    from apfrench.question import Question
+
+    parser = argparse.ArgumentParser(prog="python3 -m apfrench.dedup", description="Find near-duplicate questions.")
+    parser.add_argument("bank", nargs="?", help="bank file (default: the quiz's bank)")
+    parser.add_argument("--threshold", type=float, default=0.7, help="similarity (0-1) to report (default 0.7)")
+    parser.add_argument("--hashes", type=int, default=NUM_HASHES, help="signature length")
+    parser.add_argument("--show", type=int, default=20, metavar="N", help="list the first N clusters")
+    parser.add_argument("--write", metavar="PATH", help="write a bank keeping only the first question of each cluster")
+    args = parser.parse_args(argv)
+
+    with Bank(args.bank) if args.bank else open_default_bank() as bank:
+        report = find_near_duplicates(bank, args.threshold, args.hashes)
+        for cluster in report.clusters[:args.show]:
+            print(f"{len(cluster)} similar questions:")
+            for qid in cluster:
+                print(f"  {qid:>8}  {bank[qid].question[:70]}")
+        print(f"\n{len(bank):,} questions: {len(report.clusters):,} clusters, "
+              f"{len(report.duplicates):,} near-duplicates ({report.candidates:,} candidate pairs checked)")
+        print(f"signatures {report.signature_s:.2f}s, LSH {report.lsh_s:.2f}s")
+
+        if args.write:
+            drop = set(report.duplicates)
+            with BankWriter(args.write) as writer:
+                for qid in range(len(bank)):
+                    if qid not in drop:
+                        q = bank[qid]
+                        writer.add(Question(len(writer), q.question, q.choices, q.answer, q.explain, q.category,
+                                            q.audio))
+            print(f"Wrote {len(writer):,} questions to {args.write}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+"""
+Headless quiz engine
+--------------------
+All per-session quiz state (question order, shuffled choices, score) lives
+here so it can be driven without a display: by the Tkinter GUIs, by
+benchmarks, or by any other front end.
+
+Questions are never copied: a session keeps references to the bank's
+Question objects plus one small integer array holding, for each question,
+the shuffled choice order followed by the shuffled index of the correct
+answer.
+
+Nothing is prepared up front either. Questions are drawn one at a time
+with a sparse (dict-backed) Fisher-Yates shuffle over the bank indices,
+and a question's choices are shuffled the first time it is shown. A
+restart is O(1) and a session costs O(questions actually shown), no
+matter how large the bank is.
+
+Every session has a seed. The question order comes from a random.Random
+seeded with it (created on the first draw, as seeding costs several
+microseconds), and each question's choice order from a hash of the seed
+and the question's position in the session, so the same seed over the
+same bank and settings replays the same session exactly, whatever order
+a front end asks for things in. With a LayoutCache, engines started with
+the same seed (a class taking the same test) share one precomputed
+layout instead of each drawing it, and with a FormSet (apfrench.forms)
+every session is one of K precomputed exam forms.
+
+Answers can also be typed instead of picked (answer_text): the text is
+graded against the question's choices by apfrench.freeresponse, which
+forgives accents and small typos.
+
+While the student reads the feedback, a front end may call prefetch() on
+a worker thread: the next question is drawn, its choices shuffled and
+its record read from the bank, so advance() only swaps it in.
+
+In adaptive mode (apfrench.adaptive) the draw picks the most informative
+question for the student's ability estimate instead, and the session
+ends as soon as that estimate is precise enough.
+
+This module must not import tkinter.
+"""
+
+import itertools
+import random
+import time
+from array import array
+from collections import OrderedDict
+
+from apfrench.categories import category_index, pick_session_ids
+from apfrench.journal import TIMED_OUT, UNMATCHED
+from apfrench.question import CHOICES_PER_QUESTION
+
+# Per question in the session: CHOICES_PER_QUESTION choice positions + correct index
+_STRIDE = CHOICES_PER_QUESTION + 1
+SEED_BITS = 32
+_PERMUTATIONS = tuple(itertools.permutations(range(CHOICES_PER_QUESTION)))
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(x):
+    """SplitMix64 finalizer: a well-spread 64-bit hash of an integer."""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+class LayoutCache:
+    """
+    Least-recently-used cache of complete session layouts (question ids and
+    choice orders) for engines over one bank. A cached layout is shared by
+    every engine started with the same seed and settings, so it is kept
+    immutable: a tuple of question ids and the choice orders as bytes.
+    """
+    def __init__(self, max_layouts=256):
+        self.max_layouts = max_layouts
+        self._layouts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._layouts)
+
+    def get(self, key, build):
+        """The layout for `key`, calling build() to make it on a miss."""
+        layout = self._layouts.get(key)
+        if layout is None:
+            self.misses += 1
+            layout = self._layouts[key] = build()
+            if len(self._layouts) > self.max_layouts:
+                self._layouts.popitem(last=False)
+        else:
+            self.hits += 1
+            self._layouts.move_to_end(key)
+        return layout
+
+
+class SessionError(RuntimeError):
+    """The session cannot take this request (it is over, or the question is already answered)."""
+
+
+class QuizEngine:
+    """Quiz session state and grading rules, independent of any UI."""
+    def __init__(self, questions, session_size=None, category_weights=None, journal=None, student_id=0,
+                 scheduler=None, response_times=None, adaptive=None, seed=None, layouts=None, forms=None,
+                 answer_keys=None):
+        """
+        :param questions: sequence of Question objects (a list or a Bank)
+        :param session_size: number of questions per session, or None for all
+        :param category_weights: optional {category: weight} to build sessions
+            from selected categories only, mixed in proportion to the weights
+            (e.g. {"grammar": 2, "vocabulary": 1})
+        :param journal: optional apfrench.journal.Journal receiving every answer,
+            or an apfrench.store.Store (which also records every session)
+        :param student_id: student number written to the journal
+        :param scheduler: optional apfrench.srs.Scheduler; sessions then ask the
+            questions that are due for review and every answer reschedules
+        :param response_times: optional apfrench.histogram.ResponseTimes that
+            records how long each answer took
+        :param adaptive: optional apfrench.adaptive.AdaptiveSession; each question
+            is then the most informative one for the student's ability estimate,
+            and the session ends early once the estimate is precise enough
+            (session_size is the most questions it may take)
+        :param seed: seed of the first session (default: a fresh one)
+        :param layouts: optional LayoutCache shared by engines over this bank;
+            used for sessions with a session_size (not review or adaptive ones)
+        :param forms: optional apfrench.forms.FormSet; each session is then one
+            of its precomputed forms (form number = seed % number of forms)
+        :param answer_keys: optional apfrench.freeresponse.AnswerKeys shared by
+            engines over this bank, for answer_text (default: one of its own)
+        """
+        self.all_questions = questions
+        self.session_size = session_size
+        self.category_weights = category_weights
+        self._category_index = None
+        self.journal = journal
+        self._start_session = getattr(journal, "start_session", None)
+        self.student_id = student_id
+        self.scheduler = scheduler
+        self.response_times = response_times
+        self.adaptive = adaptive
+        self.layouts = layouts
+        self.forms = forms
+        self.form = None
+        self.answer_keys = answer_keys
+        self.reset(seed)
+
+    # ---------------------------
+    # Session management
+    # ---------------------------
+    def reset(self, seed=None):
+        """
+        (Re)start a session and zero the score. Questions are drawn lazily.
+        :param seed: session seed (default: a fresh one); see session_seed
+        """
+        if seed is None:
+            seed = random.getrandbits(SEED_BITS)
+        self.session_seed = seed
+        self._order_rng = None          # random.Random(seed), created on first use
+        self._choice_key = _mix(seed)
+        self._swaps = {}                # sparse Fisher-Yates: position -> bank index
+        self._perm = array("B")         # choice order + correct index per drawn question
+
+        bank_size = len(self.all_questions)
+        if self.scheduler is not None:
+            # Review mode: the k most overdue questions, O(k log n)
+            self.question_ids = self.scheduler.pick_session(self.session_size or bank_size)
+            self.session_length = len(self.question_ids)
+        elif self.forms is not None:
+            # Exam forms are precomputed: a restart is a lookup
+            self.form = seed % len(self.forms)
+            self.question_ids, self._perm = self.forms.layout(self.form)
+            self.session_length = len(self.question_ids)
+        else:
+            if self.category_weights:
+                if self._category_index is None:
+                    self._category_index = category_index(self.all_questions)
+                if self.session_size is None:
+                    self.session_length = sum(len(self._category_index.get(c, ()))
+                                              for c, w in self.category_weights.items() if w > 0)
+                else:
+                    self.session_length = self.session_size
+            elif self.session_size is None:
+                self.session_length = bank_size
+            elif self.session_size > bank_size:
+                raise ValueError(f"session_size {self.session_size} is larger than the bank ({bank_size} questions)")
+            else:
+                self.session_length = self.session_size
+
+            if self.adaptive is not None:
+                self.adaptive.start()
+                self.question_ids = array("I")
+            elif self.layouts is not None and self.session_size is not None:
+                weights = tuple(sorted(self.category_weights.items())) if self.category_weights else None
+                key = (seed, bank_size, self.session_length, weights)
+                self.question_ids, self._perm = self.layouts.get(key, self._build_layout)
+            else:
+                self._pick()
+
+        self.session_id = None          # the journal's id for this session, if it keeps sessions
+        if self._start_session is not None:
+            self.session_id = self._start_session(self.student_id, seed, self.session_length)
+
+        self._current = None            # cached Question for current_index
+        self._prefetched = None         # Question for current_index + 1, from prefetch()
+        self._shown_at = None           # time.perf_counter_ns() when the question was shown
+        if self.response_times is not None:
+            self.response_times.start_session()
+
+        self.current_index = 0
+        self.answered = False           # whether the current question has been answered
+        self.score_correct = 0
+        self.total_attempted = 0
+
+    def _pick(self):
+        """Start the session's question list (drawn lazily unless filtered by category)."""
+        if self.category_weights:
+            # Filtered sessions are picked up front from the category index:
+            # O(session size), independent of the bank size.
+            self.question_ids = pick_session_ids(self._category_index, self.category_weights,
+                                                 self.session_length, self._order())
+        else:
+            self.question_ids = array("I")  # bank indices drawn so far, in order
+
+    def _order(self):
+        """The session's question-order generator."""
+        if self._order_rng is None:
+            self._order_rng = random.Random(self.session_seed)
+        return self._order_rng
+
+    def _build_layout(self):
+        """Draw the whole session and shuffle every question's choices (for LayoutCache)."""
+        self._pick()
+        while len(self.question_ids) < self.session_length:
+            self._draw()
+        if self.session_length:
+            self._shuffle_choices(self.session_length - 1)
+        return tuple(self.question_ids), bytes(self._perm)
+
+    def _draw(self):
+        """Draw the next bank index without replacement (one Fisher-Yates step)."""
+        if self.adaptive is not None:
+            self.question_ids.append(self.adaptive.next_question())
+            return
+        i = len(self.question_ids)
+        j = (self._order_rng or self._order()).randrange(i, len(self.all_questions))
+        swaps = self._swaps
+        picked = swaps.get(j, j)
+        swaps[j] = swaps.pop(i, i)
+        self.question_ids.append(picked)
+
+    def _shuffle_choices(self, index, q=None):
+        """
+        Shuffle the choices of session question `index` (and any skipped before it).
+        :param q: the Question at `index`, if already read from the bank
+        """
+        perm = self._perm
+        while len(perm) <= index * _STRIDE:
+            k = len(perm) // _STRIDE
+            question = q if k == index and q is not None else self.all_questions[self.question_ids[k]]
+            if len(question.choices) != CHOICES_PER_QUESTION:
+                raise ValueError(f"question {question.id} has {len(question.choices)} choices, "
+                                 f"expected {CHOICES_PER_QUESTION}")
+            order = _PERMUTATIONS[_mix(self._choice_key + k) % len(_PERMUTATIONS)]
+            perm.extend(order)
+            perm.append(order.index(question.answer))
+
+    @property
+    def finished(self):
+        """True once every question of the session has been passed."""
+        return self.current_index >= self.session_length
+
+    def _check_not_finished(self):
+        if self.current_index >= self.session_length:
+            raise SessionError("the session is over")
+
+    def _check_unanswered(self):
+        self._check_not_finished()
+        if self.answered:
+            raise SessionError("this question has already been answered")
+
+    @property
+    def current(self):
+        """The Question currently being asked (SessionError once the session is over)."""
+        q = self._current
+        if q is None:
+            self._check_not_finished()
+            while len(self.question_ids) <= self.current_index:
+                self._draw()
+            q = self._current = self.all_questions[self.question_ids[self.current_index]]
+        return q
+
+    @property
+    def current_choices(self):
+        """Choice texts of the current question, in their shuffled order."""
+        q = self.current
+        base = self.current_index * _STRIDE
+        if len(self._perm) <= base:
+            self._shuffle_choices(self.current_index, q)
+        choices = q.choices
+        return [choices[i] for i in self._perm[base:base + CHOICES_PER_QUESTION]]
+
+    @property
+    def current_answer_index(self):
+        """Index of the correct answer within current_choices."""
+        self._check_not_finished()
+        base = self.current_index * _STRIDE
+        if len(self._perm) <= base:
+            self._shuffle_choices(self.current_index, self.current)
+        return self._perm[base + CHOICES_PER_QUESTION]
+
+    # ---------------------------
+    # Answering
+    # ---------------------------
+    def mark_shown(self):
+        """Note that the current question is now on screen (starts its response time)."""
+        if self.response_times is not None:
+            self.response_times.prepare(self.current)
+        self._shown_at = time.perf_counter_ns()
+
+    def _log(self, chosen, correct):
+        """Pass the answer on to the journal, scheduler and response-time histograms, if any."""
+        if self._shown_at is None:
+            response_s = None
+        else:
+            elapsed_ns = time.perf_counter_ns() - self._shown_at
+            response_s = elapsed_ns / 1e9
+            if self.response_times is not None and chosen != TIMED_OUT:
+                self.response_times.record(self.current, elapsed_ns)
+        if self.journal is not None:
+            self.journal.append(self.student_id, self.current.id, chosen, correct,
+                                0 if response_s is None else response_s * 1000, session_id=self.session_id)
+        if self.scheduler is not None:
+            self.scheduler.review(self.current.id, correct, response_s if chosen != TIMED_OUT else None)
+        if self.adaptive is not None:
+            self.adaptive.record(self.current.id, correct)
+            if self.adaptive.precise_enough:
+                self.session_length = self.current_index + 1
+
+    def answer(self, chosen_index):
+        """
+        Grade an answer to the current question (each question takes one
+        answer, time_up included; another raises SessionError).
+        :param chosen_index: 0..3 index into the shuffled choices (ValueError otherwise)
+        :return: True if the answer is correct
+        """
+        self._check_unanswered()
+        if not 0 <= chosen_index < CHOICES_PER_QUESTION:
+            # The layout is one flat array: a bad index would read another question's choices
+            raise ValueError(f"chosen_index must be between 0 and {CHOICES_PER_QUESTION - 1}, got {chosen_index}")
+        correct = chosen_index == self.current_answer_index
+        chosen = self._perm[self.current_index * _STRIDE + chosen_index]
+        self.answered = True
+        self.total_attempted += 1
+        if correct:
+            self.score_correct += 1
+        # The journal stores the index into the question's original choices
+        self._log(chosen, correct)
+        return correct
+
+    def answer_text(self, text):
+        """
+        Grade a typed answer to the current question.
+        :return: apfrench.freeresponse.Verdict (verdict.correct is the grade)
+        """
+        self._check_unanswered()
+        if self.answer_keys is None:
+            from apfrench.freeresponse import AnswerKeys
+            self.answer_keys = AnswerKeys(self.all_questions)
+        verdict = self.answer_keys.key(self.current).grade(text)
+        self.answered = True
+        self.total_attempted += 1
+        if verdict.correct:
+            self.score_correct += 1
+        self._log(UNMATCHED if verdict.chosen is None else verdict.chosen, verdict.correct)
+        return verdict
+
+    def time_up(self):
+        """Count the current question as attempted but incorrect."""
+        self._check_unanswered()
+        self.answered = True
+        self.total_attempted += 1
+        self._log(TIMED_OUT, False)
+
+    def prefetch(self):
+        """
+        Prepare the next question (draw it, shuffle its choices, read it from
+        the bank) so that advance() has nothing left to do. May run on a
+        worker thread, as long as nothing else uses the engine until it returns.
+        :return: the next Question, or None if the current one is the last
+        """
+        index = self.current_index + 1
+        if index >= self.session_length:
+            return None
+        while len(self.question_ids) <= index:
+            self._draw()
+        q = self.all_questions[self.question_ids[index]]
+        if len(self._perm) <= index * _STRIDE:
+            self._shuffle_choices(index, q)
+        self._prefetched = q
+        return q
+
+    def advance(self):
+        """
+        Move to the next question.
+        :return: True if there is another question to show
+        """
+        self.current_index += 1
+        self.answered = False
+        self._current = self._prefetched
+        self._prefetched = None
+        self._shown_at = None           # until mark_shown() for the new question
+        return not self.finished
+
+    # ---------------------------
+    # Results
+    # ---------------------------
+    def percent(self, attempted=None):
+        """
+        Percentage score.
+        :param attempted: denominator to use (defaults to total_attempted)
+        """
+        if attempted is None:
+            attempted = self.total_attempted
+        return (self.score_correct / attempted) * 100 if attempted > 0 else 0.0
@@ -0,0 +1,144 @@
+"""
+Exam forms
+----------
+A fixed set of K exam forms (A, B, C...) prepared once per bank and
+session size, for class-wide quizzes: students are dealt one of the forms
+instead of a freshly drawn session, so neighbours get different papers
+and restarting the quiz is a lookup, not a regeneration.
+
+Every form covers every category of the bank, with the same number of
+questions per category (largest remainder when they do not divide
+evenly). Within a category the forms share no question as long as the
+category has enough of them. When item statistics are available
+(apfrench.analysis), each category's questions are sorted by difficulty
+and dealt to the forms in snake order (A B C C B A A B C...), so the
+forms come out with nearly the same mean difficulty; each category's
+share then goes to the forms so as to even out their running totals.
+
+A form is stored as the layout QuizEngine uses (question ids plus choice
+orders), so an engine starting a session on a form just takes references
+to it; it is immutable (a tuple of ids, the choice orders as bytes), so no
+session can change a form for the students after it. Form sets are kept
+in an LRU keyed by the bank, session size, number of forms and seed.
+"""
+
+import math
+import os
+import random
+from array import array
+
+from apfrench.categories import allocate, category_index
+from apfrench.engine import LayoutCache
+from apfrench.question import CHOICES_PER_QUESTION
+
+DEFAULT_FORMS = 4
+
+_cache = LayoutCache(max_layouts=16)
+
+
+def form_name(index):
+    """A, B, ... Z, then 27, 28..."""
+    return chr(ord("A") + index) if index < 26 else str(index + 1)
+
+
+def deal(ids, per_form, count, rng, difficulty=None):
+    """
+    Split `ids` between `count` forms, `per_form` each.
+    Disjoint when there are enough ids; otherwise each form samples on its own.
+    """
+    if per_form * count > len(ids):
+        return [rng.sample(ids, per_form) for _ in range(count)]
+    pool = rng.sample(ids, per_form * count)
+    if difficulty is None:
+        return [pool[f * per_form:(f + 1) * per_form] for f in range(count)]
+    pool.sort(key=lambda qid: _difficulty(difficulty, qid))
+    forms = [[] for _ in range(count)]
+    for rank, qid in enumerate(pool):
+        turn, seat = divmod(rank, count)
+        forms[seat if turn % 2 == 0 else count - 1 - seat].append(qid)
+    return forms
+
+
+def _difficulty(difficulty, qid):
+    p = difficulty[qid] if qid < len(difficulty) else math.nan
+    return 0.5 if math.isnan(p) else p
+
+
+class FormSet:
+    """K precomputed exam forms over one bank."""
+    def __init__(self, questions, size, count=DEFAULT_FORMS, seed=0, difficulty=None):
+        """
+        :param questions: sequence of Question objects (a list or a Bank)
+        :param size: questions per form
+        :param count: number of forms
+        :param difficulty: optional share of right answers per question
+            (ItemStats.p_value), used to balance the forms
+        """
+        index = {c: list(ids) for c, ids in category_index(questions).items()}
+        if not index:
+            index = {"": list(range(len(questions)))}
+        if size < len(index):
+            raise ValueError(f"a form of {size} questions cannot cover the bank's {len(index)} categories")
+        quotas = allocate(dict.fromkeys(index, 1), size, {c: len(ids) for c, ids in index.items()})
+
+        rng = random.Random(seed)
+        forms = [[] for _ in range(count)]
+        totals = [0.0] * count
+        for category, quota in sorted(quotas.items()):
+            parts = deal(index[category], quota, count, rng, difficulty)
+            order = range(count)
+            if difficulty is not None:
+                # Easiest part to the form that is hardest so far, and so on
+                part_sums = [sum(_difficulty(difficulty, qid) for qid in part) for part in parts]
+                parts = [parts[i] for i in sorted(order, key=part_sums.__getitem__, reverse=True)]
+                order = sorted(order, key=totals.__getitem__)
+                for f, part in zip(order, parts):
+                    totals[f] += sum(_difficulty(difficulty, qid) for qid in part)
+            for f, part in zip(order, parts):
+                forms[f].extend(part)
+
+        self.size = size
+        self.difficulty = difficulty
+        self.layouts = []
+        order = list(range(CHOICES_PER_QUESTION))
+        for form in forms:
+            rng.shuffle(form)   # mix the categories
+            perm = array("B")
+            for qid in form:
+                rng.shuffle(order)
+                perm.extend(order)
+                perm.append(order.index(questions[qid].answer))
+            self.layouts.append((tuple(form), bytes(perm)))
+
+    def __len__(self):
+        return len(self.layouts)
+
+    def layout(self, index):
+        """(question ids, choice orders) of form `index`: a tuple and bytes, shared by every session on it."""
+        return self.layouts[index]
+
+    def mean_difficulty(self, index):
+        """Mean share of right answers over the form's questions (needs difficulty)."""
+        ids = self.layouts[index][0]
+        return sum(_difficulty(self.difficulty, qid) for qid in ids) / len(ids)
+
+
+def bank_difficulty(bank):
+    """The p-values from the bank's item statistics file, or None if it has none."""
+    path = getattr(bank, "path", None)
+    if path is None:
+        return None
+    from apfrench.analysis import ItemStats, stats_path
+    try:
+        return ItemStats.load(stats_path(path)).p_value
+    except FileNotFoundError:
+        return None
+
+
+def get_forms(questions, size, count=DEFAULT_FORMS, seed=0, difficulty=None):
+    """FormSet for these parameters, from the LRU cache when it was made before."""
+    bank_key = getattr(questions, "path", None) or id(questions)
+    if isinstance(bank_key, str):
+        bank_key = (bank_key, os.path.getmtime(bank_key))
+    key = (bank_key, len(questions), size, count, seed, difficulty is not None)
+    return _cache.get(key, lambda: FormSet(questions, size, count, seed, difficulty))
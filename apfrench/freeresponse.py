@@ -0,0 +1,225 @@
+"""
+Typed answers
+-------------
+Free-response mode: the student types the answer instead of picking it
+among the choices, and the text is graded against the question's choices.
+
+Both sides are compared in folded form (apfrench.search.fold: no case,
+no accents, no guillemets, œ spelled out) reduced to their words, so
+"ÉTÉ", "ete" and " été. " are the same answer; an answer that is only
+right once folded is accepted but flagged, so the feedback can show the
+accents. What is left may differ by a slip of the keyboard: an answer is
+also accepted within a small edit distance (insertions, deletions and
+substitutions) of the correct choice, growing with its length:
+
+    up to 3 letters     exact
+    4 to 7 letters      1 edit
+    8 letters or more   2 edits
+
+Three rules keep that tolerance from accepting wrong answers. The typed
+text must be strictly closer to the correct choice than to any of the
+distractors, which are usually the likely mistakes. In grammar questions,
+where the spelling is the point ("avait" is one edit from "avais"), only
+accents and case are forgiven, not typos. And when the accents are what
+tells the correct choice from a distractor ("où" and "ou"), they are
+kept for that question.
+
+Each choice also accepts its alternatives: "D'accord / Ça fonctionne"
+accepts either side of the slash, and "La Révolution française (prise de
+la Bastille)" accepts the text without its parenthesis.
+
+The distance is computed on a band of width 2 x tolerance + 1 around the
+diagonal and gives up as soon as the tolerance is exceeded, after
+skipping any common prefix and suffix; a question's folded choices are
+prepared once and kept in an LRU (AnswerKeys), so grading an answer takes
+a few microseconds and a server can grade a whole class in one request.
+"""
+
+import re
+from collections import OrderedDict, namedtuple
+
+from apfrench.search import _TRANSLATE, words
+
+EXACT = "exact"         # right as typed (case and spacing aside)
+ACCENTS = "accents"     # right once accents are ignored
+TYPO = "typo"           # within the typing tolerance of the right answer
+WRONG = "wrong"
+
+STRICT_CATEGORIES = ("grammar",)
+
+Verdict = namedtuple("Verdict", "correct kind chosen distance expected")
+Verdict.__doc__ = """\
+Grading of one typed answer: correct (bool), kind (EXACT, ACCENTS, TYPO
+or WRONG), chosen (index into the question's original choices that the
+text was matched to, or None), distance (edits from that choice) and
+expected (the correct choice's text)."""
+
+_SPELLED_WORD = re.compile(r"\w+")
+_ALTERNATIVES = re.compile(r"\s+/\s+")
+_PARENTHESIS = re.compile(r"\s*\([^)]*\)")
+
+
+def normalize(text):
+    """The folded words of `text`, separated by single spaces."""
+    return " ".join(words(text))
+
+
+def _spelled(text):
+    """Like normalize, but keeping the accents."""
+    return " ".join(_SPELLED_WORD.findall(text.casefold().translate(_TRANSLATE)))
+
+
+def tolerance(answer):
+    """Edits accepted for a (normalized) answer of this length."""
+    letters = len(answer) - answer.count(" ")
+    return 0 if letters <= 3 else 1 if letters <= 7 else 2
+
+
+def variants(choice):
+    """The texts accepted for one choice: itself, each side of a " / ", without its (parenthesis)."""
+    found = [choice]
+    for text in (choice, _PARENTHESIS.sub("", choice)):
+        found.extend(_ALTERNATIVES.split(text))
+    return list(dict.fromkeys(t.strip() for t in found if t.strip()))
+
+
+def distance(a, b, limit):
+    """Levenshtein distance between `a` and `b`, or limit + 1 if it is more than `limit`."""
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # Common prefix and suffix cost nothing
+    start = 0
+    end_a, end_b = len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a = a[start:end_a]
+    b = b[start:end_b]
+    if not a or not b:
+        return len(a) + len(b)
+
+    # Only cells within `limit` of the diagonal can stay within `limit`
+    over = limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        lo = max(1, i - limit)
+        hi = min(len(b), i + limit)
+        current = [over] * (len(b) + 1)
+        if lo == 1:
+            current[0] = i
+        best = current[0] if lo == 1 else over
+        for j in range(lo, hi + 1):
+            cost = previous[j - 1] + (ca != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost
+            if cost < best:
+                best = cost
+        if best > limit:
+            return over
+        previous = current
+    return min(previous[len(b)], over)
+
+
+class AnswerKey:
+    """The folded forms one question's choices are matched against."""
+    __slots__ = ("answer", "expected", "spelled", "limit", "choices", "fold", "_seen")
+
+    def __init__(self, q, strict=False):
+        """
+        :param q: Question
+        :param strict: forgive accents and case only, not typos
+        """
+        self.answer = q.answer
+        self.expected = q.choices[q.answer]
+        self.spelled = {_spelled(v) for v in variants(self.expected)}
+        # (original index, normalized variants) per choice, the correct one first
+        order = [q.answer] + [i for i in range(len(q.choices)) if i != q.answer]
+        self.fold = normalize
+        self.choices = [(i, [n for n in map(normalize, variants(q.choices[i])) if n]) for i in order]
+        right = set(self.choices[0][1])
+        if any(n in right for _, forms in self.choices[1:] for n in forms):
+            # A distractor differs from the answer only by its accents: keep them
+            self.fold = _spelled
+            self.choices = [(i, [n for n in map(_spelled, variants(q.choices[i])) if n]) for i in order]
+        # An answer that is only punctuation has no variant left to forgive typos in
+        self.limit = 0 if strict else max((tolerance(n) for n in self.choices[0][1]), default=0)
+        self._seen = {}     # folded text -> Verdict, for answers typed by several students
+
+    def grade(self, text):
+        """Verdict for a typed answer."""
+        typed = self.fold(text)
+        verdict = self._seen.get(typed)
+        if verdict is None:
+            verdict = self._grade(typed)
+            if len(self._seen) >= 64:
+                self._seen.clear()
+            self._seen[typed] = verdict
+        if verdict.kind == ACCENTS and _spelled(text) in self.spelled:
+            return verdict._replace(kind=EXACT)
+        return verdict
+
+    def _grade(self, typed):
+        if not typed:
+            return Verdict(False, WRONG, None, None, self.expected)
+        limit = self.limit
+        best = None     # (distance, index)
+        for index, forms in self.choices:
+            for form in forms:
+                # A distractor only matters if it is at least as close as the best so far
+                bound = limit if best is None else min(limit, best[0])
+                d = distance(typed, form, bound)
+                if d <= bound and (best is None or d < best[0] or index != self.answer and d == best[0]):
+                    best = (d, index)
+                if d == 0:
+                    break
+            if best is not None and best[0] == 0:
+                break
+        if best is None:
+            return Verdict(False, WRONG, None, None, self.expected)
+        d, index = best
+        if index != self.answer:
+            return Verdict(False, WRONG, index, d, self.expected)
+        return Verdict(True, ACCENTS if d == 0 else TYPO, index, d, self.expected)
+
+
+class AnswerKeys:
+    """AnswerKey per question of a bank, prepared on first use and kept in an LRU."""
+    def __init__(self, questions, strict_categories=STRICT_CATEGORIES, max_keys=4096):
+        """
+        :param questions: sequence of Question objects (a list or a Bank)
+        :param strict_categories: categories where typos are not forgiven
+        :param max_keys: questions whose keys are kept
+        """
+        self.questions = questions
+        self.strict_categories = frozenset(strict_categories)
+        self.max_keys = max_keys
+        self._keys = OrderedDict()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def key(self, q):
+        """The AnswerKey of Question `q`."""
+        key = self._keys.get(q.id)
+        if key is None:
+            key = self._keys[q.id] = AnswerKey(q, q.category in self.strict_categories)
+            if len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+        else:
+            self._keys.move_to_end(q.id)
+        return key
+
+    def grade(self, qid, text):
+        """Verdict for `text` typed as the answer to question `qid`."""
+        return self.key(self.questions[qid]).grade(text)
+
+    def grade_many(self, answers):
+        """Verdicts for an iterable of (question id, text), e.g. a whole class's answers."""
+        return [self.grade(qid, text) for qid, text in answers]
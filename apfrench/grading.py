@@ -0,0 +1,204 @@
+"""
+Answer sheet grading
+--------------------
+Grades answer sheets collected offline (a mock exam on paper, a text
+form) against a bank, with the same rule as the quiz: a question is right
+only if the chosen letter is its answer, and a blank counts as wrong.
+
+A sheet is a text file, one answer per line: the question id (its
+position in the bank) and the letter chosen, in the order the choices are
+stored in the bank. A line "student: NAME" names the student (default:
+the file name); blank answers are "-" or a missing letter, and anything
+after "#" is a comment. A question counts once: if its id comes up again
+on the sheet, the first answer is graded and the later ones are reported.
+Sheets are read as UTF-8; one that cannot be read is reported as such
+and the others are still graded.
+
+    student: Camille
+    12 B
+    13, d
+    27 -        # left blank
+
+Sheets are graded in a process pool, one file per task; only file names
+go to the workers and only small result tuples come back. The bank is
+never pickled: it is opened (memory-mapped) before the pool starts, so
+forked workers inherit the mapping, and where processes are spawned
+instead of forked each worker maps the same file, which the OS shares
+through its page cache.
+
+Command line:
+    python3 -m apfrench.grading DIRECTORY [--bank PATH] [--workers N] [--out results.csv]
+"""
+
+import csv
+import multiprocessing
+import os
+import re
+import time
+from collections import namedtuple
+
+from apfrench.bank import DEFAULT_BANK_PATH, Bank, open_default_bank
+
+_LETTERS = "ABCD"
+SHEET_EXTENSIONS = (".txt", ".csv")
+_QUESTION_ID = re.compile(r"[0-9]+")
+
+SheetResult = namedtuple("SheetResult", "path student questions correct blank errors")
+
+_bank = None   # the bank shared by the worker processes
+
+
+def _open_bank(path):
+    global _bank
+    if _bank is None or _bank.path != path:
+        # The default bank is (re)built from apfrench/questions.py when missing
+        _bank = open_default_bank(path) if path == DEFAULT_BANK_PATH else Bank(path)
+
+
+def parse_sheet(lines, default_student=""):
+    """
+    Read one sheet.
+    :return: (student, [(line number, question id, chosen index or None)], [error message])
+    """
+    student = default_student
+    answers = []
+    errors = []
+    for line_no, line in enumerate(lines, 1):
+        line = line.partition("#")[0].strip()
+        if not line:
+            continue
+        if line.lower().startswith("student:"):
+            student = line.partition(":")[2].strip() or default_student
+            continue
+        fields = line.replace(",", " ").split()
+        if not _QUESTION_ID.fullmatch(fields[0]) or len(fields) > 2:
+            errors.append(f"line {line_no}: expected a question id and a letter, got {line!r}")
+            continue
+        letter = fields[1].upper() if len(fields) == 2 else "-"
+        if letter == "-":
+            chosen = None
+        elif len(letter) == 1 and letter in _LETTERS:
+            chosen = _LETTERS.index(letter)
+        else:
+            errors.append(f"line {line_no}: {fields[1]!r} is not a letter A-D")
+            continue
+        answers.append((line_no, int(fields[0]), chosen))
+    return student, answers, errors
+
+
+def grade_sheet(path):
+    """Grade one sheet file against the shared bank (an unreadable file is a sheet with one error)."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    try:
+        with open(path, encoding="utf-8") as f:
+            student, answers, errors = parse_sheet(f, name)
+    except (OSError, UnicodeDecodeError) as e:
+        return SheetResult(path, name, 0, 0, 0, [f"cannot read the sheet: {e}"])
+    count = len(_bank)
+    questions = correct = blank = 0
+    first_line = {}     # question id -> line of the answer that counts
+    for line_no, qid, chosen in answers:
+        if qid >= count:
+            errors.append(f"line {line_no}: no question {qid} in the bank")
+            continue
+        if qid in first_line:
+            errors.append(f"line {line_no}: question {qid} already answered on line {first_line[qid]}")
+            continue
+        first_line[qid] = line_no
+        questions += 1
+        if chosen is None:
+            blank += 1
+        elif _bank[qid].is_correct(chosen):
+            correct += 1
+    return SheetResult(path, student, questions, correct, blank, errors)
+
+
+def list_sheets(directory):
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.lower().endswith(SHEET_EXTENSIONS))
+
+
+class GradeReport:
+    """Per-sheet results and throughput."""
+    def __init__(self):
+        self.results = []
+        self.workers = 1
+        self.elapsed = 0.0
+
+    @property
+    def answers(self):
+        return sum(r.questions for r in self.results)
+
+    @property
+    def sheets_per_s(self):
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def answers_per_s(self):
+        return self.answers / self.elapsed if self.elapsed else 0.0
+
+
+def grade_directory(directory, bank_path=DEFAULT_BANK_PATH, workers=None):
+    """
+    Grade every sheet in `directory`.
+    :param workers: processes to use (default: one per CPU; 1 grades in this process)
+    :return: GradeReport, results in file name order
+    """
+    paths = list_sheets(directory)
+    report = GradeReport()
+    report.workers = workers = max(1, min(workers or os.cpu_count() or 1, len(paths) or 1))
+    t0 = time.perf_counter()
+    # Opened before the pool starts, so forked workers inherit the mapping
+    _open_bank(bank_path)
+    if workers == 1:
+        report.results = [grade_sheet(path) for path in paths]
+    else:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        chunksize = max(1, len(paths) // (workers * 8))
+        with context.Pool(workers, initializer=_open_bank, initargs=(bank_path,)) as pool:
+            report.results = list(pool.imap(grade_sheet, paths, chunksize))
+    report.elapsed = time.perf_counter() - t0
+    return report
+
+
+def write_results(report, path):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["student", "file", "questions", "correct", "blank", "percent"])
+        for r in report.results:
+            percent = (r.correct / r.questions) * 100 if r.questions else 0.0
+            writer.writerow([r.student, os.path.basename(r.path), r.questions, r.correct, r.blank, f"{percent:.1f}"])
+
+
+# ---------------------------
+# Command line
+# ---------------------------
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python3 -m apfrench.grading", description="Grade offline answer sheets.")
+    parser.add_argument("directory", help="folder of answer sheets (.txt or .csv)")
+    parser.add_argument("--bank", default=DEFAULT_BANK_PATH, help="bank the question ids refer to")
+    parser.add_argument("--workers", type=int, help="processes to use (default: one per CPU)")
+    parser.add_argument("--out", metavar="CSV", help="write one row per student")
+    parser.add_argument("--show", type=int, default=20, metavar="N", help="list the first N sheets (default 20)")
+    args = parser.parse_args(argv)
+
+    report = grade_directory(args.directory, args.bank, args.workers)
+    for r in report.results[:args.show]:
+        percent = (r.correct / r.questions) * 100 if r.questions else 0.0
+        print(f"{r.student:<24} {r.correct:>4}/{r.questions:<4} {percent:>5.1f}%")
+    for r in report.results:
+        for message in r.errors:
+            print(f"{r.path}: {message}")
+    print(f"\n{len(report.results):,} sheets, {report.answers:,} answers graded in {report.elapsed:.2f}s "
+          f"with {report.workers} process(es): {report.sheets_per_s:,.0f} sheets/s, "
+          f"{report.answers_per_s:,.0f} answers/s")
+    if args.out:
+        write_results(report, args.out)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,515 @@
+"""
+Quiz window
+-----------
+The Tkinter front end for a QuizEngine (or a RemoteEngine). One window
+class serves every variant of the quiz; what used to be three forked
+scripts are now options:
+
+    layout  "row"       answers side by side in a resizable window (version 1)
+            "grid"      2 x 2 answers of equal size in a fixed 800x500
+                        window (versions 2 and 3)
+    timer   "off"       no timer
+            "optional"  "15s timer" checkbox, unticked at start
+            "on"        same checkbox, ticked at start
+    typed   False       pick one of the answer buttons
+            True        type the answer (graded by apfrench.freeresponse)
+
+While the feedback on an answer is shown, the next question is prepared
+on a worker thread (QuizEngine.prefetch), so "Next Question" does not
+wait for the bank. The engine is left alone until that thread is done:
+everything that uses it afterwards first waits for it (wait_prefetch).
+
+Listening questions (Question.audio) get an "Écouter" button and start
+playing when shown; their clips are decoded on the prefetch thread too
+and kept in an apfrench.audio.ClipCache, so playback starts at once.
+
+The session size belongs to the engine. This is the only module that
+imports tkinter; apfrench.launch imports it once the command line has
+been parsed and the bank opened.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from apfrench.render import Renderer
+from apfrench.timer import Countdown
+
+LAYOUTS = ("row", "grid")
+TIMER_MODES = ("off", "optional", "on")
+ADVANCE_DELAY_MS = 1000   # pause on "time's up" before moving on
+
+
+class QuizApp(tk.Tk):
+    """Main application window and logic for the AP French quiz."""
+    def __init__(self, engine, layout="row", timer="optional", time_per_question=15, response_times=None,
+                 typed=False):
+        """
+        :param engine: QuizEngine or RemoteEngine running the session
+        :param layout: "row" or "grid" (see the module docstring)
+        :param timer: "off", "optional" or "on"
+        :param time_per_question: seconds per question when the timer is on
+        :param response_times: optional ResponseTimes; the results then include answer times
+        :param typed: answers are typed instead of picked
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"layout must be one of {LAYOUTS}, not {layout!r}")
+        if timer not in TIMER_MODES:
+            raise ValueError(f"timer must be one of {TIMER_MODES}, not {timer!r}")
+        super().__init__()
+
+        self.title("AP French Practice Quiz")
+        self.layout = layout
+        if layout == "grid":
+            # Fixed window size (consistent box)
+            self.geometry("800x500")
+            self.resizable(False, False)
+        else:
+            # Minimum size for usability
+            self.minsize(640, 360)
+
+        # Quiz configuration
+        self.engine = engine
+        self.timer_mode = timer
+        self.time_per_question = time_per_question
+        self.response_times = response_times
+        self.typed = typed
+        self._prefetch_thread = None
+        self.player = None          # apfrench.audio.Player, made for the first listening question
+
+        # State variables
+        self.timer_enabled = tk.BooleanVar(value=timer == "on")
+        # Deadline-based countdown; it holds the only pending after() handle
+        # for the current question (ticks or the delayed auto-advance)
+        self.timer = Countdown(self.after, self.after_cancel, self._on_timer_tick, self._on_time_up)
+
+        # All widget changes are staged here, diffed against what is on
+        # screen and applied together in one idle callback
+        self.view = Renderer(self.after_idle)
+
+        # Build the GUI
+        self.build_widgets()
+
+        if layout == "row":
+            # Bind resizing to adjust wraplength (the root's binding also sees
+            # its children's <Configure> events; on_resize ignores those)
+            self.bind("<Configure>", self.on_resize)
+            # Place the window in the center of the screen (optional)
+            try:
+                self.eval('tk::PlaceWindow . center')
+            except tk.TclError:
+                pass
+
+    # ---------------------------
+    # Quiz state management
+    # ---------------------------
+    def reset_quiz_state(self):
+        """Reset / (re)start quiz internal variables and shuffle questions."""
+        self.wait_prefetch()
+        self.engine.reset()
+        # Cancel any running timer if present
+        self.timer.cancel()
+
+    # ---------------------------
+    # GUI construction
+    # ---------------------------
+    def build_widgets(self):
+        """Create and lay out all widgets."""
+        grid = self.layout == "grid"
+
+        # Top frame: title & settings
+        top_frame = ttk.Frame(self, padding=(10, 8))
+        top_frame.grid(row=0, column=0, sticky="ew")
+        top_frame.columnconfigure(0, weight=1)
+
+        title_label = ttk.Label(top_frame, text="AP French Practice Quiz",
+                                font=("Helvetica", 20 if grid else 18, "bold"))
+        title_label.grid(row=0, column=0, sticky="w")
+
+        # Timer toggle and restart button
+        controls_frame = ttk.Frame(top_frame)
+        controls_frame.grid(row=0, column=1, sticky="e")
+
+        if self.timer_mode != "off":
+            timer_check = ttk.Checkbutton(controls_frame, text=f"{self.time_per_question}s timer",
+                                          variable=self.timer_enabled, command=self.on_timer_toggle)
+            timer_check.grid(row=0, column=0, padx=5)
+
+        restart_btn = ttk.Button(controls_frame, text="Restart Quiz", command=self.on_restart)
+        restart_btn.grid(row=0, column=1, padx=5)
+
+        # Main content frame
+        content = ttk.Frame(self, padding=(10, 10))
+        content.grid(row=1, column=0, sticky="nsew")
+        self.rowconfigure(1, weight=1)
+        self.columnconfigure(0, weight=1)
+        content.columnconfigure(0, weight=1)
+        content.rowconfigure(1, weight=1)
+
+        # Progress label
+        self.progress_var = tk.StringVar()
+        self.progress_label = ttk.Label(content, textvariable=self.progress_var)
+        self.progress_label.grid(row=0, column=0, sticky="w", pady=(0, 6))
+
+        # Question frame with a label (multiline)
+        self.question_frame = ttk.Frame(content)
+        self.question_frame.grid(row=1, column=0, sticky="nsew")
+        self.question_frame.columnconfigure(0, weight=1)
+        self.question_label = ttk.Label(self.question_frame, text="", wraplength=750 if grid else 600,
+                                        justify="left", font=("Helvetica", 15 if grid else 14))
+        self.question_label.grid(row=0, column=0, sticky="nw")
+        # Listening questions only (shown by show_question)
+        self.listen_button = ttk.Button(self.question_frame, text="🔊 Écouter", command=self.play_audio)
+
+        # Answer buttons (A/B/C/D): one row, or a 2 x 2 grid of equal buttons
+        answers_frame = ttk.Frame(content)
+        answers_frame.grid(row=2, column=0, sticky="ew" if not grid else "", pady=(10, 0))
+        self.answer_buttons = []
+        if self.typed:
+            # Typed answers: an entry and a submit button stand in for the choices.
+            # The entry's variable is set directly, not through the renderer,
+            # since typing changes it behind the renderer's back.
+            answers_frame.columnconfigure(0, weight=1)
+            self.typed_var = tk.StringVar()
+            self.answer_entry = ttk.Entry(answers_frame, textvariable=self.typed_var,
+                                          font=("Helvetica", 15 if grid else 14))
+            self.answer_entry.grid(row=0, column=0, padx=5, sticky="ew")
+            self.answer_entry.bind("<Return>", lambda event: self.on_typed_answer())
+            submit = ttk.Button(answers_frame, text="Valider", command=self.on_typed_answer)
+            submit.grid(row=0, column=1, padx=5)
+            self.answer_buttons = [self.answer_entry, submit]
+        for i in range(0 if self.typed else 4):
+            if grid:
+                btn = ttk.Button(answers_frame, text=f"Choice {chr(65+i)}", width=30, padding=10,
+                                 command=lambda idx=i: self.on_answer(idx))
+                btn.grid(row=i // 2, column=i % 2, padx=8, pady=8)
+            else:
+                answers_frame.columnconfigure(i, weight=1, uniform="choice")
+                btn = ttk.Button(answers_frame, text=f"Choice {chr(65+i)}", command=lambda idx=i: self.on_answer(idx))
+                btn.grid(row=0, column=i, padx=5, sticky="ew")
+            self.answer_buttons.append(btn)
+
+        # Feedback and timer
+        bottom_frame = ttk.Frame(content)
+        bottom_frame.grid(row=3, column=0, sticky="ew", pady=(8, 0))
+        bottom_frame.columnconfigure(0, weight=1)
+
+        self.feedback_var = tk.StringVar()
+        self.feedback_label = ttk.Label(bottom_frame, textvariable=self.feedback_var,
+                                        font=("Helvetica", 11, "italic"))
+        self.feedback_label.grid(row=0, column=0, sticky="w")
+
+        self.timer_var = tk.StringVar(value="")
+        self.timer_label = ttk.Label(bottom_frame, textvariable=self.timer_var, font=("Helvetica", 11))
+        self.timer_label.grid(row=0, column=1, sticky="e")
+
+        # Next question button
+        self.next_button = ttk.Button(self, text="Next Question", command=self.next_question)
+        self.next_button.grid(row=4, column=0, pady=(8, 10))
+
+        # Start the quiz by showing first question
+        self.show_question()
+
+    # ---------------------------
+    # Helper UI functions
+    # ---------------------------
+    def on_resize(self, event):
+        """
+        Adjust the wraplength of the question label when the window width changes
+        so the text wraps nicely in resized window. A drag produces a burst
+        of events; the renderer only applies the last width, once, on idle.
+        """
+        if event.widget is not self:
+            return
+        # Keep some padding margin
+        new_wrap = max(200, event.width - 120)
+        self.view.update(self.question_label, wraplength=new_wrap)
+
+    def on_timer_toggle(self):
+        """Enable or disable timer; if enabled, start timer for current question."""
+        if self.timer_enabled.get():
+            # start or reset timer, unless there is nothing left to time
+            if not self.engine.answered and not self.engine.finished:
+                self.start_timer()
+        else:
+            # cancel any existing timer
+            self.timer.cancel()
+            self.view.update(self.timer_var, value="")
+
+    def start_timer(self):
+        """Start countdown for the current question (restarts any running one)."""
+        self.timer.start(self.time_per_question)
+
+    def _on_timer_tick(self, seconds_left):
+        """Countdown tick: show the seconds left (derived from the deadline)."""
+        self.view.update(self.timer_var, value=f"Time left: {seconds_left}s")
+
+    def _on_time_up(self):
+        """Deadline passed: count the question as missed and auto-advance."""
+        if self.engine.answered or self.engine.finished:
+            return
+        # Time's up: treat as attempted and move on
+        self.view.update(self.feedback_var, value="Temps écoulé — la question est passée.")
+        # Disable answer buttons to avoid late clicks
+        self.disable_answer_buttons()
+        # Count as attempted but incorrect (no points)
+        self.engine.time_up()
+        self.start_prefetch()
+        # Wait a moment for user to see feedback, then go next
+        # (same handle as the countdown, so Next/Restart cancel it)
+        self.timer.call_later(ADVANCE_DELAY_MS, self.next_question)
+
+    def enable_answer_buttons(self):
+        """Enable answer buttons (after moving to next question)."""
+        for b in self.answer_buttons:
+            self.view.update(b, state="normal")
+
+    def disable_answer_buttons(self):
+        """Disable answer buttons to prevent repeated answers."""
+        for b in self.answer_buttons:
+            self.view.update(b, state="disabled")
+
+    # ---------------------------
+    # Question display & answering
+    # ---------------------------
+    def show_question(self):
+        """Display the current question and its shuffled choices."""
+        # Cancel any pending timer
+        self.timer.cancel()
+
+        if self.engine.finished:
+            # No more questions: show results
+            self.show_results()
+            return
+
+        q = self.engine.current
+        # Update progress label
+        self.view.update(self.progress_var,
+                         value=f"Question {self.engine.current_index + 1} of {self.engine.session_length}")
+
+        # Put question text into label (wrap for readability)
+        self.view.update(self.question_label, text=q.question)
+        self.show_audio(q)
+
+        # Display choices and enable buttons
+        if self.typed:
+            self.typed_var.set("")
+            self.answer_entry.focus_set()
+        else:
+            for i, choice_text in enumerate(self.engine.current_choices):
+                self.view.update(self.answer_buttons[i], text=f"{chr(65+i)}. {choice_text}")
+        self.enable_answer_buttons()
+        self.view.update(self.feedback_var, value="")  # clear feedback
+
+        # The last question leads to the results
+        last = self.engine.current_index == self.engine.session_length - 1
+        self.view.update(self.next_button, text="View Results" if last else "Next Question")
+        self.engine.mark_shown()  # response time starts now
+
+        # If timer enabled, start it
+        if self.timer_enabled.get():
+            self.start_timer()
+        else:
+            self.view.update(self.timer_var, value="")
+
+    def show_audio(self, q):
+        """Show the listen button and start the clip for a listening question; hide it otherwise."""
+        if self.player is not None:
+            self.player.stop()
+        if getattr(q, "audio", ""):
+            self.listen_button.grid(row=1, column=0, sticky="w", pady=(6, 0))
+            self.play_audio()
+        else:
+            self.listen_button.grid_remove()
+
+    def _audio_player(self):
+        if self.player is None:
+            from apfrench.audio import Player
+            self.player = Player()
+        return self.player
+
+    def play_audio(self):
+        """(Re)play the current question's clip."""
+        from apfrench.audio import AudioError
+        try:
+            self._audio_player().play(self.engine.current.audio)
+        except (AudioError, OSError) as e:
+            self.view.update(self.feedback_var, value=f"Audio indisponible : {e}")
+
+    def on_answer(self, chosen_index):
+        """
+        Called when user clicks an answer button.
+        :param chosen_index: 0..3 which button they clicked
+        """
+        # Prevent answering if buttons disabled
+        # (ask the renderer: the widget itself may not be updated yet)
+        if self.view.get(self.answer_buttons[0], "state") == "disabled":
+            return
+
+        # Stop timer if running
+        self.timer.cancel()
+
+        q = self.engine.current
+
+        # Evaluate correctness (the engine updates the score)
+        if self.engine.answer(chosen_index):
+            self.view.update(self.feedback_var, value="Correct ! 🎉")
+        else:
+            correct_text = self.engine.current_choices[self.engine.current_answer_index]
+            explanation = q.explain
+            self.view.update(self.feedback_var,
+                             value=f"Incorrect — la bonne réponse : {correct_text}. {explanation}")
+
+        self._answered()
+
+    def on_typed_answer(self):
+        """Called when the user submits a typed answer (Enter or the Valider button)."""
+        if self.view.get(self.answer_buttons[0], "state") == "disabled":
+            return
+        text = self.typed_var.get()
+        if not text.strip():
+            return
+        self.timer.cancel()
+
+        from apfrench.freeresponse import ACCENTS, TYPO
+        verdict = self.engine.answer_text(text)
+        if verdict.kind == ACCENTS:
+            self.view.update(self.feedback_var, value=f"Correct ! Attention aux accents : {verdict.expected}")
+        elif verdict.kind == TYPO:
+            self.view.update(self.feedback_var, value=f"Correct ! (petite faute de frappe : {verdict.expected})")
+        elif verdict.correct:
+            self.view.update(self.feedback_var, value="Correct ! 🎉")
+        else:
+            self.view.update(self.feedback_var,
+                             value=f"Incorrect — la bonne réponse : {verdict.expected}. {self.engine.current.explain}")
+        self._answered()
+
+    def _answered(self):
+        """Lock the answer after it has been graded."""
+        # Disable answer buttons to avoid multiple answers
+        self.disable_answer_buttons()
+        # An adaptive session may have just decided this was its last question
+        if self.engine.current_index == self.engine.session_length - 1:
+            self.view.update(self.next_button, text="View Results")
+        self.start_prefetch()
+
+    # ---------------------------
+    # Prefetch
+    # ---------------------------
+    def start_prefetch(self):
+        """Prepare the next question on a worker thread while the feedback is read."""
+        if getattr(self.engine, "prefetch", None) is None:
+            return   # RemoteEngine: the server only sends a question on "next"
+        import threading
+        self.wait_prefetch()
+        self._prefetch_thread = threading.Thread(target=self.prefetch, name="prefetch", daemon=True)
+        self._prefetch_thread.start()
+
+    def prefetch(self):
+        """Worker thread: everything the next question needs before it can be shown."""
+        try:
+            q = self.engine.prefetch()
+            if q is not None and q.audio:
+                self._audio_player().clips.load(q.audio)
+        except Exception:
+            pass   # show_question will run into the same problem and report it
+
+    def wait_prefetch(self):
+        """Let a running prefetch finish before the engine is used again."""
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join()
+            self._prefetch_thread = None
+
+    def next_question(self):
+        """Advance to next question or to results if finished."""
+        # Cancel timer if present
+        self.timer.cancel()
+        self.wait_prefetch()
+
+        # If no answer yet and we move on (e.g., user pressed Next), we don't auto-penalize here.
+        # To keep a simple consistent rule: only increment attempted when user answers or when timer runs out.
+        if self.engine.advance():
+            self.show_question()
+        else:
+            self.show_results()
+
+    # ---------------------------
+    # Results and restart
+    # ---------------------------
+    def show_results(self):
+        """Display final results and study tips based on score."""
+        # Cancel any timer
+        self.timer.cancel()
+        if self.player is not None:
+            self.player.stop()
+        # Bring the screen up to date before the modal popup
+        self.view.flush()
+        from tkinter import messagebox  # only needed here, so not at startup
+
+        # Calculate percentage. If user attempted less than total, we treat unattempted as attempted=total questions
+        attempted = max(self.engine.total_attempted, self.engine.session_length)
+        percent = self.engine.percent(attempted)
+
+        # Build message
+        tips = self.study_tips(percent)
+        msg = (
+            f"Quiz terminé !\n\n"
+            f"Résultats:\n"
+            f"Score: {self.engine.score_correct} correct sur {attempted}\n"
+            f"Pourcentage: {percent:.1f}%\n"
+            f"Code de la session: {self.engine.session_seed}{self.form_label()}\n\n"
+            f"{self.ability_summary()}"
+            f"{self.timing_summary()}"
+            f"Conseils d'étude:\n{tips}\n\n"
+            "Voulez-vous recommencer le quiz ?"
+        )
+
+        # Show results in a popup with options to restart or close
+        if messagebox.askyesno("Résultats du Quiz", msg):
+            self.on_restart()
+        else:
+            # Disable buttons so the user can't continue the finished quiz
+            self.disable_answer_buttons()
+            self.view.update(self.next_button, state="disabled")
+            self.view.update(self.feedback_var, value="Quiz terminé. Cliquez Restart Quiz pour refaire le quiz.")
+
+    def form_label(self):
+        """Form name for the results, e.g. " (sujet B)", when the session was an exam form."""
+        form = getattr(self.engine, "form", None)
+        if form is None:
+            return ""
+        from apfrench.forms import form_name
+        return f" (sujet {form_name(form)})"
+
+    def ability_summary(self):
+        """Ability line for the results popup (empty unless the session was adaptive)."""
+        adaptive = getattr(self.engine, "adaptive", None)
+        if adaptive is None or not adaptive.answers:
+            return ""
+        return f"Niveau estimé: {adaptive.theta:+.1f} (± {adaptive.standard_error:.1f})\n\n"
+
+    def timing_summary(self):
+        """Answer-time line for the results popup (empty unless timing is on)."""
+        if self.response_times is None or not self.response_times.session.total:
+            return ""
+        s = self.response_times.session.summary()
+        return f"Temps de réponse: médiane {s['p50_s']:.1f}s, 90e centile {s['p90_s']:.1f}s\n\n"
+
+    def study_tips(self, percentage):
+        """Return study tips string based on percentage score."""
+        if percentage >= 90:
+            return "- Excellent travail ! Continuez à pratiquer la conversation et la lecture."
+        elif percentage >= 75:
+            return "- Bon travail ! Renforcez le vocabulaire et révisez les faux-amis."
+        elif percentage >= 50:
+            return "- Moyennement bien. Travaillez la grammaire (subjonctif, temps) et la compréhension écrite."
+        else:
+            return ("- Revue recommandée : révisez le vocabulaire de base, les conjugaisons, "
+                    "et pratiquez des passages de lecture chaque jour.")
+
+    def on_restart(self):
+        """Handler to restart the quiz: reset state and UI, reshuffle."""
+        self.reset_quiz_state()
+        # Re-enable next and answer buttons
+        self.view.update(self.next_button, state="normal")
+        self.enable_answer_buttons()
+        self.show_question()
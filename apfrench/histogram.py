@@ -0,0 +1,173 @@
+"""
+Response-time histograms
+------------------------
+HDR-style (log-linear) histograms of how long students take to answer,
+kept per question, per category, for the current session and overall.
+
+A value is mapped to its bucket with a bit_length() and a shift, and
+recording is one increment in a preallocated array('Q'), so the answer
+path does integer arithmetic only. Bucket width grows with the value, so
+relative precision is constant: 2**-(sub_bits - 1), i.e. under 2% with
+the default 7 bits (per-question histograms use 4 bits to stay small).
+Values are microseconds.
+
+The GUIs' --timing option shows the session's median and 90th percentile
+with the results and writes a per-question/per-category summary to
+apfrench/data/response_times.csv on exit (ResponseTimes.export_csv).
+"""
+
+import csv
+import os
+from array import array
+
+US_PER_S = 1_000_000
+
+DEFAULT_EXPORT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "response_times.csv")
+
+
+class Histogram:
+    """Log-linear histogram of non-negative integers (microseconds)."""
+    __slots__ = ("sub_bits", "highest", "counts", "total", "sum", "max_value")
+
+    def __init__(self, sub_bits=7, highest=1 << 32):
+        """
+        :param sub_bits: buckets per power of two = 2 ** (sub_bits - 1)
+        :param highest: values at or above this are clamped (default ~71 minutes)
+        """
+        self.sub_bits = sub_bits
+        self.highest = highest
+        self.counts = array("Q", bytes(8 * (self._index(highest - 1) + 1)))
+        self.total = 0
+        self.sum = 0
+        self.max_value = 0
+
+    def _index(self, value):
+        half = 1 << (self.sub_bits - 1)
+        if value < 2 * half:
+            return value
+        shift = value.bit_length() - self.sub_bits
+        return shift * half + (value >> shift)
+
+    def _bucket_range(self, index):
+        """(lowest, highest) value that maps to bucket `index`."""
+        half = 1 << (self.sub_bits - 1)
+        if index < 2 * half:
+            return index, index
+        shift = index // half - 1
+        low = (index - shift * half) << shift
+        return low, low + (1 << shift) - 1
+
+    def add(self, index, value):
+        """Count `value`, already clamped and mapped to bucket `index`."""
+        self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+        if value > self.max_value:
+            self.max_value = value
+
+    def record(self, value):
+        """Count one value (integer arithmetic only, no allocation)."""
+        value = min(max(value, 0), self.highest - 1)
+        self.add(self._index(value), value)
+
+    def percentile(self, pct):
+        """Value below which `pct` percent of the recorded values fall."""
+        if not self.total:
+            return 0
+        target = max(1, round(pct / 100 * self.total))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                seen += count
+                if seen >= target:
+                    return min(self._bucket_range(index)[1], self.max_value)
+        return self.max_value
+
+    @property
+    def mean(self):
+        return self.sum / self.total if self.total else 0.0
+
+    def merge(self, other):
+        """Add another histogram with the same layout into this one."""
+        if other.sub_bits != self.sub_bits or other.highest != self.highest:
+            raise ValueError("can only merge histograms with the same layout")
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        self.total += other.total
+        self.sum += other.sum
+        self.max_value = max(self.max_value, other.max_value)
+
+    def reset(self):
+        self.counts = array("Q", bytes(8 * len(self.counts)))
+        self.total = 0
+        self.sum = 0
+        self.max_value = 0
+
+    def summary(self):
+        """Dict of count, mean and percentiles, in seconds."""
+        return {
+            "count": self.total,
+            "mean_s": self.mean / US_PER_S,
+            "p50_s": self.percentile(50) / US_PER_S,
+            "p90_s": self.percentile(90) / US_PER_S,
+            "p99_s": self.percentile(99) / US_PER_S,
+            "max_s": self.max_value / US_PER_S,
+        }
+
+
+class ResponseTimes:
+    """Response-time histograms per question, per category, per session and overall."""
+    QUESTION_SUB_BITS = 4
+
+    def __init__(self):
+        self.overall = Histogram()
+        self.session = Histogram()
+        self.by_category = {}
+        self.by_question = {}
+
+    def prepare(self, question):
+        """
+        Make sure the histograms for `question` exist. Called when the
+        question is shown, so that record() never has to allocate one.
+        """
+        if question.id not in self.by_question:
+            self.by_question[question.id] = Histogram(self.QUESTION_SUB_BITS)
+        if question.category not in self.by_category:
+            self.by_category[question.category] = Histogram()
+
+    def start_session(self):
+        self.session.reset()
+
+    def record(self, question, elapsed_ns):
+        """Record one answer time (nanoseconds, as measured by the engine)."""
+        overall = self.overall
+        value = min(max(elapsed_ns // 1000, 0), overall.highest - 1)
+        # Both bucket indexes are computed once and shared by the histograms
+        index = overall._index(value)
+        overall.add(index, value)
+        self.session.add(index, value)
+        self.by_category[question.category].add(index, value)
+        per_question = self.by_question[question.id]
+        per_question.add(per_question._index(value), value)
+
+    def rows(self):
+        """(scope, key, summary dict) for every histogram with data."""
+        yield "overall", "", self.overall.summary()
+        for name, hist in sorted(self.by_category.items()):
+            if hist.total:
+                yield "category", name or "-", hist.summary()
+        for qid, hist in sorted(self.by_question.items()):
+            if hist.total:
+                yield "question", qid, hist.summary()
+
+    def export_csv(self, path=DEFAULT_EXPORT_PATH):
+        """Write one summary row per histogram to a CSV file."""
+        fields = ("count", "mean_s", "p50_s", "p90_s", "p99_s", "max_s")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(("scope", "key") + fields)
+            for scope, key, summary in self.rows():
+                writer.writerow([scope, key, summary["count"]] + [f"{summary[k]:.3f}" for k in fields[1:]])
@@ -0,0 +1,286 @@
+"""
+Bulk question import
+--------------------
+Streams questions from CSV or JSON Lines files into a bank file, one row
+at a time: rows are parsed, validated and written straight through an
+apfrench.bank.BankWriter, so no question text is kept in memory. What
+remains per accepted question is a 12-byte bank index entry and a 64-bit
+fingerprint in an open-addressing table (16-32 bytes, instead of ~70 for
+a Python set of ints): about 50 MB for a million questions.
+
+Each row needs a question, exactly four choices and the index of the
+right one; explain, category and audio (the clip of a listening
+question, see apfrench.audio) are optional.
+
+    JSONL   {"question": "...", "choices": ["...", "...", "...", "..."],
+             "answer": 2, "explain": "...", "category": "grammar"}
+    CSV     header row with question, answer, explain, category, audio and one
+            column per choice, named choice_a .. choice_d (any column
+            whose name starts with "choice", in order); answer is 0-3 or
+            a letter A-D; empty choice cells are ignored
+
+A row is rejected if a field is missing or malformed, if it does not have
+exactly four choices, if answer does not index into them, or if it
+duplicates a question already imported (same question text, the same
+choices and the same audio clip, ignoring case, spacing and choice order).
+
+Command line:
+    python3 -m apfrench.importer FILE [FILE ...] [--out PATH] [--no-builtin]
+"""
+
+import csv
+import hashlib
+import json
+import os
+import time
+from array import array
+
+from apfrench.bank import DEFAULT_BANK_PATH, BankWriter
+from apfrench.question import Question, validate_question
+
+_LETTERS = "ABCD"
+
+
+# ---------------------------
+# Reading rows
+# ---------------------------
+def read_jsonl(path):
+    """Yield (line number, dict) for every non-blank line."""
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield line_no, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, e
+
+
+def read_csv(path):
+    """Yield (line number, dict) per data row; choice columns are gathered into "choices"."""
+    # utf-8-sig: spreadsheets (Excel) start their CSV exports with a byte order mark
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader, [])]
+        choice_columns = [i for i, name in enumerate(header) if name.startswith("choice")]
+        other_columns = [(i, name) for i, name in enumerate(header) if not name.startswith("choice")]
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            data = {name: row[i] for i, name in other_columns if i < len(row)}
+            data["choices"] = [row[i] for i in choice_columns if i < len(row) and row[i].strip()]
+            yield reader.line_num, data
+
+
+def read_rows(path):
+    """Pick the reader from the file extension (.csv, or .jsonl / .ndjson)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return read_csv(path)
+    if ext in (".jsonl", ".ndjson"):
+        return read_jsonl(path)
+    raise ValueError(f"{path}: unknown file type {ext!r} (expected .csv, .jsonl or .ndjson)")
+
+
+# ---------------------------
+# Validation
+# ---------------------------
+def parse_answer(value):
+    """Answer index from an int, a digit string or a letter A-D."""
+    if isinstance(value, bool):
+        raise ValueError(f"answer must be an index or a letter, not {value!r}")
+    if isinstance(value, int):
+        return value
+    text = str(value).strip()
+    if len(text) == 1 and text.upper() in _LETTERS:
+        return _LETTERS.index(text.upper())
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"answer must be an index or a letter, not {value!r}") from None
+
+
+def row_to_question(data, position):
+    """Build and validate a Question from one parsed row (raises ValueError)."""
+    if isinstance(data, Exception):
+        raise ValueError(f"not valid JSON ({data.msg})")
+    if not isinstance(data, dict):
+        raise ValueError("expected an object")
+    for field in ("question", "choices", "answer"):
+        if field not in data or data[field] in ("", None):
+            raise ValueError(f"missing {field!r}")
+    choices = data["choices"]
+    if not isinstance(choices, list) or not all(isinstance(c, str) for c in choices):
+        raise ValueError("choices must be a list of strings")
+    q = Question(position, str(data["question"]).strip(), [c.strip() for c in choices],
+                 parse_answer(data["answer"]), str(data.get("explain") or "").strip(),
+                 str(data.get("category") or "").strip().lower(), str(data.get("audio") or "").strip())
+    try:
+        validate_question(q)
+    except ValueError as e:
+        # Report by file line, not by the bank position the row would get
+        raise ValueError(str(e).partition(": ")[2]) from None
+    return q
+
+
+def _normalize(text):
+    return " ".join(text.casefold().split())
+
+
+def fingerprint(q):
+    """64-bit key identifying a question regardless of case, spacing and choice order."""
+    key = "\x1f".join([_normalize(q.question)] + sorted(_normalize(c) for c in q.choices))
+    if q.audio:
+        # Listening questions often share their text; the clip tells them apart
+        key += "\x1e" + q.audio
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class FingerprintSet:
+    """Set of 64-bit fingerprints stored flat in an array('Q') (linear probing)."""
+    def __init__(self, capacity=1024):
+        self._slots = array("Q", bytes(8 * capacity))
+        self._used = 0
+
+    def __len__(self):
+        return self._used
+
+    def __contains__(self, key):
+        key = key or 1
+        return self._slots[self._slot(key)] == key
+
+    def _slot(self, key):
+        """Slot holding `key`, or the empty slot where it would go."""
+        slots = self._slots
+        mask = len(slots) - 1    # capacity is a power of two
+        i = key & mask           # fingerprints are hashes: the low bits are uniform
+        while True:
+            value = slots[i]
+            if value == key or not value:
+                return i
+            i = (i + 1) & mask
+
+    def add(self, key):
+        """Insert `key`; return False if it was already there."""
+        key = key or 1           # 0 marks an empty slot
+        i = self._slot(key)
+        slots = self._slots
+        if slots[i] == key:
+            return False
+        slots[i] = key
+        self._used += 1
+        if self._used * 2 > len(slots):
+            self._grow()
+        return True
+
+    def _grow(self):
+        old = self._slots
+        self._slots = array("Q", bytes(16 * len(old)))
+        self._used = 0
+        for key in old:
+            if key:
+                self.add(key)
+
+
+# ---------------------------
+# Import
+# ---------------------------
+class ImportReport:
+    """Counts and the first few rejected rows of an import."""
+    def __init__(self, keep_errors=20):
+        self.rows = 0
+        self.imported = 0
+        self.invalid = 0
+        self.duplicates = 0
+        self.errors = []        # (file, line, message), at most keep_errors
+        self.keep_errors = keep_errors
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_s(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def reject(self, path, line_no, message, duplicate=False):
+        if duplicate:
+            self.duplicates += 1
+        else:
+            self.invalid += 1
+        if len(self.errors) < self.keep_errors:
+            self.errors.append((path, line_no, message))
+
+
+def import_questions(paths, out=DEFAULT_BANK_PATH, include_builtin=True, keep_errors=20):
+    """
+    Stream the given CSV/JSONL files into a new bank file.
+    :param paths: input files, imported in order (ValueError up front if
+        one is not a .csv, .jsonl or .ndjson file)
+    :param out: bank file to write (replaced atomically when done)
+    :param include_builtin: start the bank with apfrench/questions.py
+    :return: ImportReport
+    """
+    report = ImportReport(keep_errors)
+    readers = [(path, read_rows(path)) for path in paths]   # rows are only read when iterated
+    seen = FingerprintSet()
+    t0 = time.perf_counter()
+    with BankWriter(out) as writer:
+        if include_builtin:
+            from apfrench.questions import QUESTIONS
+            for data in QUESTIONS:
+                q = Question.from_dict(data, len(writer))
+                seen.add(fingerprint(q))
+                writer.add(q)
+        for path, rows in readers:
+            for line_no, data in rows:
+                report.rows += 1
+                try:
+                    q = row_to_question(data, len(writer))
+                except ValueError as e:
+                    report.reject(path, line_no, str(e))
+                    continue
+                key = fingerprint(q)
+                if key in seen:
+                    report.reject(path, line_no, "duplicate question", duplicate=True)
+                    continue
+                try:
+                    writer.add(q)
+                except ValueError as e:     # e.g. one category too many for the bank format
+                    report.reject(path, line_no, str(e))
+                    continue
+                # Only once it is in the bank: a later valid copy of a rejected row is not a duplicate
+                seen.add(key)
+                report.imported += 1
+    report.elapsed = time.perf_counter() - t0
+    return report
+
+
+# ---------------------------
+# Command line
+# ---------------------------
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python3 -m apfrench.importer",
+                                     description="Import questions from CSV / JSON Lines files into a bank file.")
+    parser.add_argument("files", nargs="+", help=".csv, .jsonl or .ndjson files")
+    parser.add_argument("--out", default=DEFAULT_BANK_PATH, help="bank file to write (default: the quiz's bank)")
+    parser.add_argument("--no-builtin", action="store_true",
+                        help="do not include the questions from apfrench/questions.py")
+    parser.add_argument("--show-errors", type=int, default=20, metavar="N", help="list the first N rejected rows")
+    args = parser.parse_args(argv)
+
+    try:
+        report = import_questions(args.files, args.out, not args.no_builtin, args.show_errors)
+    except (ValueError, OSError) as e:
+        raise SystemExit(str(e)) from None
+    for path, line_no, message in report.errors:
+        print(f"{path}:{line_no}: {message}")
+    if report.errors:
+        print()
+    print(f"{report.rows:,} rows read: {report.imported:,} imported, {report.invalid:,} invalid, "
+          f"{report.duplicates:,} duplicates")
+    print(f"{report.elapsed:.2f}s ({report.rows_per_s:,.0f} rows/s) -> {args.out}")
+    if args.out == DEFAULT_BANK_PATH:
+        print("Note: the quiz rebuilds this file from apfrench/questions.py if that file is edited later.")
+
+
+if __name__ == "__main__":
+    main()
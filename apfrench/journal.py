@@ -0,0 +1,226 @@
+"""
+Results journal
+---------------
+An append-only binary log of every answer event, so progress survives
+between runs. Records are fixed-size, buffered in memory and written +
+fsync'ed in batches (every `sync_every` events or `sync_interval`
+seconds, whichever comes first), which keeps the per-answer cost to a
+struct.pack_into.
+
+File layout (little-endian):
+
+    header  "<4sHH"      magic b"APFJ", format version, record size
+    records "<IIbBId"    student id, question id, chosen choice (index
+                         into the question's original choices, -1 = timed
+                         out, -2 = typed answer matching no choice),
+                         correct flag, response time in ms,
+                         timestamp (seconds since the epoch)
+
+The aggregation functions stream the file in fixed-size chunks, so memory
+use depends on the number of distinct students/questions, not on the
+number of events. A truncated last record (e.g. after a power cut) is
+ignored by readers and cut off the next time the journal is opened for
+writing.
+
+Command line:
+    python3 -m apfrench.journal stats [PATH] [--by student|question]
+"""
+
+import os
+import struct
+import time
+from collections import namedtuple
+
+MAGIC = b"APFJ"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHH")
+RECORD = struct.Struct("<IIbBId")
+TIMED_OUT = -1
+UNMATCHED = -2
+
+DEFAULT_JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "results.journal")
+
+AnswerEvent = namedtuple("AnswerEvent", "student_id question_id chosen correct response_ms timestamp")
+
+
+class JournalFormatError(ValueError):
+    """Raised when a file is not a readable results journal."""
+
+
+# ---------------------------
+# Writing
+# ---------------------------
+class Journal:
+    """Buffered, append-only writer for answer events."""
+    def __init__(self, path=DEFAULT_JOURNAL_PATH, sync_every=32, sync_interval=2.0):
+        """
+        :param path: journal file (created with a header if missing)
+        :param sync_every: write + fsync after this many buffered events
+        :param sync_interval: ... or when this many seconds passed since the last sync
+        """
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(_HEADER.pack(MAGIC, VERSION, RECORD.size))
+            self._file.flush()
+        else:
+            _check_header(path)
+            # Drop a partial record left by a crash so new records stay aligned
+            extra = (self._file.tell() - _HEADER.size) % RECORD.size
+            if extra:
+                self._file.truncate(self._file.tell() - extra)
+
+        self._buffer = bytearray(RECORD.size * sync_every)
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def append(self, student_id, question_id, chosen, correct, response_ms, timestamp=None, session_id=None):
+        """
+        Buffer one answer event; flushes to disk when a batch is complete.
+        :param chosen: original choice index, TIMED_OUT or UNMATCHED
+        :param session_id: not recorded (the journal has no sessions; see apfrench.store)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        RECORD.pack_into(self._buffer, self._pending * RECORD.size,
+                         student_id, question_id, chosen, correct, min(int(response_ms), 0xFFFFFFFF), timestamp)
+        self._pending += 1
+        if self._pending >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self):
+        """Write buffered events and fsync them."""
+        if self._pending:
+            self._file.write(memoryview(self._buffer)[:self._pending * RECORD.size])
+            self._pending = 0
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------------------
+# Reading & aggregation
+# ---------------------------
+def _check_header(path):
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise JournalFormatError(f"{path}: file too small to be a results journal")
+    magic, version, record_size = _HEADER.unpack(header)
+    if magic != MAGIC:
+        raise JournalFormatError(f"{path}: not a results journal (bad magic)")
+    if version != VERSION or record_size != RECORD.size:
+        raise JournalFormatError(f"{path}: unsupported journal version {version}")
+
+
+def iter_events(path=DEFAULT_JOURNAL_PATH, chunk_records=65536):
+    """Stream raw event tuples (see AnswerEvent for the field order)."""
+    _check_header(path)
+    chunk_size = RECORD.size * chunk_records
+    with open(path, "rb") as f:
+        f.seek(_HEADER.size)
+        while True:
+            chunk = f.read(chunk_size)
+            usable = len(chunk) - len(chunk) % RECORD.size
+            if usable:
+                yield from RECORD.iter_unpack(memoryview(chunk)[:usable])
+            if len(chunk) < chunk_size:
+                break
+
+
+class Accuracy:
+    """Running totals for one student or one question."""
+    __slots__ = ("attempts", "correct", "response_ms")
+
+    def __init__(self):
+        self.attempts = 0
+        self.correct = 0
+        self.response_ms = 0
+
+    @property
+    def percent(self):
+        return (self.correct / self.attempts) * 100 if self.attempts else 0.0
+
+    @property
+    def mean_response_ms(self):
+        return self.response_ms / self.attempts if self.attempts else 0.0
+
+
+def aggregate(path=DEFAULT_JOURNAL_PATH, student_id=None):
+    """
+    One streaming pass over the journal.
+    :param student_id: only count this student's events (optional)
+    :return: ({student_id: Accuracy}, {question_id: Accuracy})
+    """
+    students = {}
+    questions = {}
+    for student, question, _chosen, correct, response_ms, _ts in iter_events(path):
+        if student_id is not None and student != student_id:
+            continue
+        s = students.get(student)
+        if s is None:
+            s = students[student] = Accuracy()
+        q = questions.get(question)
+        if q is None:
+            q = questions[question] = Accuracy()
+        s.attempts += 1
+        s.correct += correct
+        s.response_ms += response_ms
+        q.attempts += 1
+        q.correct += correct
+        q.response_ms += response_ms
+    return students, questions
+
+
+def accuracy_by_student(path=DEFAULT_JOURNAL_PATH):
+    return aggregate(path)[0]
+
+
+def accuracy_by_question(path=DEFAULT_JOURNAL_PATH, student_id=None):
+    return aggregate(path, student_id)[1]
+
+
+# ---------------------------
+# Command line
+# ---------------------------
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python3 -m apfrench.journal", description="Summarize the results journal.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    stats = sub.add_parser("stats", help="accuracy per student or per question")
+    stats.add_argument("path", nargs="?", default=DEFAULT_JOURNAL_PATH)
+    stats.add_argument("--by", choices=("student", "question"), default="student")
+    stats.add_argument("--student", type=int, help="only this student's answers")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    students, questions = aggregate(args.path, args.student)
+    elapsed = time.perf_counter() - t0
+    rows = students if args.by == "student" else questions
+    print(f"{args.by:>10} {'answers':>9} {'correct':>9} {'accuracy':>9} {'avg time':>9}")
+    for key in sorted(rows):
+        acc = rows[key]
+        print(f"{key:>10} {acc.attempts:>9,} {acc.correct:>9,} {acc.percent:>8.1f}% {acc.mean_response_ms / 1000:>8.1f}s")
+    events = sum(acc.attempts for acc in students.values())
+    print(f"\n{events:,} events aggregated in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Quiz launcher
+-------------
+The command line behind `python3 -m apfrench` and the three
+ap-french-quiz-*.py scripts, which are now just presets:
+
+    classic   ap-french-quiz-1.py   every question, answers in a row, optional timer
+    short     ap-french-quiz-2.py   5 questions, 2 x 2 grid, no timer
+    timed     ap-french-quiz-3.py   5 questions, 2 x 2 grid, optional timer
+
+Every option of a preset can be overridden (--session-size, --layout,
+--timer, --seconds), so one code path serves them all: one bank load,
+one import graph.
+
+tkinter is imported only after the command line has been parsed and the
+bank opened, so `--help`, a bad option or a bank rebuild never pays for
+it.
+
+Command line:
+    python3 -m apfrench [--preset classic|short|timed] [--session-size N|all]
+                        [--layout row|grid] [--timer off|optional|on] [--seconds S]
+                        [--bank PATH] [--review | --adaptive | --forms K] [--seed N]
+                        [--server HOST:PORT] [--timing] [--typed] [--store [--student NAME]]
+"""
+
+import argparse
+import contextlib
+import sys
+
+from apfrench import startup
+from apfrench.bank import DEFAULT_BANK_PATH, Bank, open_default_bank
+from apfrench.engine import QuizEngine
+from apfrench.journal import Journal
+
+# Keep in sync with apfrench.gui (not imported here: it imports tkinter)
+LAYOUTS = ("row", "grid")
+TIMER_MODES = ("off", "optional", "on")
+
+PRESETS = {
+    "classic": {"session_size": None, "layout": "row", "timer": "optional"},
+    "short": {"session_size": 5, "layout": "grid", "timer": "off"},
+    "timed": {"session_size": 5, "layout": "grid", "timer": "optional"},
+}
+
+
+def _session_size(text):
+    if text == "all":
+        return text   # becomes None once the preset has been applied
+    size = int(text)
+    if size < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return size
+
+
+def _server_address(text):
+    host, _, port = text.rpartition(":")
+    if not host or not (port.isascii() and port.isdigit()) or not 0 < int(port) < 65536:
+        raise argparse.ArgumentTypeError(f"expected HOST:PORT (e.g. 192.168.1.20:8765), got {text!r}")
+    return host, int(port)
+
+
+def parse_args(argv=None, preset="classic"):
+    """
+    Parse the command line on top of a preset.
+    :return: argparse.Namespace with every setting filled in
+    """
+    parser = argparse.ArgumentParser(prog="python3 -m apfrench", description="AP French Practice Quiz")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default=preset,
+                        help=f"starting configuration (default: {preset})")
+    parser.add_argument("--session-size", type=_session_size, metavar="N|all",
+                        help="questions per session, or 'all'")
+    parser.add_argument("--layout", choices=LAYOUTS, help="answers in a row (resizable) or a 2 x 2 grid")
+    parser.add_argument("--timer", choices=TIMER_MODES, help="no timer, a timer checkbox, or timer on at start")
+    parser.add_argument("--seconds", type=int, default=15, help="seconds per question when the timer is on")
+    parser.add_argument("--bank", metavar="PATH",
+                        help="question bank file (e.g. from python3 -m apfrench.importer); "
+                             "default: apfrench/data/questions.apfq, built from apfrench/questions.py")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--review", action="store_true",
+                      help="spaced-repetition mode: ask the questions that are due for review")
+    mode.add_argument("--adaptive", action="store_true",
+                      help="adaptive mode: questions matched to the student's level, stopping once it is "
+                           "measured (difficulties from python3 -m apfrench.analysis)")
+    mode.add_argument("--forms", type=int, metavar="K",
+                      help="exam mode: each session is one of K prepared forms covering every category")
+    parser.add_argument("--seed", type=int,
+                        help="session code: replays the same questions in the same order "
+                             "(shown with the results)")
+    parser.add_argument("--server", type=_server_address, metavar="HOST:PORT",
+                        help="take the quiz from a shared quiz server (python3 -m apfrench.server)")
+    parser.add_argument("--timing", action="store_true",
+                        help="show answer times with the results and export them on exit")
+    parser.add_argument("--store", action="store_true",
+                        help="keep progress (students, sessions, answers) in the SQLite progress store "
+                             "instead of the results journal")
+    parser.add_argument("--student", metavar="NAME",
+                        help="whose progress this is (with --store, or --server if the server has --store)")
+    parser.add_argument("--typed", action="store_true",
+                        help="type the answers instead of picking them (accents and small typos are forgiven)")
+    args = parser.parse_args(argv)
+    if args.server and (args.review or args.adaptive or args.forms):
+        parser.error("--review, --adaptive and --forms are not available with --server "
+                     "(start the server with --forms instead)")
+
+    if args.student and not (args.store or args.server):
+        parser.error("--student needs --store or --server")
+
+    for name, value in PRESETS[args.preset].items():
+        if getattr(args, name) is None:
+            setattr(args, name, value)
+    if args.session_size == "all":
+        args.session_size = None
+    if args.forms is not None and (args.forms < 1 or args.session_size is None):
+        parser.error("--forms needs a positive number of forms and a --session-size")
+    return args
+
+
+def _adaptive_session(bank_path, count):
+    """Adaptive session using the bank's item statistics, if they have been computed."""
+    from apfrench.adaptive import AdaptiveSession, ItemPool
+    from apfrench.analysis import ItemStats, stats_path
+
+    path = stats_path(bank_path)
+    try:
+        stats = ItemStats.load(path)
+    except FileNotFoundError:
+        print(f"No item statistics in {path} yet (python3 -m apfrench.analysis): "
+              "every question starts at medium difficulty.", file=sys.stderr)
+        stats = ItemStats(0)
+    return AdaptiveSession(ItemPool.from_stats(stats, count, two_parameter=True))
+
+
+def main(argv=None, preset="classic"):
+    """
+    Open the bank, build the engine and run the quiz window.
+    :param preset: configuration used when --preset is not given
+    """
+    args = parse_args(argv, preset)
+    startup.mark("imports")
+
+    # The bank is validated when it is built, and its size is a header read
+    bank = Bank(args.bank) if args.bank else open_default_bank()
+    if args.session_size is not None and len(bank) < args.session_size:
+        raise SystemExit(f"The bank has {len(bank)} questions; a {args.session_size}-question quiz needs more.")
+    startup.mark("bank")
+
+    # Optional features are imported only when asked for, to keep startup short
+    scheduler = None
+    if args.review:
+        from apfrench.srs import Scheduler, schedule_path
+        schedule_file = schedule_path(args.bank or DEFAULT_BANK_PATH)
+        scheduler = Scheduler.load(schedule_file, count=len(bank))
+    adaptive = None
+    if args.adaptive:
+        adaptive = _adaptive_session(args.bank or DEFAULT_BANK_PATH, len(bank))
+    forms = None
+    if args.forms:
+        from apfrench.forms import bank_difficulty, get_forms
+        try:
+            forms = get_forms(bank, args.session_size, args.forms, difficulty=bank_difficulty(bank))
+        except ValueError as e:
+            raise SystemExit(str(e)) from None
+    # Answer times are only measured locally (a server journals its own)
+    response_times = None
+    if args.timing and not args.server:
+        from apfrench.histogram import ResponseTimes
+        response_times = ResponseTimes()
+
+    with contextlib.ExitStack() as resources:
+        if args.server:
+            # The server keeps the progress (it looks the student up by name
+            # itself), so nothing is journaled here
+            from apfrench.client import RemoteEngine
+            host, port = args.server
+            try:
+                engine = RemoteEngine(host, port, session_size=args.session_size, seed=args.seed,
+                                      student_name=args.student)
+            except OSError as e:
+                raise SystemExit(f"Cannot reach the quiz server at {host}:{port}: {e}") from None
+            resources.enter_context(engine)
+        else:
+            # Every answer is appended to apfrench/data/results.journal
+            # (see `python3 -m apfrench.journal stats`), or with --store to
+            # apfrench/data/progress.sqlite (see `python3 -m apfrench.store`)
+            if args.store:
+                from apfrench.store import Store
+                journal = resources.enter_context(Store())
+            else:
+                journal = resources.enter_context(Journal())
+            student_id = journal.student(args.student) if args.student else 0
+            engine = QuizEngine(bank, session_size=args.session_size, journal=journal, student_id=student_id,
+                                scheduler=scheduler, response_times=response_times, adaptive=adaptive,
+                                seed=args.seed, forms=forms)
+
+        from apfrench.gui import QuizApp  # the first tkinter import
+        startup.mark("tk")
+        app = QuizApp(engine, layout=args.layout, timer=args.timer, time_per_question=args.seconds,
+                      response_times=response_times, typed=args.typed)
+        startup.mark("window")
+        startup.first_frame(app)
+        app.mainloop()
+    if scheduler is not None:
+        scheduler.save(schedule_file)
+    if response_times is not None:
+        response_times.export_csv()
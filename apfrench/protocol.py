@@ -0,0 +1,88 @@
+"""
+Quiz server wire protocol
+-------------------------
+Newline-delimited JSON over a TCP (or Unix) socket, one request and one
+reply per line. Shared by apfrench.server and apfrench.client.
+
+Requests (client -> server):
+
+    {"op": "start", "student": 0, "session_size": 5, "categories": {...}, "seed": 42}
+    {"op": "start", "name": "Camille", "session_size": 5}
+    {"op": "answer", "choice": 2}
+    {"op": "answer", "text": "pluvieux"}
+    {"op": "time_up"}
+    {"op": "next"}
+    {"op": "results"}
+    {"op": "grade", "answers": [[12, "avais"], [12, "avait"], ...]}
+
+"seed" is optional (the server picks one). A student is given by id or,
+on a server started with --store, by name, which the server looks up in
+its own progress store. "start" and "next" reply with
+a question (or {"finished": true, ...} at the end of the session), which
+includes the session's seed and, for a listening question, the name of
+its clip ("audio"), which clients play from their own apfrench/audio
+folder; "answer" replies with the grading. A typed
+answer ("text", see apfrench.freeresponse) is graded against the
+choices, and the reply also carries the verdict ("exact", "accents",
+"typo" or "wrong"). "grade" needs no session: it grades a batch of typed
+answers, [question id, text] each, e.g. a whole class's answers to a
+dictation, and replies {"results": [verdict, ...]} in the same order.
+Each question takes one "answer" or "time_up"; a second one, or
+one after the end of the session, is an error. Errors come back as
+{"error": "..."}.
+"""
+
+import json
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def encode(message):
+    """Serialize one message to a protocol line (bytes)."""
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def decode(line):
+    """Parse one protocol line."""
+    return json.loads(line)
+
+
+def question_message(engine):
+    """Describe the engine's current question (without the answer)."""
+    if engine.finished:
+        return results_message(engine)
+    q = engine.current
+    return {
+        "finished": False,
+        "index": engine.current_index,
+        "length": engine.session_length,
+        "id": q.id,
+        "question": q.question,
+        "choices": engine.current_choices,
+        "category": q.category,
+        "audio": q.audio,
+        "seed": engine.session_seed,
+    }
+
+
+def results_message(engine):
+    return {
+        "finished": engine.finished,
+        "score": engine.score_correct,
+        "attempted": engine.total_attempted,
+        "length": engine.session_length,
+        "percent": engine.percent(),
+        "seed": engine.session_seed,
+    }
+
+
+def verdict_message(verdict):
+    """A freeresponse.Verdict as a dict."""
+    return {
+        "correct": verdict.correct,
+        "verdict": verdict.kind,
+        "chosen": verdict.chosen,
+        "distance": verdict.distance,
+        "expected": verdict.expected,
+    }
@@ -0,0 +1,93 @@
+"""
+Question record
+---------------
+An immutable, __slots__-based question. Banks hand these out and sessions
+only keep references to them, so starting a new session never copies a
+question; the per-session shuffle lives in a small integer array in the
+engine instead.
+"""
+
+CHOICES_PER_QUESTION = 4
+
+
+class Question:
+    """One multiple-choice question (read-only)."""
+    __slots__ = ("id", "question", "choices", "answer", "explain", "category", "audio")
+
+    def __init__(self, id, question, choices, answer, explain="", category="", audio=""):
+        """
+        :param id: position of the question in its bank
+        :param question: question text (French)
+        :param choices: tuple of answer texts
+        :param answer: index of the correct choice
+        :param explain: explanation shown after a wrong answer (optional)
+        :param category: "vocabulary", "grammar", "culture", "reading" (optional)
+        :param audio: clip played with the question, for listening questions
+            (a .wav or .ogg file, relative to apfrench/audio; optional)
+        """
+        setter = object.__setattr__
+        setter(self, "id", id)
+        setter(self, "question", question)
+        setter(self, "choices", tuple(choices))
+        setter(self, "answer", answer)
+        setter(self, "explain", explain)
+        setter(self, "category", category)
+        setter(self, "audio", audio)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Question objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Question objects are immutable")
+
+    @classmethod
+    def from_dict(cls, data, id=0):
+        """Build a Question from a dict in the apfrench/questions.py format."""
+        return cls(id, data["question"], data["choices"], data["answer"],
+                   data.get("explain", ""), data.get("category", ""), data.get("audio", ""))
+
+    def to_dict(self):
+        """Inverse of from_dict (the id is not included)."""
+        data = {
+            "question": self.question,
+            "choices": list(self.choices),
+            "answer": self.answer,
+            "explain": self.explain,
+            "category": self.category,
+        }
+        if self.audio:
+            data["audio"] = self.audio
+        return data
+
+    def is_correct(self, chosen):
+        """
+        Grade a choice given in the question's original order (QuizEngine
+        does the same check on its shuffled order).
+        :param chosen: index into `choices`, or None / -1 for no answer
+        """
+        return chosen == self.answer
+
+    def __eq__(self, other):
+        if not isinstance(other, Question):
+            return NotImplemented
+        return (self.id, self.question, self.choices, self.answer, self.explain, self.category, self.audio) == \
+               (other.id, other.question, other.choices, other.answer, other.explain, other.category, other.audio)
+
+    def __hash__(self):
+        return hash((self.id, self.question, self.choices, self.answer))
+
+    def __repr__(self):
+        return f"Question(id={self.id!r}, question={self.question[:40]!r}...)"
+
+
+def validate_question(q):
+    """
+    Raise ValueError unless `q` can be asked: non-empty question text,
+    exactly CHOICES_PER_QUESTION choices and an answer index among them.
+    """
+    if not q.question.strip():
+        raise ValueError(f"question {q.id}: empty question text")
+    if len(q.choices) != CHOICES_PER_QUESTION:
+        raise ValueError(f"question {q.id}: {len(q.choices)} choices, expected {CHOICES_PER_QUESTION}")
+    if not 0 <= q.answer < len(q.choices):
+        raise ValueError(f"question {q.id}: answer index {q.answer} out of range")
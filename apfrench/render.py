@@ -0,0 +1,75 @@
+"""
+Batched widget updates
+----------------------
+The GUIs do not configure widgets directly. They stage what each widget
+should look like with Renderer.update(); the renderer compares that with
+what it last put on screen, keeps only real changes, and applies all of
+them in a single after_idle callback. So a question switch costs one Tcl
+configure call per widget that actually changed (no "enable" of buttons
+that are already enabled, no relabelling an unchanged Next button), and a
+burst of <Configure> events while the window is dragged collapses into
+one wraplength change.
+
+Targets are anything with configure(**options) (Tk/ttk widgets) or, for
+the pseudo-option `value`, set(value) (Tk variables). Once a widget or
+variable is managed by a renderer, every change to it must go through
+update(), or the renderer's idea of what is on screen goes stale.
+
+This module must not import tkinter.
+"""
+
+_MISSING = object()
+
+
+class Renderer:
+    """Diffs staged widget options against the screen and applies them on idle."""
+    def __init__(self, after_idle):
+        """
+        :param after_idle: function(callback) scheduling a call once the event
+            loop is idle (e.g. a Tk widget's after_idle)
+        """
+        self._after_idle = after_idle
+        self._shown = {}      # target -> {option: value} as last applied
+        self._pending = {}    # target -> {option: value} still to apply
+        self._scheduled = False
+        self.configure_calls = 0   # Tcl-level calls made, for benchmarks
+
+    def update(self, target, **options):
+        """Stage option values for `target`; unchanged ones are dropped."""
+        shown = self._shown.get(target, {})
+        pending = self._pending.get(target)
+        for name, value in options.items():
+            if shown.get(name, _MISSING) == value:
+                if pending is not None:
+                    # Changed and changed back before the flush: nothing to do
+                    pending.pop(name, None)
+                continue
+            if pending is None:
+                pending = self._pending[target] = {}
+            pending[name] = value
+        if self._pending and not self._scheduled:
+            self._scheduled = True
+            self._after_idle(self.flush)
+
+    def get(self, target, name, default=None):
+        """The value `name` has, or will have after the next flush."""
+        pending = self._pending.get(target)
+        if pending is not None and name in pending:
+            return pending[name]
+        return self._shown.get(target, {}).get(name, default)
+
+    def flush(self):
+        """Apply every staged change now (normally called on idle)."""
+        self._scheduled = False
+        pending, self._pending = self._pending, {}
+        for target, options in pending.items():
+            if not options:
+                continue
+            self._shown.setdefault(target, {}).update(options)
+            value = options.pop("value", _MISSING)
+            if value is not _MISSING:
+                target.set(value)
+                self.configure_calls += 1
+            if options:
+                target.configure(**options)
+                self.configure_calls += 1
@@ -0,0 +1,365 @@
+"""
+Full-text search
+----------------
+An inverted index (word -> ids of the questions that contain it) over the
+question text, the choices and the explanation of every question in a
+bank, so a query reads a few posting lists instead of rescanning the
+bank.
+
+Words are folded before indexing and before querying: lower case,
+accents removed (é -> e, ç -> c), œ / æ spelled out, guillemets « » and
+typographic apostrophes treated as punctuation. "Subjonctif",
+"SUBJONCTIF" and "subjonctif" are the same word, and so are "élève" and
+"eleve". Apostrophes split words: "l'école" is "l" + "ecole".
+
+Queries:
+
+    subjonctif             questions containing the word
+    victor hugo            ... containing both words (AND)
+    "victor hugo"          ... containing the phrase
+    subj*                  ... containing a word that starts with "subj"
+
+Posting lists are sorted arrays of question ids. A query starts from the
+shortest list and checks each candidate against the others with a
+bisect, so it costs O(k log n) for k candidates; phrases are then
+checked on the candidates' text only.
+
+The index is saved next to the bank (questions.apfq -> questions.search)
+and loaded in milliseconds: the vocabulary is read up front, posting
+lists are sliced out of the file only when a query needs them. The index
+records the size and modification time of the bank file it was built
+from; while they are unchanged it is used as it is. When the bank file
+has changed, the indexed questions are checked against a checksum of all
+of them (Bank.checksum: a crc32 over their records, milliseconds even for
+a large bank): if the bank still starts with exactly those questions,
+only the new ones are indexed; otherwise (a question edited, removed or moved)
+the index is rebuilt.
+
+File layout (little-endian):
+
+    header    "<4sHHII"  magic b"APFX", format version, reserved,
+              questions indexed, number of words
+    checks    "<IQQ"     checksum of the indexed questions (_checksum);
+              size and mtime (ns) of the bank file (0 if none)
+    words     per word: "<H"-length-prefixed UTF-8, "<I" list length
+    postings  the posting lists, "<I" * length each, in word order
+
+Command line:
+    python3 -m apfrench.search QUERY [--bank PATH] [--limit N] [--rebuild]
+"""
+
+import bisect
+import os
+import re
+import struct
+import sys
+import time
+import unicodedata
+import zlib
+from array import array
+
+from apfrench.bank import DEFAULT_BANK_PATH
+
+MAGIC = b"APFX"
+VERSION = 2
+
+_HEADER = struct.Struct("<4sHHII")
+_CHECKS = struct.Struct("<IQQ")
+_WORD_LEN = struct.Struct("<H")
+_COUNT = struct.Struct("<I")
+
+_TRANSLATE = str.maketrans({
+    "«": " ", "»": " ", "‹": " ", "›": " ", "“": " ", "”": " ",
+    "’": "'", "‘": "'", "œ": "oe", "æ": "ae", "\u00a0": " ", "\u202f": " ",
+})
+_WORD = re.compile(r"[a-z0-9]+")
+_QUERY = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def search_path(bank_path=DEFAULT_BANK_PATH):
+    """Where the search index of a bank is kept: next to it, with a .search extension."""
+    return os.path.splitext(bank_path)[0] + ".search"
+
+
+def fold(text):
+    """Lower case, no accents, no guillemets: the form words are indexed and searched in."""
+    text = text.casefold().translate(_TRANSLATE)
+    if not text.isascii():
+        text = unicodedata.normalize("NFD", text).encode("ascii", "ignore").decode("ascii")
+    return text
+
+
+def words(text):
+    """Folded words of `text`, in order."""
+    return _WORD.findall(fold(text))
+
+
+def question_words(q):
+    """Folded words of a question's text, choices and explanation."""
+    return words(" ".join((q.question, *q.choices, q.explain)))
+
+
+def _checksum(questions, count):
+    """Checksum of the first `count` questions: Bank.checksum, or a crc32 of their words for a list."""
+    if hasattr(questions, "checksum"):
+        return questions.checksum(count)
+    crc = 0
+    for qid in range(count):
+        crc = zlib.crc32((" ".join(question_words(questions[qid])) + "\n").encode("ascii"), crc)
+    return crc
+
+
+def _stamp(questions):
+    """(size, mtime in ns) of the bank file behind `questions`, or None for an in-memory list."""
+    path = getattr(questions, "path", None)
+    if path is None:
+        return None
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+class SearchIndex:
+    """Inverted index over a bank's questions, choices and explanations."""
+    def __init__(self):
+        self.count = 0          # questions indexed: ids 0 .. count - 1
+        self._lists = {}        # word -> array("I") of ids, or (start, length) into _data
+        self._data = None       # postings section of a loaded file
+        self._sorted = None     # sorted words, for prefix queries
+        self._crc = 0           # _checksum of the indexed questions
+        self.stamp = None       # _stamp of the bank when the index was last brought up to date
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def vocabulary(self):
+        return len(self._lists)
+
+    # ---------------------------
+    # Building
+    # ---------------------------
+    def add(self, q):
+        """Index one question; ids must be added in increasing order."""
+        if q.id < self.count:
+            raise ValueError(f"question {q.id} is already indexed")
+        lists = self._lists
+        folded = question_words(q)
+        for word in set(folded):
+            ids = lists.get(word)
+            if ids is None:
+                ids = lists[word] = array("I")
+                self._sorted = None
+            elif not isinstance(ids, array):
+                ids = lists[word] = array("I", self._slice(ids))
+            ids.append(q.id)
+        self.count = q.id + 1
+
+    def update(self, questions):
+        """Index the questions added since the last update; return how many were added."""
+        start = self.count
+        for qid in range(start, len(questions)):
+            self.add(questions[qid])
+        self._crc = _checksum(questions, self.count)
+        self.stamp = _stamp(questions)
+        return self.count - start
+
+    def matches(self, questions):
+        """
+        True if `questions` still starts with the questions this index was
+        built from: at once if the bank file is unchanged, otherwise by
+        checking every indexed question against the checksum.
+        """
+        if self.count == 0:
+            return True
+        if len(questions) < self.count:
+            return False
+        if self.stamp is not None and _stamp(questions) == self.stamp:
+            return True
+        return _checksum(questions, self.count) == self._crc
+
+    @classmethod
+    def build(cls, questions):
+        index = cls()
+        index.update(questions)
+        return index
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def _slice(self, entry):
+        start, length = entry
+        return self._data[start:start + length]
+
+    def postings(self, word):
+        """Sorted ids of the questions containing the (folded) word."""
+        ids = self._lists.get(word)
+        if ids is None:
+            return ()
+        return ids if isinstance(ids, array) else self._slice(ids)
+
+    def prefix(self, start):
+        """Sorted ids of the questions containing a word that starts with `start`."""
+        if self._sorted is None:
+            self._sorted = sorted(self._lists)
+        found = set()
+        i = bisect.bisect_left(self._sorted, start)
+        while i < len(self._sorted) and self._sorted[i].startswith(start):
+            found.update(self.postings(self._sorted[i]))
+            i += 1
+        return sorted(found)
+
+    def search(self, query, questions=None, limit=None):
+        """
+        Ids of the questions matching every term of `query`, in bank order.
+        :param questions: the bank, needed to check "quoted phrases"
+            (without it, a phrase only requires its words)
+        :param limit: stop after this many matches
+        """
+        lists = []
+        phrases = []
+        for phrase, term in _QUERY.findall(query):
+            if phrase:
+                phrase_words = words(phrase)
+                if len(phrase_words) > 1:
+                    phrases.append(" " + " ".join(phrase_words) + " ")
+                lists.extend(self.postings(w) for w in phrase_words)
+            elif term.endswith("*") and len(term) > 1:
+                lists.append(self.prefix(fold(term[:-1])))
+            else:
+                lists.extend(self.postings(w) for w in words(term))
+        if not lists:
+            return []
+
+        lists.sort(key=len)
+        found = []
+        for qid in lists[0]:
+            for other in lists[1:]:
+                k = bisect.bisect_left(other, qid)
+                if k == len(other) or other[k] != qid:
+                    break
+            else:
+                if phrases and questions is not None:
+                    text = " " + " ".join(question_words(questions[qid])) + " "
+                    if not all(p in text for p in phrases):
+                        continue
+                found.append(qid)
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+    def save(self, path):
+        """Write the index atomically."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        words_section = []
+        postings = array("I")
+        for word in sorted(self._lists):
+            ids = self.postings(word)
+            encoded = word.encode("utf-8")
+            words_section.append(_WORD_LEN.pack(len(encoded)) + encoded + _COUNT.pack(len(ids)))
+            postings.extend(ids)
+        if sys.byteorder == "big":
+            postings.byteswap()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, self.count, len(self._lists)))
+            f.write(_CHECKS.pack(self._crc, *(self.stamp or (0, 0))))
+            f.write(b"".join(words_section))
+            postings.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read the vocabulary; posting lists are sliced out when first needed."""
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < _HEADER.size + _CHECKS.size:
+            raise ValueError(f"{path}: not a search index")
+        magic, version, _, count, n_words = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a search index")
+        index = cls()
+        index.count = count
+        index._crc, size, mtime_ns = _CHECKS.unpack_from(data, _HEADER.size)
+        index.stamp = (size, mtime_ns) if mtime_ns else None
+        pos = _HEADER.size + _CHECKS.size
+        entries = []
+        start = 0
+        for _ in range(n_words):
+            (length,) = _WORD_LEN.unpack_from(data, pos)
+            pos += _WORD_LEN.size
+            word = data[pos:pos + length].decode("utf-8")
+            pos += length
+            (n,) = _COUNT.unpack_from(data, pos)
+            pos += _COUNT.size
+            entries.append((word, (start, n)))
+            start += n
+        if sys.byteorder == "little":
+            index._data = memoryview(data)[pos:pos + 4 * start].cast("I")
+        else:
+            index._data = array("I", data[pos:pos + 4 * start])
+            index._data.byteswap()
+        index._lists = dict(entries)
+        return index
+
+
+def open_index(bank, path=None):
+    """
+    The saved index of `bank`, brought up to date (new questions indexed,
+    or a rebuild if the bank changed) and saved again if it had to change.
+    """
+    if path is None:
+        path = search_path(bank.path)
+    try:
+        index = SearchIndex.load(path)
+    except (FileNotFoundError, ValueError):
+        index = None
+    if index is None or not index.matches(bank):
+        index = SearchIndex.build(bank)
+        index.save(path)
+    else:
+        stamp = index.stamp
+        if index.update(bank) or index.stamp != stamp:
+            index.save(path)
+    return index
+
+
+# ---------------------------
+# Command line
+# ---------------------------
+def main(argv=None):
+    import argparse
+
+    from apfrench.bank import Bank, open_default_bank
+
+    parser = argparse.ArgumentParser(prog="python3 -m apfrench.search",
+                                     description="Search the questions, choices and explanations of a bank.")
+    parser.add_argument("query", nargs="+", help='words, "a phrase" or a prefix*')
+    parser.add_argument("--bank", metavar="PATH", help="bank file (default: the quiz's bank)")
+    parser.add_argument("--limit", type=int, default=50, help="show at most N questions (default 50)")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index from scratch")
+    args = parser.parse_args(argv)
+
+    with Bank(args.bank) if args.bank else open_default_bank() as bank:
+        t0 = time.perf_counter()
+        if args.rebuild:
+            index = SearchIndex.build(bank)
+            index.save(search_path(bank.path))
+        else:
+            index = open_index(bank)
+        open_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        found = index.search(" ".join(args.query), bank)
+        query_ms = (time.perf_counter() - t0) * 1000
+        for qid in found[:args.limit]:
+            q = bank[qid]
+            print(f"{qid:>8}  [{q.category or '-'}] {q.question}")
+        more = f" (showing {args.limit})" if len(found) > args.limit else ""
+        print(f"\n{len(found):,} questions{more}; index of {len(index):,} questions "
+              f"opened in {open_ms:.1f} ms, query {query_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Quiz server
+-----------
+One asyncio process that hosts the question bank once and runs a
+QuizEngine per connected student, so a whole lab of Raspberry Pis can
+share a single copy of the bank. Clients speak the newline-delimited JSON
+protocol in apfrench.protocol (see apfrench.client.RemoteEngine for the
+GUI side).
+
+Command line:
+    python3 -m apfrench.server [--host 127.0.0.1] [--port 8765] [--session-size 5] [--seed N] [--forms K]
+                               [--no-journal | --store]
+"""
+
+import asyncio
+import math
+
+from apfrench import protocol
+from apfrench.bank import open_default_bank
+from apfrench.engine import LayoutCache, QuizEngine, SessionError
+from apfrench.freeresponse import AnswerKeys
+
+MAX_STUDENT_ID = 0xFFFFFFFF     # student ids are 32-bit in the journal
+
+
+def _is_int(value):
+    """True for a JSON integer (not a boolean, which Python counts as an int)."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_weights(value):
+    """True for a {category: weight} object with finite numbers as weights."""
+    return isinstance(value, dict) and all(
+        isinstance(w, (int, float)) and not isinstance(w, bool) and math.isfinite(w) for w in value.values())
+
+
+class QuizServer:
+    """Serves quiz sessions over the apfrench.protocol wire format."""
+    def __init__(self, bank, session_size=5, journal=None, seed=None, forms=None):
+        """
+        :param bank: shared sequence of Question objects (read-only)
+        :param session_size: default questions per session (None = whole bank)
+        :param journal: optional Journal (or apfrench.store.Store) shared by all sessions
+        :param seed: default session seed; with one, every student gets the
+            same session (same questions, same choice order) unless they ask
+            for another seed
+        :param forms: deal each student one of this many precomputed exam
+            forms (apfrench.forms) instead of a freshly drawn session
+        """
+        self.bank = bank
+        self.session_size = session_size
+        self.journal = journal
+        self.seed = seed
+        self.layouts = LayoutCache()
+        self.answer_keys = AnswerKeys(bank)
+        self.forms = forms
+        self._difficulty = None
+        if forms:
+            from apfrench.forms import bank_difficulty
+            self._difficulty = bank_difficulty(bank)
+        self.clients = 0
+        self.requests = 0
+
+    def handle_request(self, engine, request):
+        """Apply one request to a client's engine; returns (engine, reply)."""
+        if not isinstance(request, dict):
+            return engine, {"error": "a request must be a JSON object"}
+        op = request.get("op")
+        if op == "grade":
+            return engine, {"results": self.grade(request.get("answers"))}
+        if op == "start":
+            student = request.get("student", 0)
+            name = request.get("name")
+            if name is not None:
+                # Names are resolved here: a client's own ids mean nothing to this server's store
+                if not isinstance(name, str) or not name.strip():
+                    return engine, {"error": f"invalid name {name!r}"}
+                if getattr(self.journal, "student", None) is None:
+                    return engine, {"error": "this server keeps no student names (start it with --store)"}
+                student = self.journal.student(name.strip())
+            if not _is_int(student) or not 0 <= student <= MAX_STUDENT_ID:
+                return engine, {"error": f"invalid student {student!r}"}
+            session_size = request.get("session_size", self.session_size)
+            if session_size is not None and (not _is_int(session_size) or session_size < 1):
+                return engine, {"error": f"invalid session_size {session_size!r}"}
+            seed = request.get("seed", self.seed)
+            if seed is not None and not _is_int(seed):
+                return engine, {"error": f"invalid seed {seed!r}"}
+            categories = request.get("categories")
+            if categories is not None and not _is_weights(categories):
+                return engine, {"error": f"invalid categories {categories!r}"}
+            forms = None
+            if self.forms and session_size:
+                from apfrench.forms import get_forms
+                forms = get_forms(self.bank, session_size, self.forms, difficulty=self._difficulty)
+            engine = QuizEngine(self.bank,
+                                session_size=session_size,
+                                category_weights=categories,
+                                journal=self.journal,
+                                student_id=student,
+                                seed=seed,
+                                layouts=self.layouts,
+                                forms=forms,
+                                answer_keys=self.answer_keys)
+        elif engine is None:
+            return engine, {"error": "send a 'start' request first"}
+        elif op == "answer":
+            text = request.get("text")
+            if text is not None:
+                if not isinstance(text, str):
+                    return engine, {"error": f"invalid text {text!r}"}
+                reply = protocol.verdict_message(engine.answer_text(text))
+            else:
+                choice = request.get("choice")
+                if not _is_int(choice) or not 0 <= choice < len(engine.current_choices):
+                    return engine, {"error": f"invalid choice {choice!r}"}
+                reply = {"correct": engine.answer(choice)}
+            correct_index = engine.current_answer_index
+            reply.update({
+                "correct_index": correct_index,
+                "correct_text": engine.current_choices[correct_index],
+                "explain": engine.current.explain,
+                "score": engine.score_correct,
+                "attempted": engine.total_attempted,
+            })
+            return engine, reply
+        elif op == "time_up":
+            engine.time_up()
+            return engine, protocol.results_message(engine)
+        elif op == "next":
+            engine.advance()
+        elif op == "results":
+            return engine, protocol.results_message(engine)
+        else:
+            return engine, {"error": f"unknown op {op!r}"}
+
+        # start / next: send the question and start its response timer
+        reply = protocol.question_message(engine)
+        if not engine.finished:
+            engine.mark_shown()
+        return engine, reply
+
+    def grade(self, answers):
+        """Verdicts (as dicts) for a batch of [question id, typed text] pairs."""
+        if not isinstance(answers, list):
+            raise ValueError("'answers' must be a list of [question id, text]")
+        count = len(self.bank)
+        results = []
+        for item in answers:
+            if not (isinstance(item, list) and len(item) == 2 and isinstance(item[0], int)
+                    and isinstance(item[1], str) and 0 <= item[0] < count):
+                results.append({"error": f"invalid answer {item!r}"})
+                continue
+            results.append(protocol.verdict_message(self.answer_keys.grade(item[0], item[1])))
+        return results
+
+    async def handle_client(self, reader, writer):
+        """Serve one connection until the client disconnects."""
+        self.clients += 1
+        engine = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.requests += 1
+                try:
+                    engine, reply = self.handle_request(engine, protocol.decode(line))
+                except (ValueError, TypeError, KeyError, SessionError) as exc:
+                    reply = {"error": str(exc)}
+                writer.write(protocol.encode(reply))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    async def start(self, host=protocol.DEFAULT_HOST, port=protocol.DEFAULT_PORT):
+        """Start listening; returns the asyncio Server."""
+        return await asyncio.start_server(self.handle_client, host, port)
+
+
+def main(argv=None):
+    import argparse
+
+    from apfrench.journal import Journal
+
+    parser = argparse.ArgumentParser(prog="python3 -m apfrench.server", description="Serve the AP French quiz to several students.")
+    parser.add_argument("--host", default=protocol.DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=protocol.DEFAULT_PORT)
+    parser.add_argument("--session-size", type=int, default=5, help="questions per session (0 = whole bank)")
+    parser.add_argument("--seed", type=int, help="give every student the same session (e.g. a class test)")
+    parser.add_argument("--forms", type=int, metavar="K",
+                        help="deal each student one of K prepared exam forms, each covering every category")
+    parser.add_argument("--no-journal", action="store_true", help="do not log answers")
+    parser.add_argument("--store", action="store_true",
+                        help="log sessions and answers to the SQLite progress store instead of the journal")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        bank = open_default_bank()
+        journal = None
+        if args.store:
+            from apfrench.store import Store
+            journal = Store()
+        elif not args.no_journal:
+            journal = Journal()
+        server = QuizServer(bank, session_size=args.session_size or None, journal=journal, seed=args.seed,
+                            forms=args.forms)
+        listener = await server.start(args.host, args.port)
+        print(f"Serving {len(bank)} questions on {args.host}:{args.port}")
+        try:
+            async with listener:
+                await listener.serve_forever()
+        finally:
+            if journal is not None:
+                journal.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Spaced repetition
+-----------------
+An SM-2 style scheduler: every question the student has seen gets an
+ease factor, an interval and a due time. Due times are kept in a heap, so
+building a review session pops the k most overdue questions in
+O(k log n) instead of rescanning every question's history; questions
+never seen before fill the rest of the session.
+
+State is stored per bank position in flat arrays and saved as one binary
+file (header + raw array bytes), so loading it at startup is a handful of
+array.frombytes calls plus one heapify over the questions already seen.
+
+File layout (little-endian):
+
+    header   "<4sHHI"   magic b"APFS", format version, reserved, count
+    arrays   due "d" * count, interval "f" * count (days),
+             ease "f" * count, repetitions "H" * count
+
+Question ids are bank positions, so each bank has its own state file
+(schedule_path): rebuild it if the order of apfrench/questions.py
+changes. A state saved for a larger bank is cut down to the bank's size
+when it is loaded.
+"""
+
+import heapq
+import os
+import struct
+import sys
+import time
+from array import array
+
+MAGIC = b"APFS"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHI")
+
+DEFAULT_SCHEDULE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "schedule.srs")
+
+DAY = 86400.0
+START_EASE = 2.5
+MIN_EASE = 1.3
+RELEARN_DELAY = 600.0   # a missed question comes back after 10 minutes
+FAST_ANSWER = 10.0      # seconds; a correct answer faster than this is "easy"
+NEVER_SEEN = 0.0        # due time marking a question that was never reviewed
+
+
+def schedule_path(bank_path):
+    """Where the state for a bank is kept: DEFAULT_SCHEDULE_PATH for the default bank, else next to it (.srs)."""
+    from apfrench.bank import DEFAULT_BANK_PATH
+    if os.path.abspath(bank_path) == os.path.abspath(DEFAULT_BANK_PATH):
+        return DEFAULT_SCHEDULE_PATH
+    return os.path.splitext(bank_path)[0] + ".srs"
+
+
+def grade(correct, response_s=None):
+    """Map a quiz answer onto SM-2's 0..5 quality scale."""
+    if not correct:
+        return 0 if response_s is None else 1
+    if response_s is not None and response_s < FAST_ANSWER:
+        return 5
+    return 4
+
+
+class Scheduler:
+    """SM-2 review scheduler with a heap of due times."""
+    def __init__(self, count):
+        """
+        :param count: number of questions in the bank
+        """
+        self.due = array("d", bytes(8 * count))
+        self.interval = array("f", bytes(4 * count))
+        self.ease = array("f", [START_EASE]) * count
+        self.reps = array("H", bytes(2 * count))
+        self._heap = []
+        self._next_new = 0   # first possibly unseen id; new questions come in bank order
+
+    def __len__(self):
+        return len(self.due)
+
+    def resize(self, count):
+        """
+        Fit the state to a bank of `count` questions: room for questions added
+        since it was saved, and none past the end of a bank that shrank.
+        """
+        extra = count - len(self.due)
+        if extra > 0:
+            self.due.extend(array("d", bytes(8 * extra)))
+            self.interval.extend(array("f", bytes(4 * extra)))
+            self.ease.extend(array("f", [START_EASE]) * extra)
+            self.reps.extend(array("H", bytes(2 * extra)))
+        elif extra < 0:
+            for arr in (self.due, self.interval, self.ease, self.reps):
+                del arr[count:]
+            self._next_new = min(self._next_new, count)
+            self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        due = self.due
+        self._heap = [(t, qid) for qid, t in enumerate(due) if t != NEVER_SEEN]
+        heapq.heapify(self._heap)
+
+    # ---------------------------
+    # Session building
+    # ---------------------------
+    def _pop_valid(self):
+        """Pop the earliest heap entry that is still current (skips stale ones)."""
+        heap = self._heap
+        due = self.due
+        while heap:
+            t, qid = heapq.heappop(heap)
+            if due[qid] == t:
+                return t, qid
+        return None
+
+    def pick_session(self, size, now=None):
+        """
+        Choose up to `size` question ids: overdue ones first (most overdue
+        first), then new ones, then the ones coming due soonest.
+        :return: array of bank positions
+        """
+        if now is None:
+            now = time.time()
+        picked = array("I")
+        popped = []      # valid entries taken off the heap
+        pending = None   # popped but not yet due
+
+        while len(picked) < size:
+            entry = self._pop_valid()
+            if entry is None:
+                break
+            if entry[0] > now:
+                pending = entry
+                break
+            popped.append(entry)
+            picked.append(entry[1])
+
+        due = self.due
+        count = len(due)
+        while self._next_new < count and due[self._next_new] != NEVER_SEEN:
+            self._next_new += 1
+        qid = self._next_new
+        while len(picked) < size and qid < count:
+            if due[qid] == NEVER_SEEN:
+                picked.append(qid)
+            qid += 1
+
+        # Not enough due or new questions: review the ones due soonest
+        while len(picked) < size and pending is not None:
+            popped.append(pending)
+            picked.append(pending[1])
+            pending = self._pop_valid()
+        if pending is not None:
+            popped.append(pending)
+
+        # Questions stay in the heap until they are actually reviewed
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+        return picked
+
+    # ---------------------------
+    # Reviews
+    # ---------------------------
+    def review(self, qid, correct, response_s=None, now=None):
+        """Record one answer and schedule the question's next review."""
+        if now is None:
+            now = time.time()
+        quality = grade(correct, response_s)
+        ease = self.ease[qid]
+        if quality >= 3:
+            reps = self.reps[qid]
+            if reps == 0:
+                interval = 1.0
+            elif reps == 1:
+                interval = 6.0
+            else:
+                interval = self.interval[qid] * ease
+            self.reps[qid] = min(reps + 1, 0xFFFF)
+            self.interval[qid] = interval
+            due = now + interval * DAY
+        else:
+            self.reps[qid] = 0
+            self.interval[qid] = 0.0
+            due = now + RELEARN_DELAY
+        self.ease[qid] = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        self.due[qid] = due
+        heapq.heappush(self._heap, (due, qid))
+
+        # Rescheduling leaves stale entries behind; compact once they dominate
+        if len(self._heap) > 2 * len(self.due) + 64:
+            self._rebuild_heap()
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+    def save(self, path=DEFAULT_SCHEDULE_PATH):
+        """Write the state atomically."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, len(self.due)))
+            for arr in (self.due, self.interval, self.ease, self.reps):
+                if sys.byteorder == "big":
+                    arr = array(arr.typecode, arr)
+                    arr.byteswap()
+                arr.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_SCHEDULE_PATH, count=None):
+        """
+        Load saved state, or start fresh if the file does not exist.
+        :param count: current bank size (the state grows or shrinks to fit it)
+        """
+        if not os.path.exists(path):
+            return cls(count or 0)
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, _, stored = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a spaced-repetition state file")
+
+        state = cls(0)
+        pos = _HEADER.size
+        for name in ("due", "interval", "ease", "reps"):
+            arr = getattr(state, name)
+            end = pos + arr.itemsize * stored
+            arr.frombytes(data[pos:end])
+            if sys.byteorder == "big":
+                arr.byteswap()
+            pos = end
+        if count is not None:
+            state.resize(count)
+        state._rebuild_heap()
+        return state
@@ -0,0 +1,101 @@
+"""
+Startup timing
+--------------
+Where the time goes between launching a quiz and its first frame.
+
+The GUIs call mark() at the end of each startup phase (imports, bank
+opened, window built, first frame drawn). Marks cost nothing unless the
+APFRENCH_STARTUP_REPORT environment variable is set; then they are
+written to stderr and the window closes as soon as it has been drawn.
+
+`python3 -m apfrench.startup` runs a quiz that way under
+`python -X importtime`, several times, and prints the median time to
+each phase (measured from process launch) plus the imports with the
+highest cumulative cost, in the same units as -X importtime.
+
+Command line:
+    python3 -m apfrench.startup [SCRIPT] [--runs N] [--top N]
+"""
+
+import os
+import sys
+import time
+
+ENV = "APFRENCH_STARTUP_REPORT"
+_TAG = "apfrench-startup"
+_enabled = ENV in os.environ
+
+
+def mark(phase):
+    """Record the end of a startup phase (no-op unless reporting)."""
+    if _enabled:
+        print(f"{_TAG}\t{phase}\t{time.time():.6f}", file=sys.stderr, flush=True)
+
+
+def first_frame(window):
+    """Mark the first drawn frame and, when reporting, close the window."""
+    if _enabled:
+        def done():
+            mark("first frame")
+            window.destroy()
+        # Queued behind Tk's own idle redraws, so the window is on screen by then
+        window.after_idle(done)
+
+
+# ---------------------------
+# Report
+# ---------------------------
+def _run_once(script, args):
+    import subprocess
+
+    env = dict(os.environ, **{ENV: "1"})
+    start = time.time()
+    proc = subprocess.run([sys.executable, "-X", "importtime", script] + args,
+                          env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    phases = {}
+    imports = {}
+    errors = []
+    for line in proc.stderr.splitlines():
+        if line.startswith(_TAG):
+            _, phase, stamp = line.split("\t")
+            phases[phase] = (float(stamp) - start) * 1000
+        elif line.startswith("import time:"):
+            fields = line[len("import time:"):].split("|")
+            if fields[0].strip().isdigit():
+                imports[fields[2].strip()] = int(fields[1]) / 1000
+        else:
+            errors.append(line)
+    phases["exit"] = (time.time() - start) * 1000
+    return phases, imports, errors if proc.returncode else []
+
+
+def main(argv=None):
+    import argparse
+    import statistics
+
+    default_script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ap-french-quiz-1.py")
+    parser = argparse.ArgumentParser(prog="python3 -m apfrench.startup", description="Time a quiz's cold startup.")
+    parser.add_argument("script", nargs="?", default=default_script)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12, help="number of imports to list")
+    parser.add_argument("script_args", nargs=argparse.REMAINDER, help="arguments passed on to the script")
+    args = parser.parse_args(argv)
+
+    runs = [_run_once(args.script, args.script_args) for _ in range(args.runs)]
+    print(f"{os.path.basename(args.script)}: median of {args.runs} runs, ms since launch")
+    for phase in runs[0][0]:
+        values = [phases[phase] for phases, _, _ in runs if phase in phases]
+        print(f"  {phase:<14} {statistics.median(values):>8.1f}")
+
+    imports = runs[-1][1]
+    print(f"\nslowest imports (cumulative ms, last run, {len(imports)} modules):")
+    for name, ms in sorted(imports.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {ms:>8.1f}  {name}")
+
+    errors = runs[-1][2]
+    if errors:
+        print("\nthe script exited with an error:\n  " + "\n  ".join(errors[-5:]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Progress store
+--------------
+A SQLite database (standard library sqlite3) of students, sessions and
+answer events, for progress dashboards: a student's sessions and scores,
+the questions they keep missing, how a question has been doing lately.
+
+Store takes the place of the results journal (apfrench.journal): it has
+the same append(), so a QuizEngine logs into either. An engine also
+opens a session row in it at every restart and passes the session id
+back with each answer (append(..., session_id=...)), so several students
+answering at once, even under the same student id, never mix up their
+sessions. Existing journals can be imported (import_journal).
+
+Answers are not written on the caller's thread. append() only queues a
+row (a lock and a list append); a writer thread owns the write
+connection and commits the queue in one transaction of executemany()
+calls, with the same SQL text every time so sqlite3 reuses its prepared
+statements, once `batch_size` rows are waiting or the oldest has waited
+`sync_interval` seconds. Students and sessions, a few per quiz rather
+than one per answer, are inserted at once so that their ids come from
+SQLite itself (INTEGER PRIMARY KEY): several processes may write the same
+store.
+
+The database runs in WAL mode with synchronous=NORMAL: readers (the
+dashboard queries, another process) never block the writer, and a
+commit costs no fsync except at checkpoints. Answers are indexed by
+(student, question), which serves every per-student query, and by
+(question, timestamp), which serves per-question queries over a period.
+
+Schema:
+
+    students  id, name (unique), created
+    sessions  id, student_id, seed, length, started
+    answers   session_id, student_id, question_id, chosen, correct,
+              response_ms, timestamp    (chosen and correct as in the journal)
+
+Command line:
+    python3 -m apfrench.store import [JOURNAL] [--db PATH]
+    python3 -m apfrench.store student ID [--db PATH]
+    python3 -m apfrench.store question ID [--days N] [--db PATH]
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "progress.sqlite")
+SCHEMA_VERSION = 1
+WRITER_CACHE_KB = 64 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    student_id INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    started REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS answers (
+    session_id INTEGER,
+    student_id INTEGER NOT NULL,
+    question_id INTEGER NOT NULL,
+    chosen INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    response_ms INTEGER NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_student ON sessions (student_id, started);
+CREATE INDEX IF NOT EXISTS answers_by_student ON answers (student_id, question_id);
+CREATE INDEX IF NOT EXISTS answers_by_question ON answers (question_id, timestamp);
+"""
+
+_INSERT_STUDENT = "INSERT OR IGNORE INTO students (name, created) VALUES (?, ?)"
+_INSERT_SESSION = "INSERT INTO sessions (student_id, seed, length, started) VALUES (?, ?, ?, ?)"
+_INSERT_ANSWER = ("INSERT INTO answers (session_id, student_id, question_id, chosen, correct, response_ms, timestamp) "
+                  "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+
+class StoreError(RuntimeError):
+    """The writer thread could not commit to the database."""
+
+
+def connect(path=DEFAULT_STORE_PATH):
+    """A connection to a progress database, in WAL mode (created with its schema if missing)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, cached_statements=64)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version == 0:
+        with conn:
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+    elif version != SCHEMA_VERSION:
+        conn.close()
+        raise StoreError(f"{path}: unsupported progress store version {version}")
+    return conn
+
+
+class Store:
+    """Progress database with batched writes on a background thread."""
+    def __init__(self, path=DEFAULT_STORE_PATH, batch_size=512, sync_interval=1.0):
+        """
+        :param path: database file (created if missing)
+        :param batch_size: commit once this many rows are waiting
+        :param sync_interval: ... or once the oldest has waited this many seconds
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.sync_interval = sync_interval
+        # Connection for the thread that opened the store: queries, students and sessions
+        self._db = connect(path)
+
+        self._cond = threading.Condition()
+        self._answers = []          # rows waiting for the writer
+        self._pending = 0
+        self._oldest = 0.0          # time.monotonic() when the oldest waiting row was queued
+        self._queued = 0
+        self._written = 0
+        self._flush = False
+        self._closing = False
+        self.error = None
+        self._writer = threading.Thread(target=self._write_loop, name="store-writer", daemon=True)
+        self._writer.start()
+
+    # ---------------------------
+    # Students and sessions (thread that opened the store)
+    # ---------------------------
+    def student(self, name):
+        """The id of the student called `name`, added if new."""
+        with self._db:
+            self._db.execute(_INSERT_STUDENT, (name, time.time()))
+        return self._db.execute("SELECT id FROM students WHERE name = ?", (name,)).fetchone()[0]
+
+    def start_session(self, student_id, seed, length):
+        """Open a session for `student_id`; returns its id, for append()."""
+        with self._db:
+            return self._db.execute(_INSERT_SESSION, (student_id, seed, length, time.time())).lastrowid
+
+    # ---------------------------
+    # Answers (any thread; rows are queued)
+    # ---------------------------
+    def append(self, student_id, question_id, chosen, correct, response_ms, timestamp=None, session_id=None):
+        """
+        Queue one answer event (same arguments as Journal.append).
+        :param chosen: original choice index, TIMED_OUT or UNMATCHED
+        :param session_id: the session it belongs to (from start_session), if any
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        row = (session_id, student_id, question_id, chosen, int(correct), int(response_ms), timestamp)
+        with self._cond:
+            self._answers.append(row)
+            self._pending += 1
+            self._queued += 1
+            if self._pending == 1:
+                self._oldest = time.monotonic()
+                self._cond.notify()     # start the writer's sync_interval clock
+            elif self._pending >= self.batch_size:
+                self._cond.notify()
+
+    def append_many(self, rows):
+        """Queue answer rows (session id, student, question, chosen, correct, response ms, timestamp)."""
+        rows = list(rows)
+        with self._cond:
+            self._answers.extend(rows)
+            self._pending += len(rows)
+            self._queued += len(rows)
+            self._oldest = self._oldest or time.monotonic()
+            self._cond.notify()
+
+    def flush(self):
+        """Block until everything queued so far is committed."""
+        with self._cond:
+            target = self._queued
+            self._flush = True
+            self._cond.notify()
+            while self._written < target and self._writer.is_alive():
+                self._cond.wait()
+        if self.error is not None:
+            raise StoreError(f"{self.path}: {self.error}")
+
+    def sync(self):
+        """Same as flush (the Journal method)."""
+        self.flush()
+
+    def close(self):
+        """Commit what is queued, stop the writer and close the database."""
+        if self._closing:
+            return
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._writer.join()
+        self._db.close()
+        if self.error is not None:
+            raise StoreError(f"{self.path}: {self.error}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write_loop(self):
+        db = connect(self.path)
+        # Index pages stay in memory between batches (answers arrive in random student/question order)
+        db.execute(f"PRAGMA cache_size=-{WRITER_CACHE_KB}")
+        try:
+            while True:
+                with self._cond:
+                    while not (self._closing or self._flush or self._pending >= self.batch_size):
+                        if self._pending:
+                            remaining = self._oldest + self.sync_interval - time.monotonic()
+                            if remaining <= 0:
+                                break
+                            self._cond.wait(remaining)
+                        else:
+                            self._cond.wait()
+                    answers = self._answers
+                    self._answers = []
+                    batch = self._pending
+                    self._pending = 0
+                    self._oldest = 0.0
+                    self._flush = False
+                    closing = self._closing
+                if batch:
+                    try:
+                        with db:
+                            db.executemany(_INSERT_ANSWER, answers)
+                    except sqlite3.Error as e:
+                        self.error = e
+                with self._cond:
+                    self._written += batch
+                    self._cond.notify_all()
+                    if closing and not self._pending:
+                        return
+        finally:
+            db.close()
+
+    # ---------------------------
+    # Dashboard queries (thread that opened the store)
+    # ---------------------------
+    def student_sessions(self, student_id, limit=20):
+        """The student's latest sessions: [(session id, started, length, answered, correct)], newest first."""
+        return self._db.execute(
+            "SELECT s.id, s.started, s.length, coalesce(a.answered, 0), coalesce(a.correct, 0) "
+            "FROM sessions s LEFT JOIN ("
+            "  SELECT session_id, count(*) AS answered, sum(correct) AS correct "
+            "  FROM answers WHERE student_id = ? GROUP BY session_id"
+            ") a ON a.session_id = s.id "
+            "WHERE s.student_id = ? ORDER BY s.started DESC LIMIT ?",
+            (student_id, student_id, limit)).fetchall()
+
+    def student_totals(self, student_id):
+        """(answers, correct, mean response ms) over all of a student's answers."""
+        return self._db.execute(
+            "SELECT count(*), coalesce(sum(correct), 0), coalesce(avg(response_ms), 0) "
+            "FROM answers WHERE student_id = ?", (student_id,)).fetchone()
+
+    def weak_questions(self, student_id, limit=10, min_attempts=2):
+        """Questions the student misses most: [(question id, attempts, correct)], worst first."""
+        return self._db.execute(
+            "SELECT question_id, count(*) AS attempts, sum(correct) AS right FROM answers "
+            "WHERE student_id = ? GROUP BY question_id HAVING attempts >= ? "
+            "ORDER BY 1.0 * right / attempts, attempts DESC LIMIT ?",
+            (student_id, min_attempts, limit)).fetchall()
+
+    def question_stats(self, question_id, since=None):
+        """(answers, correct, mean response ms) for a question, since a timestamp (default: ever)."""
+        return self._db.execute(
+            "SELECT count(*), coalesce(sum(correct), 0), coalesce(avg(response_ms), 0) "
+            "FROM answers WHERE question_id = ? AND timestamp >= ?",
+            (question_id, since or 0.0)).fetchone()
+
+    def counts(self):
+        """{table: rows} for the three tables."""
+        return {table: self._db.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+                for table in ("students", "sessions", "answers")}
+
+
+def import_journal(store, journal_path):
+    """Copy every answer of a results journal into the store (without sessions); returns how many."""
+    from apfrench.journal import iter_events
+
+    count = 0
+    batch = []
+    for student, question, chosen, correct, response_ms, timestamp in iter_events(journal_path):
+        batch.append((None, student, question, chosen, correct, response_ms, timestamp))
+        if len(batch) >= 65536:
+            store.append_many(batch)
+            count += len(batch)
+            batch = []
+    store.append_many(batch)
+    store.flush()
+    return count + len(batch)
+
+
+# ---------------------------
+# Command line
+# ---------------------------
+def main(argv=None):
+    import argparse
+
+    from apfrench.journal import DEFAULT_JOURNAL_PATH
+
+    parser = argparse.ArgumentParser(prog="python3 -m apfrench.store", description="Student progress database.")
+    parser.add_argument("--db", default=DEFAULT_STORE_PATH, help="progress database (default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="copy a results journal into the database")
+    imp.add_argument("journal", nargs="?", default=DEFAULT_JOURNAL_PATH)
+    student = sub.add_parser("student", help="a student's sessions and weakest questions")
+    student.add_argument("id", type=int)
+    question = sub.add_parser("question", help="how a question has been answered")
+    question.add_argument("id", type=int)
+    question.add_argument("--days", type=float, help="only the last N days")
+    args = parser.parse_args(argv)
+
+    with Store(args.db) as store:
+        if args.command == "import":
+            t0 = time.perf_counter()
+            count = import_journal(store, args.journal)
+            print(f"Imported {count:,} answers from {args.journal} in {time.perf_counter() - t0:.1f}s")
+        elif args.command == "student":
+            answered, correct, mean_ms = store.student_totals(args.id)
+            percent = correct / answered * 100 if answered else 0.0
+            print(f"Student {args.id}: {answered:,} answers, {percent:.1f}% correct, "
+                  f"mean answer time {mean_ms / 1000:.1f}s")
+            for session_id, started, length, done, right in store.student_sessions(args.id):
+                when = time.strftime("%Y-%m-%d %H:%M", time.localtime(started))
+                print(f"  session {session_id:>6}  {when}  {right}/{done} (of {length})")
+            weak = store.weak_questions(args.id)
+            if weak:
+                print("Most missed questions: " + ", ".join(f"{q} ({r}/{n})" for q, n, r in weak))
+        else:
+            since = time.time() - args.days * 86400 if args.days else None
+            answered, correct, mean_ms = store.question_stats(args.id, since)
+            percent = correct / answered * 100 if answered else 0.0
+            print(f"Question {args.id}: {answered:,} answers, {percent:.1f}% correct, "
+                  f"mean answer time {mean_ms / 1000:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Question countdown
+------------------
+A deadline-based countdown for the per-question timer. The deadline is
+fixed once with time.monotonic() when the question is shown, and every
+tick derives the remaining time from it, so a late tick (busy event loop,
+slow Pi) never makes the countdown run long: it just shows the correct
+value a little later. Ticks are aimed at the next whole-second boundary
+of the remaining time rather than chained with after(1000).
+
+The countdown owns exactly one pending callback at a time - a tick, or
+the delayed "move on" after time is up - so cancel() always stops
+everything scheduled for the current question.
+
+It only needs an after(ms, callback) / after_cancel(handle) pair, which
+Tk widgets provide, so it can also be driven by a simulated loop (see
+benchmarks/bench_timer_drift.py).
+"""
+
+import math
+import time
+
+
+class Countdown:
+    """Per-question countdown with a single cancellable handle."""
+    def __init__(self, after, after_cancel, on_tick, on_expire, clock=time.monotonic):
+        """
+        :param after: function(ms, callback) -> handle (e.g. a Tk widget's after)
+        :param after_cancel: function(handle) (e.g. a Tk widget's after_cancel)
+        :param on_tick: called on every tick with the whole seconds left (rounded up)
+        :param on_expire: called once when the deadline passes
+        :param clock: monotonic time source in seconds
+        """
+        self._after = after
+        self._after_cancel = after_cancel
+        self._on_tick = on_tick
+        self._on_expire = on_expire
+        self._clock = clock
+        self._handle = None
+        self.deadline = None
+
+    @property
+    def running(self):
+        """True while counting down (not after expiry or cancel)."""
+        return self.deadline is not None
+
+    def remaining(self):
+        """Seconds left (float, never negative); 0 when not running."""
+        if self.deadline is None:
+            return 0.0
+        return max(0.0, self.deadline - self._clock())
+
+    def start(self, seconds):
+        """(Re)start the countdown for a new question."""
+        self.cancel()
+        self.deadline = self._clock() + seconds
+        self._tick()
+
+    def cancel(self):
+        """Stop the countdown and drop whatever callback is pending."""
+        if self._handle is not None:
+            self._after_cancel(self._handle)
+            self._handle = None
+        self.deadline = None
+
+    def call_later(self, ms, callback):
+        """
+        Schedule a one-off callback (e.g. advance after "time's up") on the
+        same handle, so cancel() or the next start() also cancels it.
+        """
+        self.cancel()
+
+        def fire():
+            self._handle = None
+            callback()
+        self._handle = self._after(ms, fire)
+
+    def _tick(self):
+        self._handle = None
+        left = self.deadline - self._clock()
+        if left <= 0:
+            self.deadline = None
+            self._on_tick(0)
+            self._on_expire()
+            return
+        self._on_tick(math.ceil(left))
+        # Wake up right after the displayed number should change
+        delay_ms = (left - math.floor(left) if left % 1 else 1.0) * 1000
+        self._handle = self._after(max(1, math.ceil(delay_ms)), self._tick)
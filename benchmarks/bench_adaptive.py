@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Adaptive session benchmark
+--------------------------
+Simulates students of known ability answering a bank of questions with
+known difficulty (2PL model). Compares adaptive sessions, which stop at
+the target precision, with random sessions scored by the same ability
+estimate: questions asked, and error of the final estimate. Also reports
+the time to pick the next question for growing bank sizes, which should
+stay flat (bisect on the presorted difficulties).
+
+Usage:
+    python benchmarks/bench_adaptive.py --students 2000 --bank-sizes 1000 100000 1000000
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.adaptive import AdaptiveSession, ItemPool, probability  # noqa: E402
+from bench_engine import percentile  # noqa: E402
+
+
+def make_pool(rng, n):
+    difficulty = [rng.gauss(0, 1.2) for _ in range(n)]
+    discrimination = [rng.uniform(0.6, 2.0) for _ in range(n)]
+    return ItemPool(difficulty, discrimination)
+
+
+def run_adaptive(pool, theta, rng, max_questions):
+    session = AdaptiveSession(pool)
+    while session.answers < max_questions and not session.precise_enough:
+        qid = session.next_question()
+        session.record(qid, rng.random() < probability(theta, pool.difficulty[qid], pool.a(qid)))
+    return session
+
+
+def run_random(pool, theta, rng, length):
+    session = AdaptiveSession(pool)
+    for qid in rng.sample(range(len(pool)), length):
+        session.record(qid, rng.random() < probability(theta, pool.difficulty[qid], pool.a(qid)))
+    return session
+
+
+def rmse(errors):
+    return math.sqrt(sum(e * e for e in errors) / len(errors))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=2_000)
+    parser.add_argument("--bank-size", type=int, default=5_000, help="bank for the precision comparison")
+    parser.add_argument("--bank-sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--max-questions", type=int, default=60)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    pool = make_pool(rng, args.bank_size)
+    abilities = [rng.gauss(0, 1) for _ in range(args.students)]
+    adaptive = [run_adaptive(pool, theta, rng, args.max_questions) for theta in abilities]
+    lengths = [s.answers for s in adaptive]
+    mean_length = round(sum(lengths) / len(lengths))
+    print(f"{'session':>22} {'questions':>10} {'RMSE':>6}")
+    print(f"{'adaptive':>22} {mean_length:>10} {rmse([s.theta - t for s, t in zip(adaptive, abilities)]):>6.3f}")
+    for factor in (1, 2, 3):
+        length = mean_length * factor
+        errors = [run_random(pool, theta, rng, length).theta - theta for theta in abilities]
+        print(f"{'random':>22} {length:>10} {rmse(errors):>6.3f}")
+
+    print(f"\n{'bank size':>10} {'build':>8} {'pick p50':>9} {'pick p99':>9}")
+    for n in args.bank_sizes:
+        t0 = time.perf_counter()
+        big = make_pool(rng, n)
+        build_s = time.perf_counter() - t0
+        pick_ns = []
+        clock = time.perf_counter_ns
+        for theta in abilities[:200]:
+            session = AdaptiveSession(big)
+            while not session.precise_enough and session.answers < args.max_questions:
+                t0 = clock()
+                qid = session.next_question()
+                pick_ns.append(clock() - t0)
+                session.record(qid, rng.random() < probability(theta, big.difficulty[qid], big.a(qid)))
+        pick_ns.sort()
+        print(f"{n:>10,} {build_s:>7.2f}s {percentile(pick_ns, 50) / 1000:>7.1f}us {percentile(pick_ns, 99) / 1000:>7.1f}us")
+
+
+if __name__ == "__main__":
+    main()
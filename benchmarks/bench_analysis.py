@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Item analysis benchmark
+-----------------------
+Simulates a journal of students (with an ability each) answering random
+questions (with a difficulty each, some repeated), plants a few
+mis-keyed questions and dead distractors, then times reading the journal
+and computing the statistics, and checks that the planted problems are
+the ones flagged. Needs NumPy.
+
+Usage:
+    python benchmarks/bench_analysis.py --students 10000 --questions 5000 --answers-per-student 500
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.analysis import analyze, load_events  # noqa: E402
+from apfrench.journal import Journal  # noqa: E402
+
+
+def simulate(np, path, students, questions, per_student, planted, seed=5):
+    """Write the journal; return the answer key and the planted question ids."""
+    rng = np.random.default_rng(seed)
+    ability = rng.normal(0, 1, students)
+    difficulty = rng.normal(0, 1, questions)
+    key = rng.integers(0, 4, questions)
+    miskeyed = rng.choice(questions, planted, replace=False)
+    dead = np.setdiff1d(rng.choice(questions, 2 * planted, replace=False), miskeyed)[:planted]
+
+    n = students * per_student
+    student = np.repeat(np.arange(students, dtype=np.uint32), per_student)
+    question = rng.integers(0, questions, n).astype(np.uint32)
+    right = rng.random(n) < 1 / (1 + np.exp(difficulty[question] - ability[student]))
+    wrong = (key[question] + rng.integers(1, 4, n)) % 4
+    # Choice key + 1 of a dead-distractor question is never picked
+    is_dead = np.isin(question, dead)
+    wrong[is_dead] = (key[question[is_dead]] + rng.integers(2, 4, int(is_dead.sum()))) % 4
+    chosen = np.where(right, key[question], wrong)
+    # Mis-keyed: the journal marks the (good) students' choice as wrong and a distractor as right
+    flipped = np.isin(question, miskeyed)
+    correct = np.where(flipped, chosen == (key[question] + 1) % 4, chosen == key[question])
+
+    Journal(path).close()   # header
+    records = np.zeros(n, dtype=[("student", "<u4"), ("question", "<u4"), ("chosen", "i1"), ("correct", "u1"),
+                                 ("response_ms", "<u4"), ("timestamp", "<f8")])
+    records["student"] = student
+    records["question"] = question
+    records["chosen"] = chosen
+    records["correct"] = correct
+    records["response_ms"] = rng.integers(2000, 20000, n)
+    records["timestamp"] = time.time()
+    rng.shuffle(records)   # students take turns
+    with open(path, "ab") as f:
+        records.tofile(f)
+    return key, set(miskeyed.tolist()), set(dead.tolist())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=10_000)
+    parser.add_argument("--questions", type=int, default=5_000)
+    parser.add_argument("--answers-per-student", type=int, default=500)
+    parser.add_argument("--planted", type=int, default=20)
+    args = parser.parse_args()
+
+    import numpy as np
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.journal")
+        key, miskeyed, dead = simulate(np, path, args.students, args.questions, args.answers_per_student,
+                                       args.planted)
+        size = os.path.getsize(path)
+        t0 = time.perf_counter()
+        events = load_events(path)
+        load_s = time.perf_counter() - t0
+        stats = analyze(events, args.questions)
+
+    negative = {qid for qid in range(len(stats)) if stats.discrimination[qid] < 0}
+    unused = {qid for qid in range(len(stats)) if any("never chosen" in f for f in stats.flags(qid, key[qid]))}
+    print(f"{len(events):,} answers ({size / 2**20:.0f} MiB), {stats.students:,} students x {len(stats):,} questions")
+    print(f"read    {load_s:6.2f}s")
+    print(f"analyze {stats.elapsed:6.2f}s  ({len(events) / stats.elapsed / 1e6:.1f}M answers/s)")
+    print(f"mis-keyed found      {len(miskeyed & negative)}/{len(miskeyed)} (+{len(negative - miskeyed)} others)")
+    print(f"dead distractors     {len(dead & unused)}/{len(dead)} (+{len(unused - dead)} others)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Listening clip benchmark
+------------------------
+Writes synthetic WAV clips (a tone, 16-bit stereo at 44.1 kHz) and
+reports how long playback takes to start (play() to the first chunk
+written to the output) when the clip is streamed from the file, replayed
+from the ClipCache, or preloaded in the background while the previous
+question is on screen, plus the cache's hit rate and size when a session
+of listening questions cycles through more audio than the byte budget.
+
+The output is a null device, so only decoding and caching are measured,
+not the sound card.
+
+Usage:
+    python benchmarks/bench_audio.py --clips 20 --seconds 30 --budget-mb 32
+"""
+
+import argparse
+import math
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.audio import ClipCache, Player  # noqa: E402
+
+RATE = 44100
+
+
+class NullOutput:
+    """Takes the chunks and drops them, at no cost."""
+    def __init__(self, info):
+        self.bytes = 0
+
+    def write(self, data):
+        self.bytes += len(data)
+
+    def close(self):
+        pass
+
+
+def write_clip(path, seconds, pitch):
+    period = [int(12000 * math.sin(2 * math.pi * pitch * i / RATE)) for i in range(RATE // 10)]
+    frame = b"".join(struct.pack("<hh", v, v) for v in period)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        for _ in range(int(seconds * 10)):
+            f.writeframes(frame)
+
+
+def start_latency(player, path):
+    player.play(path)
+    player.wait()
+    return player.start_latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clips", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=30.0, help="length of each clip")
+    parser.add_argument("--budget-mb", type=float, default=32.0, help="ClipCache byte budget")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.clips):
+            paths.append(os.path.join(tmp, f"clip{i:03}.wav"))
+            write_clip(paths[-1], args.seconds, 220 + 20 * i)
+        clip_mb = os.path.getsize(paths[0]) / 1e6
+        print(f"{args.clips} clips of {args.seconds:g} s ({clip_mb:.1f} MB decoded each), "
+              f"cache budget {args.budget_mb:g} MB")
+
+        clips = ClipCache(max_bytes=int(args.budget_mb * 1e6))
+        player = Player(clips, output=NullOutput)
+        results = {"streamed": [], "cached": [], "preloaded": []}
+        for i, path in enumerate(paths):
+            results["streamed"].append(start_latency(player, path))
+            results["cached"].append(start_latency(player, path))
+
+        # A session: while question i plays, clip i + 1 is decoded in the background
+        clips = ClipCache(max_bytes=int(args.budget_mb * 1e6))
+        player = Player(clips, output=NullOutput)
+        t0 = time.perf_counter()
+        preload = None
+        for i, path in enumerate(paths):
+            if preload is not None:
+                preload.join()
+            results["preloaded"].append(start_latency(player, path))
+            if i + 1 < len(paths):
+                preload = threading.Thread(target=clips.load, args=(paths[i + 1],))
+                preload.start()
+        elapsed = time.perf_counter() - t0
+
+        print(f"\n{'start':>10} {'mean ms':>8} {'max ms':>8}")
+        for name, latencies in results.items():
+            print(f"{name:>10} {sum(latencies) / len(latencies) * 1000:>8.3f} {max(latencies) * 1000:>8.3f}")
+        print(f"\nsession: {elapsed:.2f}s to decode and play {args.clips} clips; cache holds {len(clips)} clips, "
+              f"{clips.size / 1e6:.1f} MB; {clips.hits} of {args.clips} clips played from memory")
+
+
+if __name__ == "__main__":
+    main()
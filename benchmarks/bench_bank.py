@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Question bank startup benchmark
+-------------------------------
+Compares session startup (open bank + first 5-question session) for the
+memory-mapped bank file against building an inline list of dicts, across
+growing bank sizes. Each measurement runs in a fresh interpreter so the
+peak resident memory (ru_maxrss) is meaningful.
+
+Usage:
+    python benchmarks/bench_bank.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from apfrench.bank import write_bank  # noqa: E402
+from bench_engine import make_questions  # noqa: E402
+
+# Child programs print "<seconds> <peak_rss_kb>". VmHWM is used where
+# available because ru_maxrss survives fork+exec and would report the
+# parent's (large) peak instead of the child's.
+_PEAK_RSS = """
+def peak_rss_kb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+"""
+
+_CHILD_BANK = _PEAK_RSS + """
+import sys, time
+t0 = time.perf_counter()
+from apfrench.bank import Bank
+from apfrench.engine import QuizEngine
+engine = QuizEngine(Bank(sys.argv[1]), session_size=5)
+print(time.perf_counter() - t0, peak_rss_kb())
+"""
+
+_CHILD_INLINE = _PEAK_RSS + """
+import sys, time
+t0 = time.perf_counter()
+from apfrench.engine import QuizEngine
+from bench_engine import make_questions
+engine = QuizEngine(make_questions(int(sys.argv[1])), session_size=5)
+print(time.perf_counter() - t0, peak_rss_kb())
+"""
+
+
+def run_child(code, arg, repeat):
+    """Best-of-`repeat` startup seconds and the matching peak RSS in KiB."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.path.dirname(os.path.abspath(__file__))]))
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code, str(arg)], env=env,
+                             capture_output=True, text=True, check=True).stdout.split()
+        result = (float(out[0]), int(out[1]))
+        if best is None or result[0] < best[0]:
+            best = result
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'questions':>10} | {'inline ms':>10} {'inline MiB':>11} | {'bank ms':>8} {'bank MiB':>9} {'file MiB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            path = os.path.join(tmp, f"bank-{n}.apfq")
+            t0 = time.perf_counter()
+            write_bank(path, make_questions(n))
+            build_s = time.perf_counter() - t0
+
+            inline_s, inline_kb = run_child(_CHILD_INLINE, n, args.repeat)
+            bank_s, bank_kb = run_child(_CHILD_BANK, path, args.repeat)
+            print(f"{n:>10,} | {inline_s * 1e3:>10.2f} {inline_kb / 1024:>11.1f} | "
+                  f"{bank_s * 1e3:>8.2f} {bank_kb / 1024:>9.1f} {os.path.getsize(path) / 2**20:>9.2f}"
+                  f"   (build {build_s:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
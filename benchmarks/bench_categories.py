@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Filtered session construction benchmark
+---------------------------------------
+Time to build a category-weighted session from a bank file using its
+prebuilt category index, against scanning and filtering the whole bank
+on every restart.
+
+Usage:
+    python benchmarks/bench_categories.py --bank-size 200000 --session-size 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.bank import Bank, write_bank  # noqa: E402
+from apfrench.engine import QuizEngine  # noqa: E402
+from bench_engine import make_question_dicts, percentile  # noqa: E402
+
+WEIGHTS = {"grammar": 2, "vocabulary": 1, "reading": 1}
+
+
+def scan_and_filter(bank, weights, size):
+    """Baseline: walk every question, keep matching ones, then sample."""
+    wanted = {c for c, w in weights.items() if w > 0}
+    pool = [q for q in bank if q.category in wanted]
+    return random.sample(pool, size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bank-size", type=int, default=200_000)
+    parser.add_argument("--session-size", type=int, default=20)
+    parser.add_argument("--restarts", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bank.apfq")
+        write_bank(path, make_question_dicts(args.bank_size))
+        with Bank(path) as bank:
+            engine = QuizEngine(bank, session_size=args.session_size, category_weights=WEIGHTS)
+            timings = []
+            for _ in range(args.restarts):
+                t0 = time.perf_counter_ns()
+                engine.reset()
+                engine.current_choices  # first question ready to render
+                timings.append(time.perf_counter_ns() - t0)
+            timings.sort()
+
+            t0 = time.perf_counter()
+            scan_and_filter(bank, WEIGHTS, args.session_size)
+            scan = time.perf_counter() - t0
+
+            print(f"bank={args.bank_size:,} session={args.session_size} weights={WEIGHTS}")
+            print(f"indexed restart: p50 {percentile(timings, 50) / 1e3:.1f} us, "
+                  f"p99 {percentile(timings, 99) / 1e3:.1f} us")
+            print(f"scan + filter:   {scan * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
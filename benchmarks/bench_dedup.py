@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection benchmark
+----------------------------------
+Builds banks of random French-looking questions with a known set of
+planted near-duplicates (one word changed, choices reordered, case and
+spacing changed), runs apfrench.dedup over them and reports time per
+stage, recall of the planted pairs and how many other questions were
+flagged. Time should grow about linearly with the bank size.
+
+Usage:
+    python benchmarks/bench_dedup.py --sizes 10000 50000 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.dedup import find_near_duplicates  # noqa: E402
+from apfrench.question import Question  # noqa: E402
+
+SYLLABLES = ["la", "le", "re", "mi", "son", "tre", "vou", "char", "pen", "dé", "quê", "ron", "ma", "tion",
+             "bel", "fi", "nou", "ga", "pas", "sé", "cou", "lin", "por", "ter", "ai", "vé", "mon", "dra"]
+
+
+def make_words(rng, n):
+    return ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))) for _ in range(n)]
+
+
+def make_bank(n, dup_rate, rng):
+    """n questions; about dup_rate of them are near-copies of an earlier one."""
+    vocabulary = make_words(rng, 3000)
+    questions = []
+    planted = []
+    for i in range(n):
+        if questions and rng.random() < dup_rate:
+            src = questions[rng.randrange(len(questions))]
+            words = src.question.split()
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+            text = "  ".join(words).upper() if rng.random() < 0.3 else " ".join(words)
+            choices = list(src.choices)
+            rng.shuffle(choices)
+            questions.append(Question(i, text, choices, choices.index(src.choices[src.answer])))
+            planted.append((src.id, i))
+        else:
+            text = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 14))) + " ?"
+            choices = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3))) for _ in range(4)]
+            questions.append(Question(i, text, choices, rng.randrange(4)))
+    return questions, planted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    parser.add_argument("--dup-rate", type=float, default=0.02)
+    parser.add_argument("--threshold", type=float, default=0.7)
+    args = parser.parse_args()
+
+    print(f"{'questions':>10} {'planted':>8} {'recall':>7} {'extra':>6} {'candidates':>11} "
+          f"{'signatures':>11} {'LSH':>7} {'us/question':>12}")
+    for n in args.sizes:
+        questions, planted = make_bank(n, args.dup_rate, random.Random(n))
+        report = find_near_duplicates(questions, args.threshold)
+        cluster_of = {qid: k for k, cluster in enumerate(report.clusters) for qid in cluster}
+        found = sum(1 for a, b in planted if a in cluster_of and cluster_of.get(a) == cluster_of.get(b))
+        involved = {qid for pair in planted for qid in pair}
+        extra = sum(1 for qid in cluster_of if qid not in involved)
+        total_s = report.signature_s + report.lsh_s
+        print(f"{n:>10,} {len(planted):>8,} {found / max(1, len(planted)):>7.1%} {extra:>6,} "
+              f"{report.candidates:>11,} {report.signature_s:>10.2f}s {report.lsh_s:>6.2f}s "
+              f"{total_s / n * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+QuizEngine throughput benchmark
+-------------------------------
+Drives the headless QuizEngine with simulated answer events (no display
+needed) and reports events/sec, sessions/sec and per-event latency
+percentiles.
+
+Usage:
+    python benchmarks/bench_engine.py --events 2000000 --session-size 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.categories import CATEGORIES  # noqa: E402
+from apfrench.engine import QuizEngine  # noqa: E402
+from apfrench.question import Question  # noqa: E402
+
+
+def make_question_dicts(n):
+    """Build n synthetic four-choice questions shaped like QUESTIONS."""
+    return [
+        {
+            "question": f"Question synthétique {i} ?",
+            "choices": [f"choix {i}-{c}" for c in range(4)],
+            "answer": i % 4,
+            "explain": f"Explication {i}.",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+        }
+        for i in range(n)
+    ]
+
+
+def make_questions(n):
+    """Build n synthetic Question records."""
+    return [Question.from_dict(d, i) for i, d in enumerate(make_question_dicts(n))]
+
+
+def run_throughput(engine, events, picks):
+    """Answer + advance `events` times, restarting sessions as they end."""
+    sessions = 0
+    answer = engine.answer
+    advance = engine.advance
+    reset = engine.reset
+    start = time.perf_counter()
+    for i in range(events):
+        answer(picks[i & 1023])
+        if not advance():
+            reset()
+            sessions += 1
+    elapsed = time.perf_counter() - start
+    return elapsed, sessions
+
+
+def run_latency(engine, events, picks):
+    """Time each answer event individually (includes any session restart)."""
+    latencies = array("q", bytes(8 * events))
+    clock = time.perf_counter_ns
+    for i in range(events):
+        t0 = clock()
+        engine.answer(picks[i & 1023])
+        if not engine.advance():
+            engine.reset()
+        latencies[i] = clock() - t0
+    return latencies
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1_000_000, help="answer events to simulate")
+    parser.add_argument("--latency-events", type=int, default=200_000,
+                        help="events to time individually for percentiles")
+    parser.add_argument("--bank-size", type=int, default=23, help="questions in the bank")
+    parser.add_argument("--session-size", type=int, default=5,
+                        help="questions per session (0 = whole bank, like v1)")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    engine = QuizEngine(make_questions(args.bank_size), session_size=args.session_size or None)
+    picks = [random.randrange(4) for _ in range(1024)]
+
+    elapsed, sessions = run_throughput(engine, args.events, picks)
+    print(f"bank={args.bank_size} session={args.session_size or args.bank_size}")
+    print(f"events:     {args.events:,} in {elapsed:.3f}s")
+    print(f"throughput: {args.events / elapsed:,.0f} events/s, {sessions / elapsed:,.0f} sessions/s")
+
+    latencies = sorted(run_latency(engine, args.latency_events, picks))
+    print("latency per event (ns):")
+    for pct in (50, 90, 99, 99.9):
+        print(f"  p{pct:<5} {percentile(latencies, pct):>10,}")
+    print(f"  max    {latencies[-1]:>10,}")
+
+
+if __name__ == "__main__":
+    main()
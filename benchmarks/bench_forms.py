@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Exam forms benchmark
+--------------------
+Prepares K exam forms over a synthetic bank (with synthetic item
+difficulties), checks that every form covers every category and reports
+how close the forms' mean difficulties are, then compares the cost of a
+restart (new session + showing every question) on a form with a freshly
+drawn session.
+
+Usage:
+    python benchmarks/bench_forms.py --bank-size 100000 --forms 4 --session-size 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.engine import QuizEngine  # noqa: E402
+from apfrench.forms import form_name, get_forms  # noqa: E402
+from bench_engine import make_questions  # noqa: E402
+from bench_seeds import walk  # noqa: E402
+
+
+def restarts_us(engine, count):
+    t0 = time.perf_counter()
+    for _ in range(count):
+        engine.reset()
+        walk(engine)
+    return (time.perf_counter() - t0) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bank-size", type=int, default=100_000)
+    parser.add_argument("--forms", type=int, default=4)
+    parser.add_argument("--session-size", type=int, default=20)
+    parser.add_argument("--restarts", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = random.Random(9)
+    bank = make_questions(args.bank_size)
+    difficulty = [rng.betavariate(4, 2) for _ in range(args.bank_size)]
+
+    t0 = time.perf_counter()
+    forms = get_forms(bank, args.session_size, args.forms, difficulty=difficulty)
+    build_ms = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    cached = get_forms(bank, args.session_size, args.forms, difficulty=difficulty)
+    lookup_us = (time.perf_counter() - t0) * 1e6
+    assert cached is forms
+
+    categories = {q.category for q in bank}
+    print(f"{args.forms} forms x {args.session_size} questions from {args.bank_size:,}: "
+          f"built in {build_ms:.1f} ms, cache lookup {lookup_us:.1f} us")
+    for i in range(len(forms)):
+        ids = forms.layout(i)[0]
+        covered = {bank[qid].category for qid in ids} == categories
+        print(f"  form {form_name(i)}: mean p {forms.mean_difficulty(i):.3f}, "
+              f"all categories {'yes' if covered else 'NO'}")
+    shared = len(set().union(*(set(forms.layout(i)[0]) for i in range(len(forms)))))
+    print(f"  distinct questions: {shared} of {args.forms * args.session_size}")
+
+    drawn = QuizEngine(bank, session_size=args.session_size)
+    on_form = QuizEngine(bank, session_size=args.session_size, forms=forms)
+    print(f"\nrestart + show {args.session_size} questions:")
+    print(f"  fresh draw  {restarts_us(drawn, args.restarts):7.1f} us")
+    print(f"  exam form   {restarts_us(on_form, args.restarts):7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Typed answer grading benchmark
+------------------------------
+Builds a bank of questions with French-looking choices of one to four
+words, then grades typed answers of every kind (exact, capitals and
+accents dropped, one or two typos, a distractor, nonsense) and reports
+the cost per answer, cold (first answer to a question: its key is
+prepared) and warm, with the 99th percentile, and the time a quiz server
+takes to grade a class's answers in one "grade" request. The verdicts
+of exact answers and distractors are checked.
+
+Usage:
+    python benchmarks/bench_freeresponse.py --bank-size 100000 --answers 200000 --class-size 30
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.freeresponse import AnswerKeys  # noqa: E402
+from apfrench.question import Question  # noqa: E402
+from apfrench.search import fold  # noqa: E402
+from apfrench.server import QuizServer  # noqa: E402
+from bench_dedup import make_words  # noqa: E402
+from bench_engine import CATEGORIES  # noqa: E402
+
+KINDS = ("exact", "folded", "typo", "two typos", "distractor", "nonsense")
+
+
+def make_bank(n, rng):
+    vocabulary = make_words(rng, 5000)
+    bank = []
+    for i in range(n):
+        choices = []
+        while len(choices) < 4:   # four choices that differ even without accents
+            choice = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 4)))
+            if all(fold(choice) != fold(c) for c in choices):
+                choices.append(choice)
+        bank.append(Question(i, f"Question {i} ?", choices, rng.randrange(4), "", CATEGORIES[i % len(CATEGORIES)]))
+    return bank
+
+
+def typo(text, rng):
+    i = rng.randrange(len(text))
+    return text[:i] + rng.choice("aeiourstn") + text[i + 1:]
+
+
+def make_answer(q, kind, rng):
+    right = q.choices[q.answer]
+    if kind == "exact":
+        return right
+    if kind == "folded":
+        return fold(right).upper()
+    if kind == "typo":
+        return typo(right, rng)
+    if kind == "two typos":
+        return typo(typo(right, rng), rng)
+    if kind == "distractor":
+        return q.choices[(q.answer + rng.randrange(1, 4)) % 4]
+    return "".join(rng.choice("xyzkw") for _ in range(rng.randint(3, 12)))
+
+
+def time_answers(keys, answers):
+    """Grade every answer on its own; returns (verdicts, seconds per answer)."""
+    grade = keys.grade
+    verdicts = []
+    times = []
+    clock = time.perf_counter
+    for qid, text in answers:
+        t0 = clock()
+        verdicts.append(grade(qid, text))
+        times.append(clock() - t0)
+    return verdicts, times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bank-size", type=int, default=100_000)
+    parser.add_argument("--answers", type=int, default=200_000)
+    parser.add_argument("--class-size", type=int, default=30)
+    parser.add_argument("--session-size", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(22)
+    bank = make_bank(args.bank_size, rng)
+    answers = []
+    kinds = []
+    for _ in range(args.answers):
+        q = bank[rng.randrange(len(bank))]
+        kind = rng.choice(KINDS)
+        answers.append((q.id, make_answer(q, kind, rng)))
+        kinds.append(kind)
+
+    keys = AnswerKeys(bank, max_keys=len(bank))
+    print(f"{args.answers:,} typed answers, bank of {args.bank_size:,} questions")
+    print(f"{'pass':>6} {'mean us':>8} {'p99 us':>8} {'max us':>8}")
+    for name in ("cold", "warm"):
+        verdicts, times = time_answers(keys, answers)
+        times.sort()
+        mean = sum(times) / len(times)
+        print(f"{name:>6} {mean * 1e6:>8.1f} {times[int(len(times) * 0.99)] * 1e6:>8.1f} {times[-1] * 1e6:>8.1f}")
+
+    accepted = {kind: 0 for kind in KINDS}
+    counts = {kind: 0 for kind in KINDS}
+    for kind, verdict in zip(kinds, verdicts):
+        counts[kind] += 1
+        accepted[kind] += verdict.correct
+    print("\naccepted: " + ", ".join(f"{kind} {accepted[kind] / counts[kind]:.0%}" for kind in KINDS))
+    ok = accepted["exact"] == counts["exact"] and accepted["folded"] == counts["folded"] and \
+        accepted["distractor"] == 0 and accepted["nonsense"] == 0
+    print(f"exact and folded answers accepted, distractors and nonsense refused: {'ok' if ok else 'WRONG'}")
+
+    # A class answering the same session, graded by the server in one request
+    server = QuizServer(bank)
+    session = rng.sample(range(len(bank)), args.session_size)
+    batch = [[qid, make_answer(bank[qid], rng.choice(KINDS), rng)]
+             for _ in range(args.class_size) for qid in session]
+    t0 = time.perf_counter()
+    _, reply = server.handle_request(None, {"op": "grade", "answers": batch})
+    elapsed = time.perf_counter() - t0
+    print(f"\nserver: {args.class_size} students x {args.session_size} questions graded in one request "
+          f"in {elapsed * 1000:.2f} ms ({elapsed / len(batch) * 1e6:.1f} us per answer, "
+          f"{sum(r['correct'] for r in reply['results'])} correct)")
+
+
+if __name__ == "__main__":
+    main()
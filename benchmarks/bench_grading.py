@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Answer sheet grading benchmark
+------------------------------
+Writes a directory of synthetic answer sheets for a synthetic bank and
+grades it with growing numbers of worker processes, reporting sheets/s
+and answers/s. The scores are checked against the known answers, so
+every worker count must give the same results.
+
+Usage:
+    python benchmarks/bench_grading.py --sheets 5000 --answers 120 --workers 1 2 4
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.bank import write_bank  # noqa: E402
+from apfrench.grading import grade_directory  # noqa: E402
+from bench_engine import make_question_dicts  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bank-size", type=int, default=100_000)
+    parser.add_argument("--sheets", type=int, default=5_000)
+    parser.add_argument("--answers", type=int, default=120, help="answers per sheet")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    rng = random.Random(4)
+    with tempfile.TemporaryDirectory() as tmp:
+        bank_path = os.path.join(tmp, "bank.apfq")
+        questions = make_question_dicts(args.bank_size)
+        write_bank(bank_path, questions)
+        sheets = os.path.join(tmp, "sheets")
+        os.mkdir(sheets)
+        expected = {}
+        for s in range(args.sheets):
+            correct = 0
+            lines = [f"student: student {s}"]
+            for qid in rng.sample(range(args.bank_size), args.answers):
+                chosen = rng.randrange(5)   # 4 = left blank
+                correct += chosen == questions[qid]["answer"]
+                lines.append(f"{qid} {'ABCD-'[chosen]}")
+            expected[f"student {s}"] = correct
+            with open(os.path.join(sheets, f"sheet{s:06}.txt"), "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+        print(f"{args.sheets:,} sheets x {args.answers} answers, bank of {args.bank_size:,} questions, "
+              f"{os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'seconds':>8} {'sheets/s':>10} {'answers/s':>11} {'scores':>7}")
+        for workers in args.workers:
+            report = grade_directory(sheets, bank_path, workers)
+            ok = all(expected[r.student] == r.correct for r in report.results) and \
+                len(report.results) == args.sheets
+            print(f"{report.workers:>8} {report.elapsed:>8.2f} {report.sheets_per_s:>10,.0f} "
+                  f"{report.answers_per_s:>11,.0f} {'ok' if ok else 'WRONG':>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Response-time histogram benchmark
+---------------------------------
+Measures what the --timing instrumentation adds to the answer path: the
+cost of ResponseTimes.record() per answer, the time of a full engine
+answer() with and without histograms, and the memory allocated while
+recording (should be none once every question has been shown). Also
+checks the histogram percentiles against exact ones.
+
+Usage:
+    python benchmarks/bench_histogram.py --bank-size 10000 --answers 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.engine import QuizEngine  # noqa: E402
+from apfrench.histogram import Histogram, ResponseTimes  # noqa: E402
+from bench_engine import make_questions, percentile  # noqa: E402
+
+
+def answer_loop(engine, answers):
+    """Answer `answers` questions, restarting sessions as needed; returns ns per answer."""
+    clock = time.perf_counter_ns
+    total = 0
+    for _ in range(answers):
+        if engine.finished:
+            engine.reset()
+        engine.current_choices
+        engine.mark_shown()
+        t0 = clock()
+        engine.answer(0)
+        total += clock() - t0
+        engine.advance()
+    return total / answers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bank-size", type=int, default=10_000)
+    parser.add_argument("--answers", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    questions = make_questions(args.bank_size)
+
+    # Accuracy: log-normal answer times, 0.5 s .. a few minutes
+    values = sorted(int(rng.lognormvariate(15.5, 0.8)) for _ in range(args.answers))
+    hist = Histogram()
+    for v in values:
+        hist.record(v)
+    print("percentile    exact   histogram  error")
+    for pct in (50, 90, 99):
+        exact = percentile(values, pct)
+        approx = hist.percentile(pct)
+        print(f"p{pct:<10} {exact / 1e6:>7.3f}s {approx / 1e6:>9.3f}s {abs(approx - exact) / exact:>6.2%}")
+
+    # record() alone
+    times = ResponseTimes()
+    for q in questions:
+        times.prepare(q)
+    samples = [(questions[rng.randrange(len(questions))], rng.randrange(500_000_000, 60_000_000_000))
+               for _ in range(args.answers)]
+    t0 = time.perf_counter_ns()
+    for q, ns in samples:
+        times.record(q, ns)
+    record_ns = (time.perf_counter_ns() - t0) / len(samples)
+
+    # Allocations retained by another pass over the same answers: every
+    # histogram already exists and holds its maximum, so this should be 0.
+    # (One traced pass first, so the running sums being replaced are traced too.)
+    tracemalloc.start()
+    for q, ns in samples:
+        times.record(q, ns)
+    before = tracemalloc.take_snapshot()
+    for q, ns in samples:
+        times.record(q, ns)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "lineno")
+                   if "histogram.py" in stat.traceback[0].filename)
+
+    plain = answer_loop(QuizEngine(questions, session_size=20), args.answers)
+    timed = answer_loop(QuizEngine(questions, session_size=20, response_times=ResponseTimes()), args.answers)
+
+    print(f"\nResponseTimes.record: {record_ns:.0f} ns per answer, {retained} bytes retained by "
+          f"{len(samples):,} more records")
+    print(f"engine.answer(): {plain:.0f} ns without histograms, {timed:.0f} ns with "
+          f"(+{timed - plain:.0f} ns per answer)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Bulk import benchmark
+---------------------
+Writes synthetic CSV and JSONL question files of growing size (with ~2%
+malformed rows and ~2% duplicates mixed in), imports each in a fresh
+interpreter and reports rows/s and peak resident memory, which should stay
+nearly flat as the input grows.
+
+Usage:
+    python benchmarks/bench_import.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from apfrench.categories import CATEGORIES  # noqa: E402
+from bench_bank import _PEAK_RSS  # noqa: E402
+
+_CHILD = _PEAK_RSS + """
+import sys
+from apfrench.importer import import_questions
+report = import_questions([sys.argv[1]], sys.argv[2], include_builtin=False)
+print(report.rows, report.imported, report.invalid, report.duplicates, report.elapsed, peak_rss_kb())
+"""
+
+
+def rows(n):
+    """Synthetic rows: every 50th is malformed, every 50th (offset) repeats an earlier one."""
+    for i in range(n):
+        d = {
+            "question": f"Question synthétique {i} ?",
+            "choices": [f"choix {i}-{c}" for c in range(4)],
+            "answer": i % 4,
+            "explain": f"Explication {i}.",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+        }
+        if i % 50 == 7:
+            d["choices"] = d["choices"][:3]          # wrong number of choices
+        elif i % 50 == 31:
+            # duplicate of row i - 25, with different case, spacing and choice order
+            d["question"] = f"question  synthétique {i - 25} ?"
+            d["choices"] = [f"choix {i - 25}-{c}" for c in (3, 2, 1, 0)]
+        yield d
+
+
+def write_csv(path, n):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["question", "choice_a", "choice_b", "choice_c", "choice_d", "answer", "explain", "category"])
+        for d in rows(n):
+            choices = d["choices"] + [""] * (4 - len(d["choices"]))
+            writer.writerow([d["question"]] + choices + ["ABCD"[d["answer"]], d["explain"], d["category"]])
+
+
+def write_jsonl(path, n):
+    with open(path, "w", encoding="utf-8") as f:
+        for d in rows(n):
+            f.write(json.dumps(d, ensure_ascii=False) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    print(f"{'format':>6} {'rows':>10} {'imported':>10} {'invalid':>8} {'dupes':>7} {'rows/s':>10} {'peak RSS':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "bank.apfq")
+        for n in args.sizes:
+            for fmt, write in (("csv", write_csv), ("jsonl", write_jsonl)):
+                path = os.path.join(tmp, f"questions.{fmt}")
+                write(path, n)
+                result = subprocess.run([sys.executable, "-c", _CHILD, path, out], env=env,
+                                        capture_output=True, text=True, check=True).stdout.split()
+                total, imported, invalid, dupes = map(int, result[:4])
+                elapsed, rss = float(result[4]), int(result[5])
+                print(f"{fmt:>6} {total:>10,} {imported:>10,} {invalid:>8,} {dupes:>7,} "
+                      f"{total / elapsed:>10,.0f} {rss / 1024:>8.1f}MiB")
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
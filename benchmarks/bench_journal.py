@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Results journal benchmark
+-------------------------
+Appends simulated answer events to a journal (with the default fsync
+batching) and then aggregates per-student and per-question accuracy by
+streaming the file. Reports events/sec for both and the aggregator's
+peak traced memory, which should not grow with the number of events.
+
+Usage:
+    python benchmarks/bench_journal.py --events 2000000 --students 30 --questions 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.journal import Journal, aggregate  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=2_000_000)
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--questions", type=int, default=5_000)
+    parser.add_argument("--sync-every", type=int, default=32)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    students = [rng.randrange(args.students) for _ in range(4096)]
+    questions = [rng.randrange(args.questions) for _ in range(4096)]
+    now = time.time()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.journal")
+        t0 = time.perf_counter()
+        with Journal(path, sync_every=args.sync_every, sync_interval=60) as journal:
+            for i in range(args.events):
+                k = i & 4095
+                journal.append(students[k], questions[k], i & 3, (i & 3) == 0, 4000 + k, now)
+        write_s = time.perf_counter() - t0
+        size = os.path.getsize(path)
+
+        t0 = time.perf_counter()
+        by_student, by_question = aggregate(path)
+        read_s = time.perf_counter() - t0
+
+        # Second pass only to measure memory (tracemalloc slows it down)
+        tracemalloc.start()
+        aggregate(path)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    print(f"events:    {args.events:,} ({size / 2**20:.1f} MiB, {size / args.events:.1f} bytes/event)")
+    print(f"append:    {args.events / write_s:,.0f} events/s (fsync every {args.sync_every})")
+    print(f"aggregate: {args.events / read_s:,.0f} events/s ({len(by_student)} students, "
+          f"{len(by_question)} questions, peak {peak / 2**20:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Session restart memory benchmark
+--------------------------------
+Measures the bytes allocated by one session restart with the old approach
+(copy every question dict and add choices_shuffled/answer_index_shuffled)
+against QuizEngine (Question references + one array of choice orders).
+
+Usage:
+    python benchmarks/bench_memory.py --bank-size 10000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.engine import QuizEngine  # noqa: E402
+from bench_engine import make_question_dicts, make_questions  # noqa: E402
+
+
+def dict_copy_restart(all_questions, session_size):
+    """The pre-engine reset_quiz_state, kept here as the baseline."""
+    if session_size is None:
+        questions = [q.copy() for q in all_questions]
+        random.shuffle(questions)
+    else:
+        questions = [q.copy() for q in random.sample(all_questions, session_size)]
+    for q in questions:
+        choices = q["choices"][:]
+        correct_choice = choices[q["answer"]]
+        random.shuffle(choices)
+        q["choices_shuffled"] = choices
+        q["answer_index_shuffled"] = choices.index(correct_choice)
+    return questions
+
+
+def measure(restart):
+    """Peak traced bytes and wall time of one call to restart()."""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    kept = restart()
+    elapsed = time.perf_counter() - t0
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current - before, peak - before, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bank-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    dicts = make_question_dicts(args.bank_size)
+    records = make_questions(args.bank_size)
+    engine = QuizEngine(records, session_size=None)
+
+    print(f"bank={args.bank_size}")
+    print(f"{'session':>8} {'approach':>10} {'retained':>12} {'peak':>12} {'time ms':>9}")
+    for session_size in (5, None):
+        label = session_size or args.bank_size
+        engine.session_size = session_size
+
+        def engine_restart():
+            engine.reset()
+            return engine
+
+        for name, restart in (("dict copy", lambda: dict_copy_restart(dicts, session_size)),
+                              ("engine", engine_restart)):
+            kept, peak, elapsed = measure(restart)
+            print(f"{label:>8} {name:>10} {kept:>12,} {peak:>12,} {elapsed * 1e3:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
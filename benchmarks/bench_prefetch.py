@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Next-question latency benchmark
+-------------------------------
+Time from "Next Question" to the next question being ready to render
+(advance, question and shuffled choices), with and without a prefetch on
+a worker thread during the feedback pause, for a bank on slow storage.
+
+The bank is a real bank file wrapped so that every record read first
+waits --latency-ms, like a cold read from an SD card; the feedback pause
+is --pause-ms. Without prefetch every Next pays the read; with it the
+read is done while the student looks at the feedback.
+
+Usage:
+    python benchmarks/bench_prefetch.py --latency-ms 15 --pause-ms 300 --questions 20
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Sequence
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.bank import Bank, write_bank  # noqa: E402
+from apfrench.engine import QuizEngine  # noqa: E402
+from bench_engine import make_question_dicts  # noqa: E402
+
+
+class SlowBank(Sequence):
+    """A Bank whose record reads take `latency` seconds more."""
+    def __init__(self, bank, latency):
+        self.bank = bank
+        self.latency = latency
+        self.reads = 0
+
+    def __len__(self):
+        return len(self.bank)
+
+    def __getitem__(self, index):
+        self.reads += 1
+        time.sleep(self.latency)
+        return self.bank[index]
+
+
+def run(bank, questions, pause, prefetch):
+    """Answer `questions` questions; returns the Next latencies in seconds."""
+    engine = QuizEngine(bank, session_size=questions, seed=23)
+    engine.current_choices
+    latencies = []
+    while True:
+        engine.answer(0)
+        worker = None
+        if prefetch:
+            worker = threading.Thread(target=engine.prefetch)
+            worker.start()
+        time.sleep(pause)   # the student reads the feedback
+        t0 = time.perf_counter()
+        if worker is not None:
+            worker.join()
+        if not engine.advance():
+            break
+        engine.current_choices
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bank-size", type=int, default=100_000)
+    parser.add_argument("--latency-ms", type=float, default=15.0, help="extra time per record read")
+    parser.add_argument("--pause-ms", type=float, default=300.0, help="time the feedback is shown")
+    parser.add_argument("--questions", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bank.apfq")
+        write_bank(path, make_question_dicts(args.bank_size))
+        with Bank(path) as bank:
+            slow = SlowBank(bank, args.latency_ms / 1000)
+            print(f"{args.questions} questions, record reads +{args.latency_ms:g} ms, "
+                  f"feedback shown {args.pause_ms:g} ms")
+            print(f"{'prefetch':>9} {'mean ms':>8} {'max ms':>8} {'reads':>6}")
+            for prefetch in (False, True):
+                slow.reads = 0
+                latencies = run(slow, args.questions, args.pause_ms / 1000, prefetch)
+                print(f"{'on' if prefetch else 'off':>9} {sum(latencies) / len(latencies) * 1000:>8.3f} "
+                      f"{max(latencies) * 1000:>8.3f} {slow.reads:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Question-switch render benchmark
+--------------------------------
+Compares the old way of showing a question (configure the label, then
+each button's text, then each button's state, one Tcl call at a time)
+with apfrench.render.Renderer (diff against the screen, apply once on
+idle), and a burst of <Configure> events during a window drag.
+
+By default the widgets are recording stand-ins, so it runs anywhere and
+reports how many Tcl calls each approach makes per switch. With --tk it
+drives real ttk widgets and times each switch including
+update_idletasks() (the redraw); the target on a Pi 3 is < 5 ms.
+
+Usage:
+    python benchmarks/bench_render.py --switches 2000
+    python benchmarks/bench_render.py --tk --switches 500
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.engine import QuizEngine  # noqa: E402
+from apfrench.render import Renderer  # noqa: E402
+from bench_engine import make_questions, percentile  # noqa: E402
+
+
+class RecordingWidget:
+    """Counts configure()/set() calls like a widget or Tk variable would receive."""
+    calls = 0
+
+    def configure(self, **options):
+        RecordingWidget.calls += 1
+
+    def set(self, value):
+        RecordingWidget.calls += 1
+
+    def state(self, spec):
+        RecordingWidget.calls += 1
+
+
+class IdleQueue:
+    """after_idle stand-in: callbacks run when run() is called."""
+    def __init__(self):
+        self.callbacks = []
+
+    def after_idle(self, callback):
+        self.callbacks.append(callback)
+
+    def run(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def make_widgets(parent=None):
+    """progress var, question label, 4 answer buttons, feedback var, next button."""
+    if parent is None:
+        return tuple(RecordingWidget() for _ in range(3)), [RecordingWidget() for _ in range(4)], RecordingWidget()
+    import tkinter as tk
+    from tkinter import ttk
+    progress_var, feedback_var = tk.StringVar(), tk.StringVar()
+    ttk.Label(parent, textvariable=progress_var).pack()
+    label = ttk.Label(parent, wraplength=600, font=("Helvetica", 14))
+    label.pack()
+    buttons = []
+    for i in range(4):
+        button = ttk.Button(parent, text=f"Choice {i}")
+        button.pack()
+        buttons.append(button)
+    ttk.Label(parent, textvariable=feedback_var).pack()
+    next_button = ttk.Button(parent, text="Next Question")
+    next_button.pack()
+    return (progress_var, label, feedback_var), buttons, next_button
+
+
+def switch_direct(engine, widgets, buttons, next_button):
+    progress_var, label, feedback_var = widgets
+    q = engine.current
+    progress_var.set(f"Question {engine.current_index + 1} of {engine.session_length}")
+    label.configure(text=q.question)
+    for i, text in enumerate(engine.current_choices):
+        buttons[i].configure(text=f"{chr(65 + i)}. {text}")
+    for b in buttons:
+        b.state(["!disabled"])
+    feedback_var.set("")
+    next_button.configure(text="Next Question")
+
+
+def switch_rendered(view, engine, widgets, buttons, next_button):
+    progress_var, label, feedback_var = widgets
+    q = engine.current
+    view.update(progress_var, value=f"Question {engine.current_index + 1} of {engine.session_length}")
+    view.update(label, text=q.question)
+    for i, text in enumerate(engine.current_choices):
+        view.update(buttons[i], text=f"{chr(65 + i)}. {text}", state="normal")
+    view.update(feedback_var, value="")
+    view.update(next_button, text="Next Question")
+
+
+def answer(engine, buttons, view=None):
+    engine.answer(0)
+    for b in buttons:
+        if view is None:
+            b.state(["disabled"])
+        else:
+            view.update(b, state="disabled")
+    engine.advance()
+    if engine.finished:
+        engine.reset()
+
+
+def run(kind, switches, root=None):
+    """Sorted per-switch times (ns) and widget calls per switch (switch + answer)."""
+    engine = QuizEngine(make_questions(1000), session_size=20)
+    idle = IdleQueue() if root is None else None
+    redraw = idle.run if root is None else root.update_idletasks
+    widgets, buttons, next_button = make_widgets(root)
+    view = Renderer(idle.after_idle if root is None else root.after_idle)
+    RecordingWidget.calls = 0
+    times = []
+    clock = time.perf_counter_ns
+    for _ in range(switches):
+        t0 = clock()
+        if kind == "direct":
+            switch_direct(engine, widgets, buttons, next_button)
+        else:
+            switch_rendered(view, engine, widgets, buttons, next_button)
+        redraw()
+        times.append(clock() - t0)
+        answer(engine, buttons, None if kind == "direct" else view)
+        redraw()
+    times.sort()
+    return times, RecordingWidget.calls / switches
+
+
+def resize_burst(events):
+    """Configure calls made for a drag of `events` <Configure> events."""
+    idle = IdleQueue()
+    label = RecordingWidget()
+    view = Renderer(idle.after_idle)
+    for width in range(800, 800 + events):
+        view.update(label, wraplength=max(200, width - 120))
+    idle.run()
+    return view.configure_calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--switches", type=int, default=2_000)
+    parser.add_argument("--tk", action="store_true", help="use real ttk widgets (needs a display)")
+    args = parser.parse_args()
+
+    root = None
+    if args.tk:
+        import tkinter as tk
+        try:
+            root = tk.Tk()
+        except tk.TclError as e:
+            sys.exit(f"--tk needs a display: {e}")
+
+    print(f"{args.switches:,} question switches ({'ttk widgets' if root else 'recording widgets'})")
+    print(f"{'':>10} {'p50':>9} {'p99':>9} {'calls/switch':>13}")
+    for kind in ("direct", "rendered"):
+        # Call counts always come from the recording widgets
+        times, calls = run(kind, args.switches)
+        if root is not None:
+            frame = tk.Frame(root)
+            frame.pack()
+            times, _ = run(kind, args.switches, frame)
+            frame.destroy()
+        print(f"{kind:>10} {percentile(times, 50) / 1e6:>7.3f}ms {percentile(times, 99) / 1e6:>7.3f}ms {calls:>13.1f}")
+    if root is not None:
+        root.destroy()
+
+    print(f"\nwindow drag, 200 <Configure> events: {resize_burst(200)} wraplength change(s) applied "
+          f"(was 200, one per event)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Session restart latency benchmark
+---------------------------------
+Time from "Restart Quiz" to the first question being ready to render, for
+the eager approach (shuffle the whole bank and every question's choices up
+front, as v1 used to) against QuizEngine's lazy draw, at growing bank sizes.
+
+The bank is a synthetic Sequence that builds Question records on demand,
+so even the 1M case fits in memory; the eager approach still pays for
+touching every record, as it would with a real Bank.
+
+Usage:
+    python benchmarks/bench_restart.py --sizes 10000 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections.abc import Sequence
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.engine import QuizEngine  # noqa: E402
+from apfrench.question import Question  # noqa: E402
+
+
+class SyntheticBank(Sequence):
+    """n four-choice questions, created on access."""
+    def __init__(self, n):
+        self.n = n
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.n:
+            raise IndexError(i)
+        return Question(i, f"Question synthétique {i} ?", [f"choix {i}-{c}" for c in range(4)], i % 4)
+
+
+def eager_restart(bank, session_size):
+    """The pre-lazy reset: materialize, shuffle everything, then show question 0."""
+    if session_size is None:
+        questions = list(bank)
+        random.shuffle(questions)
+    else:
+        questions = random.sample(bank, session_size)
+    order = [0, 1, 2, 3]
+    layouts = []
+    for q in questions:
+        random.shuffle(order)
+        layouts.append((order[:], order.index(q.answer)))
+    return questions[0], layouts[0]
+
+
+def lazy_restart(engine):
+    engine.reset()
+    return engine.current, engine.current_choices
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'bank':>10} {'session':>8} | {'eager ms':>10} | {'lazy ms':>9}")
+    for n in args.sizes:
+        bank = SyntheticBank(n)
+        for session_size in (None, 5):
+            engine = QuizEngine(bank, session_size=session_size)
+            eager = best_of(lambda: eager_restart(bank, session_size), args.repeat)
+            lazy = best_of(lambda: lazy_restart(engine), args.repeat * 100)
+            label = "all" if session_size is None else session_size
+            print(f"{n:>10,} {label:>8} | {eager * 1e3:>10.3f} | {lazy * 1e3:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Search index benchmark
+----------------------
+Builds a bank of random French-looking questions (with a few real words
+and names planted), then reports the time to build, save and open its
+search index, the latency of typical queries next to a full scan of the
+bank, and the cost of indexing questions appended to the bank compared
+with a rebuild.
+
+Usage:
+    python benchmarks/bench_search.py --bank-size 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.bank import Bank, write_bank  # noqa: E402
+from apfrench.search import SearchIndex, open_index, question_words, search_path, words  # noqa: E402
+from bench_dedup import make_words  # noqa: E402
+
+PLANTED = ["subjonctif", "Victor Hugo", "l'élève", "« château »", "passé composé", "Molière"]
+QUERIES = ["subjonctif", "SUBJONCTIF eleve", '"victor hugo"', "chateau", "pass*", "la", "introuvable"]
+
+
+def make_dicts(n, rng, start=0):
+    vocabulary = make_words(rng, 5000)
+    dicts = []
+    for i in range(start, start + n):
+        text = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 14)))
+        if i % 97 == 0:
+            text += " " + rng.choice(PLANTED)
+        dicts.append({
+            "question": text + " ?",
+            "choices": [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3))) for _ in range(4)],
+            "answer": rng.randrange(4),
+            "explain": " ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 8))),
+        })
+    return dicts
+
+
+def scan(bank, query):
+    """What a search costs without an index: fold every question."""
+    wanted = set(words(query))
+    return [qid for qid in range(len(bank)) if wanted <= set(question_words(bank[qid]))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bank-size", type=int, default=100_000)
+    parser.add_argument("--added", type=int, default=1_000, help="questions appended for the incremental update")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(21)
+    with tempfile.TemporaryDirectory() as tmp:
+        bank_path = os.path.join(tmp, "bank.apfq")
+        questions = make_dicts(args.bank_size, rng)
+        write_bank(bank_path, questions)
+        with Bank(bank_path) as bank:
+            t0 = time.perf_counter()
+            index = SearchIndex.build(bank)
+            build_s = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            index.save(search_path(bank_path))
+            save_ms = (time.perf_counter() - t0) * 1000
+            t0 = time.perf_counter()
+            index = open_index(bank)
+            open_ms = (time.perf_counter() - t0) * 1000
+            size = os.path.getsize(search_path(bank_path))
+            print(f"{args.bank_size:,} questions, {index.vocabulary:,} words: build {build_s:.2f}s, "
+                  f"save {save_ms:.0f} ms, open {open_ms:.1f} ms, {size / 2**20:.1f} MiB")
+
+            print(f"\n{'query':>20} {'matches':>8} {'index':>10} {'full scan':>10}")
+            for query in QUERIES:
+                t0 = time.perf_counter()
+                for _ in range(args.repeat):
+                    found = index.search(query, bank)
+                query_ms = (time.perf_counter() - t0) / args.repeat * 1000
+                scan_ms = ""
+                if query == QUERIES[0]:
+                    t0 = time.perf_counter()
+                    assert scan(bank, query) == found
+                    scan_ms = f"{(time.perf_counter() - t0) * 1000:.0f} ms"
+                print(f"{query:>20} {len(found):>8,} {query_ms:>7.3f} ms {scan_ms:>10}")
+
+        questions.extend(make_dicts(args.added, rng, args.bank_size))
+        write_bank(bank_path, questions)
+        with Bank(bank_path) as bank:
+            t0 = time.perf_counter()
+            index = open_index(bank)
+            update_ms = (time.perf_counter() - t0) * 1000
+            t0 = time.perf_counter()
+            SearchIndex.build(bank)
+            rebuild_s = time.perf_counter() - t0
+            print(f"\n{args.added:,} questions appended: incremental update + save {update_ms:.0f} ms "
+                  f"({len(index):,} indexed), full rebuild {rebuild_s:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
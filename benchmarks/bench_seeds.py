@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Seeded session benchmark
+------------------------
+Starts a class of students on the same form (one seed) and walks each
+through the whole session, with and without a shared LayoutCache, and
+compares that with every student getting a fresh seed. Also checks that
+replaying a seed gives the identical session.
+
+Usage:
+    python benchmarks/bench_seeds.py --students 30 --forms 1000 --session-size 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.engine import LayoutCache, QuizEngine  # noqa: E402
+from bench_engine import make_questions  # noqa: E402
+
+
+def walk(engine):
+    """Show every question of the session; return what was shown."""
+    shown = []
+    while not engine.finished:
+        shown.append((engine.current.id, engine.current_answer_index))
+        engine.current_choices
+        engine.advance()
+    return shown
+
+
+def run_class(bank, args, seed_of, layouts):
+    t0 = time.perf_counter()
+    for form in range(args.forms):
+        for student in range(args.students):
+            walk(QuizEngine(bank, session_size=args.session_size, seed=seed_of(form, student), layouts=layouts))
+    return (time.perf_counter() - t0) / (args.forms * args.students) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bank-size", type=int, default=100_000)
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--forms", type=int, default=1_000)
+    parser.add_argument("--session-size", type=int, default=20)
+    args = parser.parse_args()
+
+    bank = make_questions(args.bank_size)
+    same_form = lambda form, student: form  # noqa: E731
+    own_form = lambda form, student: form * args.students + student  # noqa: E731
+
+    replay = walk(QuizEngine(bank, session_size=args.session_size, seed=12345))
+    cached = LayoutCache()
+    same = replay == walk(QuizEngine(bank, session_size=args.session_size, seed=12345)) == \
+        walk(QuizEngine(bank, session_size=args.session_size, seed=12345, layouts=cached)) == \
+        walk(QuizEngine(bank, session_size=args.session_size, seed=12345, layouts=cached))
+    print(f"replay of a seed identical (lazy and cached): {same}")
+
+    print(f"{'':>28} {'us/student':>11}")
+    print(f"{'own seed each':>28} {run_class(bank, args, own_form, None):>11.1f}")
+    print(f"{'same form, no cache':>28} {run_class(bank, args, same_form, None):>11.1f}")
+    layouts = LayoutCache()
+    per_student = run_class(bank, args, same_form, layouts)
+    print(f"{'same form, LayoutCache':>28} {per_student:>11.1f}   "
+          f"({layouts.hits:,} hits, {layouts.misses:,} misses)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Spaced-repetition scheduler benchmark
+-------------------------------------
+Builds a schedule for a large bank with part of it already reviewed, then
+reports save/load time, review-session construction latency (heap pops)
+and per-review latency.
+
+Usage:
+    python benchmarks/bench_srs.py --bank-size 1000000 --seen 300000 --session-size 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.srs import Scheduler  # noqa: E402
+from bench_engine import percentile  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bank-size", type=int, default=1_000_000)
+    parser.add_argument("--seen", type=int, default=300_000)
+    parser.add_argument("--session-size", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=2_000)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    now = time.time()
+    scheduler = Scheduler(args.bank_size)
+    for qid in rng.sample(range(args.bank_size), args.seen):
+        scheduler.review(qid, rng.random() < 0.7, rng.uniform(2, 30), now - rng.uniform(0, 30) * 86400)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "schedule.srs")
+        t0 = time.perf_counter()
+        scheduler.save(path)
+        save_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        scheduler = Scheduler.load(path, args.bank_size)
+        load_s = time.perf_counter() - t0
+        size = os.path.getsize(path)
+
+    pick_ns = []
+    review_ns = []
+    clock = time.perf_counter_ns
+    for _ in range(args.sessions):
+        t0 = clock()
+        session = scheduler.pick_session(args.session_size, now)
+        pick_ns.append(clock() - t0)
+        for qid in session:
+            t0 = clock()
+            scheduler.review(qid, rng.random() < 0.7, rng.uniform(2, 30), now)
+            review_ns.append(clock() - t0)
+    pick_ns.sort()
+    review_ns.sort()
+
+    print(f"bank={args.bank_size:,} seen={args.seen:,} state file {size / 2**20:.1f} MiB")
+    print(f"save {save_s * 1e3:.1f} ms, load {load_s * 1e3:.1f} ms")
+    print(f"pick_session({args.session_size}): p50 {percentile(pick_ns, 50) / 1e3:.1f} us, "
+          f"p99 {percentile(pick_ns, 99) / 1e3:.1f} us")
+    print(f"review: p50 {percentile(review_ns, 50) / 1e3:.1f} us, p99 {percentile(review_ns, 99) / 1e3:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
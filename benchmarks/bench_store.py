@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Progress store benchmark
+------------------------
+Fills a fresh progress database (apfrench.store) with --rows answer
+events through Store.append, as a quiz server's sessions would (students
+taking 20-question sessions over a bank), and reports the sustained
+insert rate to disk and what start_session() (an insert, for its id)
+and append() (queued) cost the calling thread. Then
+times the dashboard queries on the full database: a student's recent
+sessions, totals and most-missed questions, and a question's answers
+over the last week.
+
+Usage:
+    python benchmarks/bench_store.py --rows 10000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.store import Store  # noqa: E402
+
+SESSION = 20
+DAY = 86400.0
+
+
+def fill(store, rows, students, questions, days, rng):
+    """Append `rows` answers in sessions; returns (seconds in start_session(), seconds in append())."""
+    start = time.time() - days * DAY
+    step = days * DAY / rows
+    random_ = rng.random
+    randrange = rng.randrange
+    append = store.append
+    in_sessions = in_appends = 0.0
+    clock = time.perf_counter
+    for i in range(0, rows, SESSION):
+        student = randrange(students)
+        t0 = clock()
+        session = store.start_session(student, i, SESSION)
+        t1 = clock()
+        for k in range(min(SESSION, rows - i)):
+            append(student, randrange(questions), randrange(4), random_() < 0.6, 2000 + randrange(8000),
+                   start + (i + k) * step, session)
+        in_sessions += t1 - t0
+        in_appends += clock() - t1
+    return in_sessions, in_appends
+
+
+def time_query(fn, args_list):
+    times = []
+    for args in args_list:
+        t0 = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    return times[len(times) // 2], times[int(len(times) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--students", type=int, default=5_000)
+    parser.add_argument("--questions", type=int, default=20_000)
+    parser.add_argument("--days", type=float, default=365.0, help="period the answers are spread over")
+    parser.add_argument("--queries", type=int, default=200, help="runs of each dashboard query")
+    args = parser.parse_args()
+
+    rng = random.Random(25)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "progress.sqlite")
+        with Store(path, batch_size=4096) as store:
+            t0 = time.perf_counter()
+            in_sessions, in_appends = fill(store, args.rows, args.students, args.questions, args.days, rng)
+            store.flush()
+            elapsed = time.perf_counter() - t0
+            sessions = -(-args.rows // SESSION)
+            print(f"{args.rows:,} answers in {sessions:,} sessions, {args.students:,} students, "
+                  f"{args.questions:,} questions")
+            print(f"inserted in {elapsed:.1f}s: {args.rows / elapsed:,.0f} answers/s sustained")
+            print(f"caller's thread: start_session {in_sessions / sessions * 1e6:.1f} us, "
+                  f"append {in_appends / args.rows * 1e6:.2f} us")
+            size = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+            print(f"database {size / 1e6:,.0f} MB\n")
+
+            now = time.time()
+            some_students = [(rng.randrange(args.students),) for _ in range(args.queries)]
+            some_questions = [(rng.randrange(args.questions), now - 7 * DAY) for _ in range(args.queries)]
+            print(f"{'query':<28} {'p50 ms':>8} {'p99 ms':>8}")
+            for name, fn, args_list in (
+                ("student sessions (20)", store.student_sessions, some_students),
+                ("student totals", store.student_totals, some_students),
+                ("student weak questions", store.weak_questions, some_students),
+                ("question, last 7 days", store.question_stats, some_questions),
+            ):
+                p50, p99 = time_query(fn, args_list)
+                print(f"{name:<28} {p50 * 1000:>8.2f} {p99 * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
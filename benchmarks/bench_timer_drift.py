@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Question timer drift harness
+----------------------------
+Measures how late "time's up" fires under event-loop load for the old
+chained after(1000) countdown (decrement a counter on each tick) and for
+apfrench.timer.Countdown (deadline derived from a monotonic clock).
+
+By default it runs on a simulated event loop with a virtual clock, where
+every callback starts late by a random delay of up to --load-ms (a busy
+Tk loop on a Pi) - fast and deterministic. With --tk it runs on a real
+Tk event loop with busy-wait callbacks injected as load (needs a display).
+
+Usage:
+    python benchmarks/bench_timer_drift.py --seconds 15 --load-ms 0 20 50 100
+    python benchmarks/bench_timer_drift.py --tk --seconds 5 --load-ms 30
+"""
+
+import argparse
+import heapq
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.timer import Countdown  # noqa: E402
+
+
+class SimLoop:
+    """Minimal after()/after_cancel() loop on a virtual clock with random lateness."""
+    def __init__(self, load_ms, rng):
+        self.now = 0.0
+        self.load = load_ms / 1000
+        self.rng = rng
+        self._queue = []
+        self._ids = itertools.count()
+        self._cancelled = set()
+
+    def clock(self):
+        return self.now
+
+    def after(self, ms, callback):
+        handle = next(self._ids)
+        heapq.heappush(self._queue, (self.now + ms / 1000, handle, callback))
+        return handle
+
+    def after_cancel(self, handle):
+        self._cancelled.add(handle)
+
+    def run(self):
+        while self._queue:
+            when, handle, callback = heapq.heappop(self._queue)
+            if handle in self._cancelled:
+                continue
+            # The loop was busy: the callback runs late
+            self.now = max(self.now, when) + self.rng.uniform(0, self.load)
+            callback()
+
+
+def chained_countdown(after, seconds, on_expire):
+    """The original v1/v3 timer: re-arm after(1000) and decrement by one."""
+    remaining = [seconds]
+
+    def tick():
+        if remaining[0] <= 0:
+            on_expire()
+            return
+        remaining[0] -= 1
+        after(1000, tick)
+    tick()
+
+
+def simulate(kind, seconds, load_ms, trials, seed):
+    """Return the expiry lateness (seconds) of each trial."""
+    rng = random.Random(seed)
+    lateness = []
+    for _ in range(trials):
+        loop = SimLoop(load_ms, rng)
+        fired = []
+        if kind == "chained":
+            chained_countdown(loop.after, seconds, lambda: fired.append(loop.now))
+        else:
+            Countdown(loop.after, loop.after_cancel, lambda s: None,
+                      lambda: fired.append(loop.now), clock=loop.clock).start(seconds)
+        loop.run()
+        lateness.append(fired[0] - seconds)
+    return lateness
+
+
+def run_tk(kind, seconds, load_ms):
+    """One real-time trial on a Tk loop with periodic busy callbacks as load."""
+    import tkinter as tk
+
+    root = tk.Tk()
+    root.withdraw()
+    result = []
+    start = time.monotonic()
+
+    def busy():
+        end = time.monotonic() + random.uniform(0, load_ms / 1000)
+        while time.monotonic() < end:
+            pass
+        if not result:
+            root.after(1, busy)
+
+    def expired():
+        result.append(time.monotonic() - start - seconds)
+        root.quit()
+
+    root.after(1, busy)
+    if kind == "chained":
+        chained_countdown(root.after, seconds, expired)
+    else:
+        Countdown(root.after, root.after_cancel, lambda s: None, expired).start(seconds)
+    root.mainloop()
+    root.destroy()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=int, default=15, help="countdown length")
+    parser.add_argument("--load-ms", type=float, nargs="+", default=[0, 10, 25, 50, 100],
+                        help="maximum random lateness per callback")
+    parser.add_argument("--trials", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tk", action="store_true", help="use a real Tk event loop (one trial per load level)")
+    args = parser.parse_args()
+
+    print(f"{args.seconds}s countdown, expiry lateness in ms ({'Tk' if args.tk else 'simulated'} loop)")
+    print(f"{'load ms':>8} | {'chained mean':>12} {'max':>8} | {'deadline mean':>13} {'max':>8}")
+    for load in args.load_ms:
+        row = []
+        for kind in ("chained", "deadline"):
+            if args.tk:
+                lateness = run_tk(kind, args.seconds, load)
+            else:
+                lateness = simulate(kind, args.seconds, load, args.trials, args.seed)
+            row.append((sum(lateness) / len(lateness) * 1e3, max(lateness) * 1e3))
+        print(f"{load:>8g} | {row[0][0]:>12.1f} {row[0][1]:>8.1f} | {row[1][0]:>13.1f} {row[1][1]:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
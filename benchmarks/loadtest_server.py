@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Quiz server load test
+---------------------
+Simulates N students taking quizzes at the same time against a quiz
+server on localhost and reports request throughput and round-trip
+latency percentiles. By default an in-process server is started on a
+free port; use --connect HOST:PORT to test a running
+`python3 -m apfrench.server` instead.
+
+Usage:
+    python benchmarks/loadtest_server.py --clients 40 --sessions 50
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench import protocol  # noqa: E402
+from apfrench.bank import open_default_bank  # noqa: E402
+from apfrench.server import QuizServer  # noqa: E402
+from bench_engine import percentile  # noqa: E402
+
+
+async def student(host, port, student_id, sessions, session_size, latencies):
+    """One simulated student: start, then answer/next until done, repeat."""
+    reader, writer = await asyncio.open_connection(host, port)
+    rng = random.Random(student_id)
+    clock = time.perf_counter_ns
+
+    async def call(message):
+        t0 = clock()
+        writer.write(protocol.encode(message))
+        reply = protocol.decode(await reader.readline())
+        latencies.append(clock() - t0)
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply
+
+    for _ in range(sessions):
+        reply = await call({"op": "start", "student": student_id, "session_size": session_size})
+        while not reply["finished"]:
+            await call({"op": "answer", "choice": rng.randrange(len(reply["choices"]))})
+            reply = await call({"op": "next"})
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(args):
+    server = None
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        port = int(port)
+    else:
+        bank = open_default_bank()
+        server = await QuizServer(bank, session_size=args.session_size).start(protocol.DEFAULT_HOST, 0)
+        host, port = server.sockets[0].getsockname()[:2]
+
+    latencies = []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(student(host, port, i, args.sessions, args.session_size, latencies)
+                           for i in range(args.clients)))
+    elapsed = time.perf_counter() - t0
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    latencies.sort()
+    print(f"clients={args.clients} sessions/client={args.sessions} session_size={args.session_size}")
+    print(f"requests:   {len(latencies):,} in {elapsed:.2f}s = {len(latencies) / elapsed:,.0f} req/s")
+    print(f"sessions:   {args.clients * args.sessions / elapsed:,.0f} sessions/s")
+    print(f"round trip: p50 {percentile(latencies, 50) / 1e3:.0f} us, p90 {percentile(latencies, 90) / 1e3:.0f} us, "
+          f"p99 {percentile(latencies, 99) / 1e3:.0f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=40)
+    parser.add_argument("--sessions", type=int, default=50, help="quizzes per client")
+    parser.add_argument("--session-size", type=int, default=5)
+    parser.add_argument("--connect", metavar="HOST:PORT", help="use a running server instead of an in-process one")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apfrench.bank import Bank, write_bank  # noqa: E402
+from apfrench.question import Question  # noqa: E402
+
+CATEGORIES = ("vocabulary", "grammar", "culture", "reading")
+
+
+def make_questions(n, categories=CATEGORIES):
+    """`n` distinct questions, cycling through the categories and answer positions."""
+    return [Question(i, f"Question numéro {i} ?", [f"réponse {i} {c}" for c in "abcd"], i % 4,
+                     f"Explication {i}.", categories[i % len(categories)] if categories else "")
+            for i in range(n)]
+
+
+@pytest.fixture
+def questions():
+    return make_questions(40)
+
+
+@pytest.fixture
+def bank_path(tmp_path, questions):
+    path = str(tmp_path / "bank.apfq")
+    write_bank(path, questions)
+    return path
+
+
+@pytest.fixture
+def bank(bank_path):
+    with Bank(bank_path) as b:
+        yield b
@@ -0,0 +1,75 @@
+import math
+
+import pytest
+
+from apfrench.adaptive import AdaptiveSession, ItemPool, information, probability
+from apfrench.engine import QuizEngine
+
+
+def test_model():
+    assert probability(0.0, 0.0) == 0.5
+    assert probability(2.0, 0.0) > 0.5 > probability(-2.0, 0.0)
+    assert information(0.0, 0.0) == 0.25
+    assert information(0.0, 0.0, 2.0) == 1.0
+    assert information(0.0, 3.0) < information(0.0, 0.0)
+
+
+def test_best_is_nearest_unused_difficulty():
+    pool = ItemPool([-2.0, -0.5, 0.1, 1.0, 3.0])
+    assert pool.best(0.0, set()) == 2
+    assert pool.best(0.0, {2}) == 1
+    assert pool.best(2.5, set()) == 4
+    assert pool.best(0.0, set(range(5))) is None
+
+
+def test_best_two_parameter_prefers_discrimination():
+    pool = ItemPool([0.0, 0.1], discrimination=[0.5, 2.0])
+    assert pool.best(0.0, set()) == 1
+
+
+def test_ability_moves_with_the_answers():
+    pool = ItemPool([i / 10 - 2 for i in range(40)])
+    right, wrong = AdaptiveSession(pool), AdaptiveSession(pool)
+    for _ in range(5):
+        right.record(right.next_question(), True)
+        wrong.record(wrong.next_question(), False)
+    assert right.theta > 0 > wrong.theta
+    assert right.standard_error < 1.0 and right.answers == 5
+    right.start()
+    assert (right.theta, right.answers, right.standard_error) == (0.0, 0, 1.0)
+
+
+def test_stopping_rule():
+    session = AdaptiveSession(ItemPool([0.0] * 100), target_se=0.5, min_questions=3)
+    answers = 0
+    while not session.precise_enough:
+        session.record(session.next_question(), answers % 2 == 0)
+        answers += 1
+    assert answers >= 3 and session.standard_error <= 0.5
+    assert math.isclose(1 / session.standard_error ** 2, 1.0 + 0.25 * answers, rel_tol=0.1)
+
+
+def test_engine_ends_the_session_early(questions):
+    session = AdaptiveSession(ItemPool([0.0] * len(questions)), target_se=0.6, min_questions=2)
+    engine = QuizEngine(questions, session_size=30, adaptive=session, seed=1)
+    asked = []
+    while not engine.finished:
+        asked.append(engine.current.id)
+        engine.answer(engine.current_answer_index)
+        engine.advance()
+    assert len(set(asked)) == len(asked) < 30
+    assert engine.session_length == len(asked)
+
+
+def test_item_pool_from_stats(tmp_path):
+    pytest.importorskip("numpy")
+    from apfrench.analysis import analyze, load_events
+    from test_analysis import write_journal
+
+    path = str(tmp_path / "results.journal")
+    write_journal(path)
+    pool = ItemPool.from_stats(analyze(load_events(path)), 6, two_parameter=True)
+    assert pool.difficulty[1] < pool.difficulty[0] < pool.difficulty[4]
+    assert pool.difficulty[5] == 0.0 and pool.a(5) == 1.0
+    assert pool.a(4) > pool.a(0) > 0
+    assert pool.a(2) == 1.0         # negative discrimination: left at the default
@@ -0,0 +1,77 @@
+import math
+
+import pytest
+
+from apfrench.analysis import ItemStats, stats_path
+from apfrench.journal import TIMED_OUT, Journal
+
+np = pytest.importorskip("numpy")
+
+from apfrench.analysis import analyze, load_events  # noqa: E402
+
+ANSWERS = [0, 1, 2, 3, 0]
+
+
+def write_journal(path):
+    """100 students of rising ability; question 2 is answered right by the weak ones only."""
+    with Journal(path, sync_every=512) as journal:
+        for student in range(100):
+            ability = student / 100
+            right = [ability > 0.5, True, ability < 0.5, ability > 0.3, ability > 0.7]
+            for qid, ok in enumerate(right):
+                if qid == 4 and student % 10 == 0:
+                    chosen = TIMED_OUT
+                else:
+                    chosen = ANSWERS[qid] if ok else (ANSWERS[qid] + 1) % 4
+                journal.append(student, qid, chosen, chosen == ANSWERS[qid], 1000)
+            # A retry never counts
+            journal.append(student, 0, ANSWERS[0], 1, 1000)
+
+
+def test_statistics(tmp_path):
+    path = str(tmp_path / "results.journal")
+    write_journal(path)
+    stats = analyze(load_events(path))
+    assert len(stats) == 5 and stats.students == 100
+    assert list(stats.attempts) == [100] * 5
+    assert stats.p_value[0] == pytest.approx(0.49) and stats.p_value[1] == 1.0
+    assert stats.discrimination[4] > stats.discrimination[0] > 0 > stats.discrimination[2]
+    assert math.isnan(stats.discrimination[1])
+    rates, spreads = stats.choices(4)
+    assert sum(rates) == pytest.approx(0.9)      # timeouts make up the rest
+    assert spreads[0] > 0 > spreads[1]
+
+    assert "too easy" in stats.flags(1, ANSWERS[1])
+    assert any(f.startswith("negative discrimination") for f in stats.flags(2, ANSWERS[2]))
+    assert "choice C is never chosen" in stats.flags(0, ANSWERS[0])
+    assert stats.flags(0, ANSWERS[0])[0] == "low discrimination"
+
+
+def test_count_limits_the_questions(tmp_path):
+    path = str(tmp_path / "results.journal")
+    write_journal(path)
+    assert len(analyze(load_events(path), count=3)) == 3
+    assert len(analyze(load_events(path), count=8)) == 8
+
+
+def test_truncated_journal(tmp_path):
+    path = tmp_path / "results.journal"
+    write_journal(str(path))
+    with open(path, "ab") as f:
+        f.write(b"\x01\x02\x03")
+    assert len(load_events(str(path))) == 600
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "results.journal")
+    write_journal(path)
+    stats = analyze(load_events(path))
+    saved = stats_path(str(tmp_path / "bank.apfq"))
+    assert saved == str(tmp_path / "bank.stats")
+    stats.save(saved)
+    loaded = ItemStats.load(saved)
+    assert list(loaded.attempts) == list(stats.attempts)
+    assert loaded.p_value[:2] == stats.p_value[:2] and loaded.choices(4) == stats.choices(4)
+    (tmp_path / "other.stats").write_bytes(b"nope")
+    with pytest.raises(ValueError):
+        ItemStats.load(str(tmp_path / "other.stats"))
@@ -0,0 +1,143 @@
+import threading
+import time
+import wave
+
+import pytest
+
+from apfrench.audio import AudioError, ClipCache, Player, clip_path, stream
+
+
+def write_wav(path, frames, rate=8000):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(bytes(range(256)) * (frames * 2 // 256) + bytes(frames * 2 % 256))
+    return str(path)
+
+
+class Output:
+    """Collects what would have been played."""
+    def __init__(self):
+        self.opened = []
+        self.data = bytearray()
+        self.closed = 0
+
+    def __call__(self, info):
+        self.opened.append(info)
+        return self
+
+    def write(self, data):
+        self.data += data
+
+    def close(self):
+        self.closed += 1
+
+
+def test_clip_path(tmp_path):
+    assert clip_path("a.wav", str(tmp_path)) == str(tmp_path / "a.wav")
+    assert clip_path(str(tmp_path / "b.wav"), "/elsewhere") == str(tmp_path / "b.wav")
+
+
+def test_stream_wav(tmp_path):
+    path = write_wav(tmp_path / "clip.wav", 10000)
+    info, chunks = stream(path, chunk_frames=4096)
+    assert (info.channels, info.sample_width, info.rate) == (1, 2, 8000)
+    assert [len(c) for c in chunks] == [8192, 8192, 3616]
+
+
+def test_stream_errors(tmp_path):
+    with pytest.raises(AudioError):
+        stream(str(tmp_path / "clip.mp3"))
+    (tmp_path / "bad.wav").write_bytes(b"not a wav file")
+    with pytest.raises(AudioError):
+        stream(str(tmp_path / "bad.wav"))
+    with pytest.raises(FileNotFoundError):
+        stream(str(tmp_path / "missing.wav"))
+
+
+def test_clip_cache(tmp_path):
+    write_wav(tmp_path / "a.wav", 1000)
+    write_wav(tmp_path / "b.wav", 1000)
+    write_wav(tmp_path / "big.wav", 5000)
+    cache = ClipCache(max_bytes=4500, root=str(tmp_path))
+    info, chunks = cache.open("a.wav")
+    assert "a.wav" not in cache
+    assert len(b"".join(chunks)) == 2000
+    assert "a.wav" in cache and cache.size == 2000
+    assert cache.load("b.wav").size == 2000 and len(cache) == 2
+    cache.open("a.wav")                     # a is now the most recently used
+    assert cache.hits == 1
+    assert cache.load("big.wav") is None    # over the budget: never cached
+    assert len(cache) == 2
+    write_wav(tmp_path / "c.wav", 1000)
+    cache.load("c.wav")
+    assert "b.wav" not in cache and "a.wav" in cache and cache.size <= 4500
+
+
+def test_player(tmp_path):
+    write_wav(tmp_path / "a.wav", 10000)
+    output = Output()
+    player = Player(ClipCache(root=str(tmp_path)), output)
+    player.play("a.wav")
+    player.wait()
+    assert not player.playing and player.error is None
+    assert len(output.data) == 20000 and output.closed == 1
+    assert player.start_latency is not None
+    with pytest.raises(FileNotFoundError):
+        player.play("missing.wav")
+
+
+def test_player_reports_output_errors(tmp_path):
+    write_wav(tmp_path / "a.wav", 100)
+
+    def broken(info):
+        raise AudioError("no audio output")
+
+    player = Player(ClipCache(root=str(tmp_path)), broken)
+    player.play("a.wav")
+    player.wait()
+    assert isinstance(player.error, AudioError)
+
+
+def test_clips_do_not_overlap(tmp_path):
+    write_wav(tmp_path / "a.wav", 10000)
+    write_wav(tmp_path / "b.wav", 10000)
+    lock = threading.Lock()
+    state = {"open": 0, "most": 0}
+
+    class Slow(Output):
+        def __call__(self, info):
+            with lock:
+                state["open"] += 1
+                state["most"] = max(state["most"], state["open"])
+            return self
+
+        def write(self, data):
+            time.sleep(0.02)
+
+        def close(self):
+            with lock:
+                state["open"] -= 1
+
+    player = Player(ClipCache(root=str(tmp_path)), Slow())
+    player.play("a.wav")
+    while player.start_latency is None:
+        time.sleep(0.001)
+    player.play("b.wav")
+    player.stop()
+    player.wait()
+    assert state == {"open": 0, "most": 1}
+
+
+def test_player_reports_errors_on_close(tmp_path):
+    write_wav(tmp_path / "a.wav", 100)
+
+    class Unplugged(Output):
+        def close(self):
+            raise AudioError("device unplugged")
+
+    player = Player(ClipCache(root=str(tmp_path)), Unplugged())
+    player.play("a.wav")
+    player.wait()
+    assert str(player.error) == "device unplugged"
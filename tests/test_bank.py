@@ -0,0 +1,122 @@
+import struct
+
+import pytest
+
+from apfrench import bank as bank_module
+from apfrench.bank import Bank, BankFormatError, BankWriter, open_default_bank, write_bank
+from apfrench.question import Question
+
+from conftest import make_questions
+
+
+def test_round_trip(bank, questions):
+    assert len(bank) == len(questions)
+    for original, read in zip(questions, bank):
+        assert (read.id, read.question, read.choices, read.answer, read.explain, read.category) == \
+               (original.id, original.question, original.choices, original.answer, original.explain, original.category)
+
+
+def test_categories_index(bank, questions):
+    assert sorted(bank.categories) == sorted({q.category for q in questions})
+    for name, ids in bank.categories.items():
+        assert list(ids) == [q.id for q in questions if q.category == name]
+
+
+def test_audio_and_unicode_survive(tmp_path):
+    path = str(tmp_path / "audio.apfq")
+    write_bank(path, [Question(0, "Où est « la gare » ?", ["Là-bas", "Ici", "Près d'ici", "Nulle part"], 2,
+                               "Préposition.", "", "clips/gare.wav")])
+    with Bank(path) as b:
+        q = b[0]
+        assert q.audio == "clips/gare.wav" and q.category == ""
+        assert q.question == "Où est « la gare » ?" and q.choices[2] == "Près d'ici"
+
+
+def test_indexing(bank, questions):
+    assert bank[-1].id == len(questions) - 1
+    assert [q.id for q in bank[2:5]] == [2, 3, 4]
+    with pytest.raises(IndexError):
+        bank[len(questions)]
+
+
+def test_dict_questions_are_numbered_by_position(tmp_path):
+    path = str(tmp_path / "dicts.apfq")
+    assert write_bank(path, [{"question": "Q ?", "choices": ["a", "b", "c", "d"], "answer": 1}]) == 1
+    with Bank(path) as b:
+        assert (b[0].id, b[0].answer) == (0, 1)
+
+
+def test_invalid_question_writes_nothing(tmp_path, questions):
+    path = tmp_path / "bad.apfq"
+    with pytest.raises(ValueError):
+        write_bank(str(path), questions[:3] + [Question(3, "Q ?", ["a", "b", "c", "d"], 5)])
+    assert not path.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_writer_reports_positions(tmp_path, questions):
+    with BankWriter(str(tmp_path / "w.apfq")) as writer:
+        assert [writer.add(q) for q in questions[:3]] == [0, 1, 2]
+
+
+def write_v2(path, questions):
+    """A bank in the previous format: no audio string in the records."""
+    names = sorted({q.category for q in questions})
+    records = []
+    for q in questions:
+        strings = [q.question, *q.choices, q.explain]
+        records.append(bank_module._RECORD_HEAD.pack(q.answer, len(q.choices), names.index(q.category)) +
+                       b"".join(bank_module._STR_LEN.pack(len(s.encode())) + s.encode() for s in strings))
+    section = b"".join(bank_module._STR_LEN.pack(len(n.encode())) + n.encode() +
+                       struct.pack(f"<I{sum(q.category == n for q in questions)}I",
+                                   sum(q.category == n for q in questions),
+                                   *[q.id for q in questions if q.category == n])
+                       for n in names)
+    start = bank_module._HEADER.size + bank_module._OFFSET.size * (len(questions) + 1) + len(section)
+    offsets = [start]
+    for r in records:
+        offsets.append(offsets[-1] + len(r))
+    with open(path, "wb") as f:
+        f.write(bank_module._HEADER.pack(b"APFQ", 2, len(names), len(questions)))
+        f.write(b"".join(bank_module._OFFSET.pack(o) for o in offsets))
+        f.write(section)
+        f.write(b"".join(records))
+
+
+def test_reads_version_2(tmp_path):
+    questions = make_questions(6)
+    path = str(tmp_path / "v2.apfq")
+    write_v2(path, questions)
+    with Bank(path) as b:
+        assert [(q.question, q.choices, q.answer, q.category, q.audio) for q in b] == \
+               [(q.question, q.choices, q.answer, q.category, "") for q in questions]
+        assert list(b.categories["grammar"]) == [1, 5]
+
+
+@pytest.mark.parametrize("content", [b"", b"APFQ", b"NOPE" + bytes(12), struct.pack("<4sHHI", b"APFQ", 9, 0, 0)])
+def test_rejects_other_files(tmp_path, content):
+    path = tmp_path / "other.apfq"
+    path.write_bytes(content)
+    with pytest.raises(BankFormatError):
+        Bank(str(path))
+
+
+def test_checksum_follows_the_records(tmp_path, questions):
+    first, second = str(tmp_path / "a.apfq"), str(tmp_path / "b.apfq")
+    write_bank(first, questions)
+    edited = list(questions)
+    edited[20] = Question(20, "Changée ?", questions[20].choices, questions[20].answer, "", questions[20].category)
+    write_bank(second, edited)
+    with Bank(first) as a, Bank(second) as b:
+        assert a.checksum(20) == b.checksum(20)
+        assert a.checksum() != b.checksum()
+        assert a.checksum(0) == b.checksum(0)
+
+
+def test_open_default_bank_builds_a_missing_file(tmp_path):
+    path = tmp_path / "data" / "questions.apfq"
+    with open_default_bank(str(path)) as b:
+        assert path.exists() and len(b) > 0
+    path.write_bytes(b"garbage")
+    with open_default_bank(str(path)) as b:
+        assert len(b) > 0
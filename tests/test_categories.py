@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+from apfrench.categories import allocate, build_category_index, category_index, pick_session_ids
+
+
+def test_category_index(questions, bank):
+    index = build_category_index(questions)
+    assert list(index["grammar"]) == list(range(1, 40, 4))
+    assert {c: list(ids) for c, ids in category_index(bank).items()} == {c: list(ids) for c, ids in index.items()}
+
+
+def test_allocate():
+    available = {"grammar": 10, "culture": 10, "reading": 2}
+    assert allocate({"grammar": 2, "culture": 1}, 9, available) == {"grammar": 6, "culture": 3}
+    assert allocate({"grammar": 1, "culture": 1}, 5, available) in ({"grammar": 3, "culture": 2},
+                                                                    {"grammar": 2, "culture": 3})
+    # a small category gives its share to the others
+    assert allocate({"reading": 1, "grammar": 1}, 8, available) == {"reading": 2, "grammar": 6}
+    assert allocate({"grammar": 1, "culture": 0}, 4, available) == {"grammar": 4}
+
+
+@pytest.mark.parametrize("weights, size", [({"poetry": 1}, 1), ({"grammar": 0}, 1), ({"reading": 1}, 3)])
+def test_allocate_errors(weights, size):
+    with pytest.raises(ValueError):
+        allocate(weights, size, {"grammar": 10, "reading": 2})
+
+
+def test_pick_session_ids(questions):
+    index = build_category_index(questions)
+    ids = pick_session_ids(index, {"grammar": 1, "reading": 1}, 8, random.Random(1))
+    assert len(set(ids)) == 8
+    assert sorted(questions[i].category for i in ids) == ["grammar"] * 4 + ["reading"] * 4
+    assert list(ids) == list(pick_session_ids(index, {"grammar": 1, "reading": 1}, 8, random.Random(1)))
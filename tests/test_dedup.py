@@ -0,0 +1,48 @@
+from apfrench.dedup import choose_bands, find_near_duplicates, signature
+from apfrench.question import Question
+
+DISTINCT = [
+    Question(0, "Quelle est la capitale de la France ?", ["Paris", "Lyon", "Nice", "Lille"], 0),
+    Question(1, "Comment dit-on « apple » en français ?", ["pomme", "poire", "prune", "pêche"], 0),
+    Question(2, "Quel est le participe passé de « prendre » ?", ["pris", "prendu", "prit", "prise"], 0),
+    Question(3, "Quel fleuve traverse Paris ?", ["la Seine", "la Loire", "le Rhône", "la Garonne"], 0),
+    Question(4, "Qui a écrit « Les Misérables » ?", ["Victor Hugo", "Zola", "Balzac", "Flaubert"], 0),
+]
+
+
+def test_signature():
+    assert signature("le chat est sur le tapis") == signature("le chat est sur le tapis")
+    assert len(signature("court", 32)) == 32
+    # Texts too short to fill every bin do not look alike for it
+    a, b = signature("abcdefgh"), signature("stuvwxyz")
+    assert sum(x == y for x, y in zip(a, b)) < 8
+
+
+def test_choose_bands():
+    bands, rows = choose_bands(64, 0.7)
+    assert bands * rows == 64
+    assert (1 / bands) ** (1 / rows) <= 0.7
+
+
+def test_finds_near_duplicates():
+    base = DISTINCT[4]
+    questions = DISTINCT + [
+        Question(5, "  QUI a écrit « Les Misérables » ?", list(reversed(base.choices)), 0),
+        Question(6, base.question, base.choices[:3] + ("Victor Hugo, poète",), 0),
+    ]
+    report = find_near_duplicates(questions, threshold=0.7)
+    assert report.clusters == [[4, 5, 6]]
+    assert report.duplicates == [5, 6]
+    assert report.pairs >= 2 and report.candidates >= report.pairs
+
+
+def test_distinct_questions_are_kept():
+    assert find_near_duplicates(DISTINCT).clusters == []
+
+
+def test_listening_questions_on_different_clips_are_kept():
+    listening = [Question(i, "Qu'est-ce que la personne va faire ?", ["partir", "rester", "manger", "dormir"], 0,
+                          category="listening", audio=f"clip{i}.ogg") for i in range(3)]
+    assert find_near_duplicates(listening).clusters == []
+    same_clip = listening + [Question(3, listening[0].question, listening[0].choices, 0, audio="clip0.ogg")]
+    assert find_near_duplicates(same_clip).clusters == [[0, 3]]
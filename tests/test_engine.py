@@ -0,0 +1,196 @@
+import pytest
+
+from apfrench.engine import LayoutCache, QuizEngine, SessionError
+from apfrench.histogram import ResponseTimes
+from apfrench.journal import TIMED_OUT, Journal, iter_events
+
+
+def play(engine, pick=lambda e: e.current_answer_index):
+    """Answer every question of the session; returns the ids asked."""
+    asked = []
+    while not engine.finished:
+        asked.append(engine.current.id)
+        engine.answer(pick(engine))
+        engine.advance()
+    return asked
+
+
+def test_session_asks_distinct_questions_and_scores(questions):
+    engine = QuizEngine(questions, session_size=10, seed=1)
+    asked = play(engine)
+    assert len(asked) == len(set(asked)) == 10
+    assert engine.finished
+    assert (engine.score_correct, engine.total_attempted) == (10, 10)
+    assert engine.percent() == 100.0
+
+
+def test_wrong_answer_and_time_up(questions):
+    engine = QuizEngine(questions, session_size=2, seed=4)
+    assert engine.answer((engine.current_answer_index + 1) % 4) is False
+    engine.advance()
+    engine.time_up()
+    assert (engine.score_correct, engine.total_attempted) == (0, 2)
+
+
+def test_session_larger_than_bank(questions):
+    with pytest.raises(ValueError):
+        QuizEngine(questions, session_size=len(questions) + 1)
+
+
+def test_reset_starts_over(questions):
+    engine = QuizEngine(questions, session_size=3, seed=8)
+    first = play(engine)
+    engine.reset(8)
+    assert not engine.finished and engine.total_attempted == 0
+    assert play(engine) == first
+
+
+def test_response_times_only_for_shown_questions(questions):
+    times = ResponseTimes()
+    engine = QuizEngine(questions, session_size=3, response_times=times, seed=13)
+    engine.mark_shown()
+    engine.answer(0)
+    engine.advance()
+    # A driver that never calls mark_shown: no response time, and no KeyError
+    engine.answer(0)
+    engine.advance()
+    engine.mark_shown()
+    engine.time_up()
+    assert times.overall.total == 1
+
+
+def test_whole_bank_by_default(questions):
+    engine = QuizEngine(questions, seed=2)
+    assert sorted(play(engine)) == list(range(len(questions)))
+
+
+def test_choices_are_shuffled_consistently(questions):
+    engine = QuizEngine(questions, session_size=20, seed=3)
+    while not engine.finished:
+        q = engine.current
+        assert sorted(engine.current_choices) == sorted(q.choices)
+        assert engine.current_choices[engine.current_answer_index] == q.choices[q.answer]
+        engine.advance()
+
+
+def test_category_weights(questions):
+    engine = QuizEngine(questions, session_size=6, category_weights={"grammar": 1, "culture": 1}, seed=7)
+    categories = []
+    while not engine.finished:
+        categories.append(engine.current.category)
+        engine.advance()
+    assert sorted(categories) == ["culture"] * 3 + ["grammar"] * 3
+
+
+def test_answers_are_journaled_in_original_order(tmp_path, questions):
+    path = str(tmp_path / "results.journal")
+    with Journal(path) as journal:
+        engine = QuizEngine(questions, session_size=2, journal=journal, student_id=12, seed=11)
+        q = engine.current
+        engine.answer(engine.current_answer_index)
+        engine.advance()
+        timed_out = engine.current
+        engine.time_up()
+    events = list(iter_events(path))
+    assert [(e[0], e[1], e[2], e[3]) for e in events] == [(12, q.id, q.answer, 1), (12, timed_out.id, TIMED_OUT, 0)]
+
+
+def test_each_question_takes_one_answer(questions):
+    engine = QuizEngine(questions, session_size=3, seed=5)
+    engine.answer(engine.current_answer_index)
+    with pytest.raises(SessionError):
+        engine.answer(engine.current_answer_index)
+    with pytest.raises(SessionError):
+        engine.time_up()
+    with pytest.raises(SessionError):
+        engine.answer_text("anything")
+    assert (engine.score_correct, engine.total_attempted) == (1, 1)
+    engine.advance()
+    engine.time_up()
+    assert engine.total_attempted == 2
+
+
+@pytest.mark.parametrize("index", [-1, 4, 9])
+def test_answer_outside_the_choices(questions, index):
+    engine = QuizEngine(questions, session_size=2, seed=5)
+    with pytest.raises(ValueError):
+        engine.answer(index)
+    assert not engine.answered and engine.total_attempted == 0
+    assert engine.answer(engine.current_answer_index) is True
+
+
+def test_nothing_is_answered_after_the_end(questions):
+    engine = QuizEngine(questions, session_size=2, seed=6)
+    play(engine)
+    for action in (lambda: engine.current, lambda: engine.current_choices, lambda: engine.answer(0),
+                   lambda: engine.answer_text("x"), engine.time_up):
+        with pytest.raises(SessionError):
+            action()
+    assert engine.total_attempted == 2
+
+
+def test_same_seed_replays_the_same_session(questions):
+    def session(seed):
+        engine = QuizEngine(questions, session_size=8, seed=seed)
+        shown = []
+        while not engine.finished:
+            shown.append((engine.current.id, engine.current_choices))
+            engine.advance()
+        return shown
+
+    assert session(7) == session(7)
+    assert session(7) != session(8)
+
+
+def test_layout_cache_shares_an_immutable_layout(questions):
+    layouts = LayoutCache()
+    engine = QuizEngine(questions, session_size=5, seed=9, layouts=layouts)
+    expected = play(engine)
+    with pytest.raises(SessionError):
+        engine.current_choices
+    other = QuizEngine(questions, session_size=5, seed=9, layouts=layouts)
+    assert (layouts.hits, layouts.misses) == (1, 1)
+    assert isinstance(other.question_ids, tuple) and isinstance(other._perm, bytes)
+    assert play(other) == expected
+    assert play(QuizEngine(questions, session_size=5, seed=9)) == expected
+
+
+def test_answer_text(questions):
+    engine = QuizEngine(questions, session_size=1, seed=12)
+    q = engine.current
+    verdict = engine.answer_text(q.choices[q.answer].upper())
+    assert verdict.correct and engine.score_correct == 1
+
+
+@pytest.mark.parametrize("size", [1, 3, 10])
+def test_cached_layouts_mark_the_right_answer(questions, size):
+    engine = QuizEngine(questions, session_size=size, seed=5, layouts=LayoutCache())
+    while not engine.finished:
+        q = engine.current
+        assert engine.current_choices[engine.current_answer_index] == q.choices[q.answer]
+        engine.advance()
+
+
+def test_prefetch_before_reading_the_current_question(questions):
+    engine = QuizEngine(questions, session_size=4, seed=6)
+    while not engine.finished:
+        engine.prefetch()
+        q = engine.current
+        assert engine.current_choices[engine.current_answer_index] == q.choices[q.answer]
+        engine.advance()
+
+
+def test_prefetch_does_not_change_the_session(questions):
+    plain = QuizEngine(questions, session_size=6, seed=10)
+    prefetching = QuizEngine(questions, session_size=6, seed=10)
+    expected = play(plain)
+    asked = []
+    while not prefetching.finished:
+        asked.append(prefetching.current.id)
+        nxt = prefetching.prefetch()
+        prefetching.answer(0)
+        prefetching.advance()
+        if nxt is not None:
+            assert prefetching.current is nxt
+    assert asked == expected
+    assert prefetching.prefetch() is None
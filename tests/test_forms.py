@@ -0,0 +1,52 @@
+import pytest
+
+from apfrench.engine import QuizEngine
+from apfrench.forms import FormSet, form_name, get_forms
+
+from conftest import make_questions
+
+
+def test_form_names():
+    assert [form_name(i) for i in (0, 1, 25, 26)] == ["A", "B", "Z", "27"]
+
+
+def test_forms_cover_every_category_without_overlap(questions):
+    forms = FormSet(questions, size=8, count=4, seed=1)
+    assert len(forms) == 4
+    used = set()
+    for f in range(len(forms)):
+        ids, perm = forms.layout(f)
+        assert isinstance(ids, tuple) and isinstance(perm, bytes)
+        assert sorted(questions[i].category for i in ids) == sorted(["vocabulary", "grammar", "culture",
+                                                                     "reading"] * 2)
+        assert not used & set(ids)
+        used |= set(ids)
+
+
+def test_form_sessions_mark_the_right_answer(questions):
+    forms = FormSet(questions, size=6, count=3, seed=2)
+    for seed in range(3):
+        engine = QuizEngine(questions, forms=forms, seed=seed)
+        assert engine.form == seed
+        while not engine.finished:
+            q = engine.current
+            assert engine.current_choices[engine.current_answer_index] == q.choices[q.answer]
+            engine.advance()
+
+
+def test_difficulty_balances_the_forms():
+    questions = make_questions(80)
+    difficulty = [i / 80 for i in range(80)]
+    forms = FormSet(questions, size=8, count=4, seed=3, difficulty=difficulty)
+    means = [forms.mean_difficulty(f) for f in range(4)]
+    assert max(means) - min(means) < 0.05
+
+
+def test_too_small_for_the_categories(questions):
+    with pytest.raises(ValueError):
+        FormSet(questions, size=3)
+
+
+def test_get_forms_is_cached(questions):
+    assert get_forms(questions, 4, 2) is get_forms(questions, 4, 2)
+    assert get_forms(questions, 4, 2) is not get_forms(questions, 4, 3)
@@ -0,0 +1,70 @@
+from apfrench.freeresponse import (ACCENTS, EXACT, TYPO, WRONG, AnswerKey, AnswerKeys, distance, normalize,
+                                   tolerance, variants)
+from apfrench.question import Question
+
+
+def key(choices, answer=0, strict=False):
+    return AnswerKey(Question(0, "Q ?", choices, answer), strict)
+
+
+def test_normalize_and_tolerance():
+    assert normalize("  L'ÉTÉ,  « chaud » ! ") == normalize("l ete chaud")
+    assert [tolerance(t) for t in ("oui", "avait", "pluvieux")] == [0, 1, 2]
+
+
+def test_variants():
+    assert variants("D'accord / Ça fonctionne") == ["D'accord / Ça fonctionne", "D'accord", "Ça fonctionne"]
+    assert "La Révolution française" in variants("La Révolution française (prise de la Bastille)")
+
+
+def test_distance():
+    assert distance("pluvieux", "pluvieux", 2) == 0
+    assert distance("pluvieux", "pluvienx", 2) == 1
+    assert distance("chat", "chien", 1) == 2          # over the limit: limit + 1
+    assert distance("abc", "abcdef", 1) == 2
+    assert distance("maison", "raison", 2) == 1
+    assert distance("", "abc", 5) == 3
+
+
+def test_kinds():
+    k = key(["été", "hiver", "printemps", "automne"])
+    assert k.grade("Été").kind == EXACT
+    assert k.grade("ete") == (True, ACCENTS, 0, 0, "été")
+    assert k.grade("hiver") == (False, WRONG, 1, 0, "été")
+    assert k.grade("") == (False, WRONG, None, None, "été")
+    k = key(["pluvieux", "ensoleillé", "nuageux", "venteux"])
+    verdict = k.grade("pluviex")
+    assert (verdict.correct, verdict.kind, verdict.distance) == (True, TYPO, 1)
+    assert k.grade("xyz").kind == WRONG
+
+
+def test_closer_to_a_distractor_is_wrong():
+    k = key(["avais", "avait", "avions", "aviez"])
+    assert not k.grade("avait").correct
+    assert not key(["avaient", "avait", "avions", "aviez"], strict=True).grade("avaien").correct
+
+
+def test_accents_kept_when_they_tell_choices_apart():
+    k = key(["où", "ou", "au", "eu"])
+    assert k.grade("où").correct
+    assert not k.grade("ou").correct
+
+
+def test_alternatives_are_accepted():
+    k = key(["D'accord / Ça fonctionne", "Non merci", "Peut-être", "Jamais"])
+    assert k.grade("ca fonctionne").correct
+    assert k.grade("d'accord").correct
+
+
+def test_punctuation_only_answer():
+    k = key(["…", "oui", "non", "si"])
+    assert not k.grade("oui").correct
+    assert not k.grade("...").correct
+
+
+def test_answer_keys_grade_by_id(questions):
+    keys = AnswerKeys(questions, max_keys=2)
+    q = questions[5]
+    verdicts = keys.grade_many([(5, q.choices[q.answer]), (6, "rien du tout"), (7, "")])
+    assert [v.correct for v in verdicts] == [True, False, False]
+    assert len(keys) == 2
@@ -0,0 +1,53 @@
+from apfrench.grading import grade_directory, parse_sheet
+
+
+def test_parse_sheet():
+    student, answers, errors = parse_sheet([
+        "student: Camille",
+        "12 B",
+        "13, d   # sure?",
+        "",
+        "27 -",
+        "28",
+        "x B",
+        "29 F",
+        "３ A",
+    ], "sheet1")
+    assert student == "Camille"
+    assert answers == [(2, 12, 1), (3, 13, 3), (5, 27, None), (6, 28, None)]
+    assert [e.split(":")[0] for e in errors] == ["line 7", "line 8", "line 9"]
+    assert parse_sheet(["1 a"], "sheet1")[0] == "sheet1"
+
+
+def write_sheets(directory, questions):
+    letters = "ABCD"
+    (directory / "camille.txt").write_text(
+        "".join(f"{q.id} {letters[q.answer]}\n" for q in questions[:4]) + "4 -\n", encoding="utf-8")
+    (directory / "noe.txt").write_text(
+        "student: Noé\n" + "".join(f"{q.id} {letters[(q.answer + 1) % 4]}\n" for q in questions[:3]) + "999 A\n",
+        encoding="utf-8")
+    (directory / "notes.md").write_text("ignored", encoding="utf-8")
+
+
+def test_grade_directory(tmp_path, bank_path, questions):
+    write_sheets(tmp_path, questions)
+    for workers in (1, 2):
+        report = grade_directory(str(tmp_path), bank_path, workers=workers)
+        camille, noe = report.results
+        assert (camille.student, camille.questions, camille.correct, camille.blank) == ("camille", 5, 4, 1)
+        assert (noe.student, noe.questions, noe.correct) == ("Noé", 3, 0)
+        assert noe.errors == ["line 5: no question 999 in the bank"]
+        assert report.answers == 8
+
+
+def test_repeated_and_unreadable_sheets(tmp_path, bank_path, questions):
+    letters = "ABCD"
+    q = questions[0]
+    (tmp_path / "twice.txt").write_text(f"0 {letters[q.answer]}\n0 {letters[q.answer]}\n0 -\n", encoding="utf-8")
+    (tmp_path / "latin1.txt").write_bytes("student: Chloé\n0 A\n".encode("latin-1"))
+    latin1, twice = grade_directory(str(tmp_path), bank_path, workers=1).results
+    assert (twice.questions, twice.correct, twice.blank) == (1, 1, 0)
+    assert twice.errors == ["line 2: question 0 already answered on line 1",
+                            "line 3: question 0 already answered on line 1"]
+    assert (latin1.student, latin1.questions) == ("latin1", 0)
+    assert latin1.errors[0].startswith("cannot read the sheet")
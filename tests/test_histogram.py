@@ -0,0 +1,65 @@
+import csv
+
+import pytest
+
+from apfrench.histogram import Histogram, ResponseTimes
+from apfrench.question import Question
+
+
+def test_percentiles_within_precision():
+    h = Histogram()
+    for value in range(1, 10001):
+        h.record(value * 100)
+    for pct in (50, 90, 99):
+        assert h.percentile(pct) == pytest.approx(pct * 10000, rel=0.02)
+    assert h.percentile(100) == h.max_value == 1_000_000
+    assert h.mean == pytest.approx(500050)
+
+
+def test_small_values_are_exact_and_large_clamped():
+    h = Histogram(highest=1 << 20)
+    for value in (0, 3, 3, 100):
+        h.record(value)
+    assert h.percentile(50) == 3
+    h.record(1 << 30)
+    assert h.max_value == (1 << 20) - 1
+    assert Histogram().percentile(50) == 0
+
+
+def test_merge_and_reset():
+    a, b = Histogram(), Histogram()
+    a.record(1000)
+    b.record(3000)
+    a.merge(b)
+    assert (a.total, a.sum, a.max_value) == (2, 4000, 3000)
+    with pytest.raises(ValueError):
+        a.merge(Histogram(sub_bits=4))
+    a.reset()
+    assert (a.total, a.percentile(50)) == (0, 0)
+
+
+def test_summary_is_in_seconds():
+    h = Histogram()
+    h.record(2_000_000)
+    assert h.summary()["p50_s"] == pytest.approx(2.0, rel=0.02)
+    assert h.summary()["count"] == 1
+
+
+def test_response_times(tmp_path):
+    times = ResponseTimes()
+    q1, q2 = Question(1, "Q ?", "abcd", 0, category="grammar"), Question(2, "Q ?", "abcd", 0)
+    for q, seconds in ((q1, 2), (q1, 4), (q2, 8)):
+        times.prepare(q)
+        times.record(q, seconds * 1_000_000_000)
+    assert times.overall.total == times.session.total == 3
+    assert times.by_question[1].total == 2 and times.by_category["grammar"].total == 2
+    times.start_session()
+    assert times.session.total == 0 and times.overall.total == 3
+    assert [(scope, key) for scope, key, _ in times.rows()] == [("overall", ""), ("category", "-"),
+                                                                ("category", "grammar"), ("question", 1),
+                                                                ("question", 2)]
+    path = tmp_path / "times.csv"
+    times.export_csv(str(path))
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0][:3] == ["scope", "key", "count"] and rows[1][:3] == ["overall", "", "3"]
@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from apfrench.bank import Bank
+from apfrench.importer import (FingerprintSet, fingerprint, import_questions, parse_answer, read_csv,
+                               row_to_question)
+from apfrench.question import Question
+
+HEADER = "question,choice_a,choice_b,choice_c,choice_d,answer,explain,category\n"
+
+
+def write_jsonl(path, rows):
+    path.write_text("".join((r if isinstance(r, str) else json.dumps(r, ensure_ascii=False)) + "\n" for r in rows),
+                    encoding="utf-8")
+    return str(path)
+
+
+def row(n, **fields):
+    data = {"question": f"Question {n} ?", "choices": [f"{n} a", f"{n} b", f"{n} c", f"{n} d"], "answer": 1}
+    data.update(fields)
+    return data
+
+
+def test_parse_answer():
+    assert [parse_answer(v) for v in (2, "3", " b ", "D")] == [2, 3, 1, 3]
+    for bad in (True, "E", "deux"):
+        with pytest.raises(ValueError):
+            parse_answer(bad)
+
+
+def test_row_to_question():
+    q = row_to_question(row(1, category=" Grammar ", audio="clip.wav"), 7)
+    assert (q.id, q.answer, q.category, q.audio) == (7, 1, "grammar", "clip.wav")
+    for bad in (row(1, choices=["a", "b"]), row(1, answer=4), {"choices": []}, ["not", "a", "dict"],
+                json.JSONDecodeError("bad", "{", 0)):
+        with pytest.raises(ValueError):
+            row_to_question(bad, 0)
+
+
+def test_read_csv_with_a_byte_order_mark(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text("﻿" + HEADER + "Où ?,Ici,Là,Loin,Près,B,,culture\n\n", encoding="utf-8")
+    [(line_no, data)] = list(read_csv(str(path)))
+    assert line_no == 2
+    assert data["question"] == "Où ?" and data["choices"] == ["Ici", "Là", "Loin", "Près"]
+    assert row_to_question(data, 0).answer == 1
+
+
+def test_fingerprint_ignores_case_spacing_and_choice_order():
+    a = Question(0, "Où  est la gare ?", ["Ici", "Là", "Loin", "Près"], 0)
+    b = Question(1, "où est la gare ?", ["près", "loin", "là", "ici"], 3)
+    assert fingerprint(a) == fingerprint(b)
+    assert fingerprint(a) != fingerprint(Question(0, a.question, a.choices, 0, audio="gare.wav"))
+
+
+def test_fingerprint_set_grows():
+    seen = FingerprintSet(capacity=4)
+    assert all(seen.add(k) for k in range(1, 100))
+    assert not seen.add(50)
+    assert not seen.add(0)      # stored as 1: 0 marks an empty slot
+    assert len(seen) == 99
+    assert 50 in seen and 0 in seen and 100 not in seen
+
+
+def test_import(tmp_path):
+    jsonl = write_jsonl(tmp_path / "a.jsonl", [row(1), row(2, category="grammar"), "{oops", row(3, answer="Z"),
+                                               row(1)])
+    csv_path = tmp_path / "b.csv"
+    csv_path.write_text(HEADER + "Question 4 ?,w,x,y,z,a,,\n", encoding="utf-8")
+    out = str(tmp_path / "bank.apfq")
+    report = import_questions([jsonl, str(csv_path)], out, include_builtin=False)
+    assert (report.rows, report.imported, report.invalid, report.duplicates) == (6, 3, 2, 1)
+    assert [(line, message) for _, line, message in report.errors][-1] == (5, "duplicate question")
+    with Bank(out) as b:
+        assert [q.question for q in b] == ["Question 1 ?", "Question 2 ?", "Question 4 ?"]
+        assert list(b.categories) == ["grammar"]
+
+
+def test_builtin_questions_come_first(tmp_path):
+    from apfrench.questions import QUESTIONS
+    out = str(tmp_path / "bank.apfq")
+    report = import_questions([write_jsonl(tmp_path / "a.jsonl", [row(1)])], out)
+    with Bank(out) as b:
+        assert len(b) == len(QUESTIONS) + report.imported
+
+
+def test_unknown_extension_writes_nothing(tmp_path):
+    out = tmp_path / "bank.apfq"
+    with pytest.raises(ValueError):
+        import_questions([write_jsonl(tmp_path / "a.jsonl", [row(1)]), str(tmp_path / "b.xlsx")], str(out))
+    assert not out.exists()
+
+
+def test_too_many_categories_rejects_only_the_row(tmp_path):
+    rows = [row(i, category=f"c{i}") for i in range(256)]
+    out = str(tmp_path / "bank.apfq")
+    report = import_questions([write_jsonl(tmp_path / "a.jsonl", rows)], out, include_builtin=False)
+    assert (report.imported, report.invalid) == (254, 2)
+    with Bank(out) as b:
+        assert len(b) == 254 and len(b.categories) == 254
+
+
+def test_rejected_row_is_not_a_duplicate(tmp_path):
+    rows = [row(i, category=f"c{i}") for i in range(255)] + [row(254, category="c0")]
+    out = str(tmp_path / "bank.apfq")
+    report = import_questions([write_jsonl(tmp_path / "a.jsonl", rows)], out, include_builtin=False)
+    assert (report.imported, report.invalid, report.duplicates) == (255, 1, 0)
+    with Bank(out) as b:
+        assert b[254].question == "Question 254 ?" and b[254].category == "c0"
@@ -0,0 +1,67 @@
+import pytest
+
+from apfrench.journal import (RECORD, TIMED_OUT, UNMATCHED, Journal, JournalFormatError, aggregate,
+                              iter_events)
+
+
+def test_events_read_back_in_order(tmp_path):
+    path = str(tmp_path / "results.journal")
+    with Journal(path, sync_every=2) as journal:
+        journal.append(1, 10, 2, 1, 1500, timestamp=100.0)
+        journal.append(1, 11, TIMED_OUT, 0, 30000, timestamp=101.0)
+        journal.append(2, 10, UNMATCHED, 0, 4000.7, timestamp=102.0)
+    assert list(iter_events(path)) == [(1, 10, 2, 1, 1500, 100.0), (1, 11, TIMED_OUT, 0, 30000, 101.0),
+                                       (2, 10, UNMATCHED, 0, 4000, 102.0)]
+
+
+def test_sync_writes_buffered_events(tmp_path):
+    path = str(tmp_path / "results.journal")
+    journal = Journal(path, sync_every=100, sync_interval=3600)
+    journal.append(1, 1, 0, 1, 10)
+    assert list(iter_events(path)) == []
+    journal.sync()
+    assert len(list(iter_events(path))) == 1
+    journal.close()
+    journal.close()
+
+
+def test_reopening_appends(tmp_path):
+    path = str(tmp_path / "results.journal")
+    for student in (1, 2):
+        with Journal(path) as journal:
+            journal.append(student, 0, 0, 1, 10)
+    assert [e[0] for e in iter_events(path)] == [1, 2]
+
+
+def test_partial_record_is_ignored_then_cut(tmp_path):
+    path = tmp_path / "results.journal"
+    with Journal(str(path)) as journal:
+        journal.append(1, 1, 0, 1, 10)
+    with open(path, "ab") as f:
+        f.write(b"\x07" * (RECORD.size // 2))
+    assert len(list(iter_events(str(path)))) == 1
+    with Journal(str(path)) as journal:
+        journal.append(2, 2, 1, 0, 20)
+    assert [e[0] for e in iter_events(str(path))] == [1, 2]
+
+
+def test_aggregate(tmp_path):
+    path = str(tmp_path / "results.journal")
+    with Journal(path) as journal:
+        journal.append(1, 10, 0, 1, 1000)
+        journal.append(1, 11, 1, 0, 3000)
+        journal.append(2, 10, 0, 1, 2000)
+    students, questions = aggregate(path)
+    assert (students[1].attempts, students[1].correct, students[1].percent) == (2, 1, 50.0)
+    assert students[1].mean_response_ms == 2000
+    assert (questions[10].attempts, questions[10].correct) == (2, 2)
+    students, questions = aggregate(path, student_id=2)
+    assert list(students) == [2] and list(questions) == [10]
+
+
+@pytest.mark.parametrize("content", [b"", b"APF", b"XXXX" + bytes(4)])
+def test_rejects_other_files(tmp_path, content):
+    path = tmp_path / "other.journal"
+    path.write_bytes(content)
+    with pytest.raises(JournalFormatError):
+        list(iter_events(str(path)))
@@ -0,0 +1,40 @@
+import pytest
+
+from apfrench.launch import PRESETS, parse_args
+
+
+@pytest.mark.parametrize("preset", sorted(PRESETS))
+def test_presets(preset):
+    args = parse_args([], preset)
+    for name, value in PRESETS[preset].items():
+        assert getattr(args, name) == value
+
+
+def test_options_override_the_preset():
+    args = parse_args(["--preset", "short", "--session-size", "all", "--layout", "row", "--timer", "on"])
+    assert (args.session_size, args.layout, args.timer) == (None, "row", "on")
+    assert parse_args(["--session-size", "12"], "timed").session_size == 12
+
+
+@pytest.mark.parametrize("argv", [
+    ["--session-size", "0"],
+    ["--review", "--adaptive"],
+    ["--server", "localhost:8765", "--review"],
+    ["--student", "Camille"],
+    ["--forms", "3"],                       # the classic preset asks every question
+    ["--forms", "0", "--session-size", "5"],
+    ["--server", "localhost"],
+    ["--server", "localhost:http"],
+    ["--server", ":8765"],
+    ["--server", "localhost:70000"],
+])
+def test_rejected_combinations(argv, capsys):
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+    assert "error" in capsys.readouterr().err
+
+
+def test_accepted_combinations():
+    assert parse_args(["--store", "--student", "Camille"]).student == "Camille"
+    assert parse_args(["--forms", "3"], "short").forms == 3
+    assert parse_args(["--server", "192.168.1.20:8765"]).server == ("192.168.1.20", 8765)
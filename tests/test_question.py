@@ -0,0 +1,37 @@
+import pytest
+
+from apfrench.question import Question, validate_question
+
+
+def test_questions_are_immutable():
+    q = Question(0, "Q ?", ["a", "b", "c", "d"], 2)
+    assert q.choices == ("a", "b", "c", "d")
+    with pytest.raises(AttributeError):
+        q.answer = 1
+    with pytest.raises(AttributeError):
+        del q.question
+
+
+def test_dict_round_trip():
+    data = {"question": "Q ?", "choices": ["a", "b", "c", "d"], "answer": 1, "explain": "E", "category": "grammar"}
+    q = Question.from_dict(data, 5)
+    assert q.id == 5 and q.to_dict() == data
+    assert Question.from_dict(dict(data, audio="x.wav")).to_dict()["audio"] == "x.wav"
+    assert q == Question.from_dict(data, 5) and hash(q) == hash(Question.from_dict(data, 5))
+    assert q != Question.from_dict(data, 6)
+
+
+def test_is_correct():
+    q = Question(0, "Q ?", ["a", "b", "c", "d"], 2)
+    assert q.is_correct(2) and not q.is_correct(1) and not q.is_correct(None)
+
+
+@pytest.mark.parametrize("q", [
+    Question(0, "  ", ["a", "b", "c", "d"], 0),
+    Question(0, "Q ?", ["a", "b", "c"], 0),
+    Question(0, "Q ?", ["a", "b", "c", "d"], 4),
+    Question(0, "Q ?", ["a", "b", "c", "d"], -1),
+])
+def test_validate_question(q):
+    with pytest.raises(ValueError):
+        validate_question(q)
@@ -0,0 +1,56 @@
+from apfrench.render import Renderer
+
+
+class Widget:
+    def __init__(self):
+        self.calls = []
+
+    def configure(self, **options):
+        self.calls.append(options)
+
+
+class Variable:
+    def __init__(self):
+        self.values = []
+
+    def set(self, value):
+        self.values.append(value)
+
+
+def test_changes_are_applied_once_on_idle():
+    idle = []
+    renderer = Renderer(idle.append)
+    button, label = Widget(), Widget()
+    renderer.update(button, state="normal", text="Suivant")
+    renderer.update(label, text="Bonjour")
+    renderer.update(button, text="Valider")
+    assert len(idle) == 1 and button.calls == []
+    assert renderer.get(button, "text") == "Valider"
+    idle.pop()()
+    assert button.calls == [{"state": "normal", "text": "Valider"}]
+    assert label.calls == [{"text": "Bonjour"}]
+    assert renderer.configure_calls == 2
+
+
+def test_unchanged_options_are_dropped():
+    idle = []
+    renderer = Renderer(idle.append)
+    button = Widget()
+    renderer.update(button, state="normal")
+    idle.pop()()
+    renderer.update(button, state="normal")
+    assert idle == []
+    renderer.update(button, state="disabled")
+    renderer.update(button, state="normal")       # changed back before the flush
+    idle.pop()()
+    assert button.calls == [{"state": "normal"}]
+    assert renderer.get(button, "state") == "normal" and renderer.get(button, "width", 3) == 3
+
+
+def test_variables_are_set():
+    idle = []
+    renderer = Renderer(idle.append)
+    score = Variable()
+    renderer.update(score, value="2/5")
+    idle.pop()()
+    assert score.values == ["2/5"]
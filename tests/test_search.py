@@ -0,0 +1,86 @@
+import os
+
+from apfrench.bank import Bank, write_bank
+from apfrench.question import Question
+from apfrench.search import SearchIndex, fold, open_index, search_path, words
+
+QUESTIONS = [
+    Question(0, "Quel temps fait-il en été ?", ["Il fait chaud", "Il neige", "Il gèle", "Il pleut"], 0),
+    Question(1, "Où se trouve « la Tour Eiffel » ?", ["À Paris", "À Lyon", "À Nice", "À Lille"], 0),
+    Question(2, "Complétez : Hier, il ___ chaud.", ["faisait", "fait", "fera", "ferait"], 0, "L'imparfait."),
+    Question(3, "Le cœur de Paris ?", ["L'île de la Cité", "Montmartre", "La Défense", "Versailles"], 0),
+]
+
+
+def test_fold_and_words():
+    assert fold("« Été »") == "  ete  "
+    assert words("Le CŒUR d’Élise, l'été !") == ["le", "coeur", "d", "elise", "l", "ete"]
+
+
+def test_search():
+    index = SearchIndex.build(QUESTIONS)
+    assert len(index) == 4
+    assert index.search("ete") == [0]
+    assert index.search("Paris") == [1, 3]
+    assert index.search("paris coeur") == [3]
+    assert index.search("chau*") == [0, 2]
+    assert index.search("paris nowhere") == []
+    assert index.search("") == []
+    assert index.search("il", limit=2) == [0, 2]
+
+
+def test_phrases_need_the_bank():
+    index = SearchIndex.build(QUESTIONS)
+    assert index.search('"fait chaud"', QUESTIONS) == [0]
+    assert index.search('"fait chaud"') == [0, 2]
+
+
+def test_update_adds_new_questions():
+    index = SearchIndex.build(QUESTIONS[:2])
+    assert index.search("paris") == [1]
+    assert index.update(QUESTIONS) == 2
+    assert index.search("paris") == [1, 3]
+    assert index.matches(QUESTIONS)
+
+
+def test_matches_detects_edits():
+    index = SearchIndex.build(QUESTIONS)
+    edited = list(QUESTIONS)
+    edited[1] = Question(1, "Où se trouve le Louvre ?", ["Rue de Rivoli", "À Lyon", "À Nice", "À Lille"], 0)
+    assert not index.matches(edited)
+    assert not index.matches(QUESTIONS[:2])
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "bank.search")
+    index = SearchIndex.build(QUESTIONS)
+    index.save(path)
+    loaded = SearchIndex.load(path)
+    assert (len(loaded), loaded.vocabulary) == (len(index), index.vocabulary)
+    for query in ("paris", "chau*", "il"):
+        assert loaded.search(query) == index.search(query)
+    loaded.update(QUESTIONS + [Question(4, "Paris ou Lyon ?", ["a", "b", "c", "d"], 0)])
+    assert loaded.search("paris") == [1, 3, 4]
+
+
+def test_open_index_follows_the_bank(tmp_path):
+    bank_path = str(tmp_path / "bank.apfq")
+    assert search_path(bank_path) == os.path.join(str(tmp_path), "bank.search")
+    write_bank(bank_path, QUESTIONS)
+    with Bank(bank_path) as bank:
+        assert open_index(bank).search("paris") == [1, 3]
+    assert os.path.exists(search_path(bank_path))
+
+    # A question edited in the middle of the bank, with a new stamp
+    edited = list(QUESTIONS)
+    edited[1] = Question(1, "Où se trouve le Louvre ?", ["Rue de Rivoli", "À Lyon", "À Nice", "À Lille"], 0)
+    write_bank(bank_path, edited)
+    os.utime(bank_path, ns=(1, 1))
+    with Bank(bank_path) as bank:
+        index = open_index(bank)
+        assert index.search("paris") == [3] and index.search("louvre") == [1]
+
+    write_bank(bank_path, edited + [Question(4, "Paris ou Lyon ?", ["a", "b", "c", "d"], 0)])
+    with Bank(bank_path) as bank:
+        assert open_index(bank).search("paris") == [3, 4]
+    assert SearchIndex.load(search_path(bank_path)).search("paris") == [3, 4]
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+
+import pytest
+
+from apfrench import protocol
+from apfrench.client import RemoteEngine, RemoteError
+from apfrench.engine import SessionError
+from apfrench.server import QuizServer
+from apfrench.store import Store
+
+
+def start(server, **request):
+    return server.handle_request(None, {"op": "start", **request})
+
+
+def test_session_over_requests(bank):
+    server = QuizServer(bank, session_size=2, seed=3)
+    engine, reply = start(server)
+    assert reply["finished"] is False and reply["length"] == 2 and reply["seed"] == 3
+    assert "answer" not in reply and len(reply["choices"]) == 4
+    engine, reply = server.handle_request(engine, {"op": "answer", "choice": engine.current_answer_index})
+    assert reply["correct"] is True and reply["score"] == 1
+    assert reply["correct_text"] == bank[engine.current.id].choices[bank[engine.current.id].answer]
+    with pytest.raises(SessionError):     # handle_client replies {"error": ...}
+        server.handle_request(engine, {"op": "answer", "choice": 0})
+    engine, reply = server.handle_request(engine, {"op": "next"})
+    engine, reply = server.handle_request(engine, {"op": "time_up"})
+    assert (reply["score"], reply["attempted"]) == (1, 2)
+    engine, reply = server.handle_request(engine, {"op": "next"})
+    assert reply["finished"] is True and reply["percent"] == 50.0
+
+
+def test_same_seed_same_session(bank):
+    server = QuizServer(bank, session_size=3, seed=11)
+    assert start(server)[1] == start(server, student=7)[1]
+
+
+@pytest.mark.parametrize("request_", [{"op": "next"}, {"op": "answer", "choice": 0}])
+def test_start_comes_first(bank, request_):
+    assert "error" in QuizServer(bank).handle_request(None, request_)[1]
+
+
+@pytest.mark.parametrize("student", [-1, 1 << 32, "7", 1.5])
+def test_invalid_student(bank, student):
+    assert "error" in start(QuizServer(bank), student=student)[1]
+
+
+@pytest.mark.parametrize("request_", [[1], 5, "start", None])
+def test_requests_must_be_objects(bank, request_):
+    assert "error" in QuizServer(bank).handle_request(None, request_)[1]
+
+
+@pytest.mark.parametrize("field, value", [
+    ("session_size", True), ("session_size", 0), ("session_size", "5"), ("session_size", 2.5),
+    ("seed", "42"), ("seed", False), ("seed", 1.5),
+    ("categories", [1, 2]), ("categories", {"grammar": "1"}), ("categories", {"grammar": True}),
+])
+def test_invalid_start_fields(bank, field, value):
+    engine, reply = start(QuizServer(bank), **{field: value})
+    assert engine is None and "error" in reply
+
+
+def test_invalid_requests(bank):
+    server = QuizServer(bank, session_size=1)
+    engine, _ = start(server)
+    assert "error" in server.handle_request(engine, {"op": "answer", "choice": 4})[1]
+    assert "error" in server.handle_request(engine, {"op": "answer", "choice": True})[1]
+    assert "error" in server.handle_request(engine, {"op": "answer", "text": 3})[1]
+    assert "error" in server.handle_request(engine, {"op": "dance"})[1]
+    assert "error" in start(server, name="Camille")[1]      # no store to look names up in
+    assert "error" in start(server, name="  ")[1]
+
+
+def test_names_resolve_through_the_store(bank, tmp_path):
+    with Store(str(tmp_path / "progress.sqlite")) as store:
+        server = QuizServer(bank, session_size=1, journal=store)
+        engine, _ = start(server, name="Camille")
+        assert engine.student_id == store.student("Camille")
+        assert start(server, name="Camille")[0].student_id == engine.student_id
+
+
+def test_typed_answers_and_grade(bank):
+    server = QuizServer(bank, session_size=1, seed=1)
+    engine, _ = start(server)
+    q = bank[engine.current.id]
+    _, reply = server.handle_request(engine, {"op": "answer", "text": q.choices[q.answer]})
+    assert reply["correct"] is True and reply["verdict"] == "exact"
+    results = server.grade([[0, bank[0].choices[bank[0].answer]], [0, "non"], [len(bank), "x"], "bad"])
+    assert results[0]["correct"] is True and results[1]["correct"] is False
+    assert "error" in results[2] and "error" in results[3]
+    with pytest.raises(ValueError):
+        server.grade("not a list")
+
+
+def test_protocol_lines():
+    message = {"question": "Où ?", "n": 1}
+    line = protocol.encode(message)
+    assert line.endswith(b"\n") and b"\n" not in line[:-1]
+    assert protocol.decode(line) == message
+
+
+@pytest.fixture
+def served(bank):
+    """A QuizServer listening on a free port in a background event loop; yields the port."""
+    loop = asyncio.new_event_loop()
+    server = QuizServer(bank, session_size=3, seed=5)
+    listener = loop.run_until_complete(server.start("127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield listener.sockets[0].getsockname()[1]
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    listener.close()
+    loop.run_until_complete(listener.wait_closed())
+    loop.close()
+
+
+def test_malformed_lines_keep_the_connection(served):
+    remote = RemoteEngine("127.0.0.1", served, session_size=3)
+    try:
+        for line in (b"[1]\n", b"5\n", b"not json\n",
+                     b'{"op": "start", "categories": [1, 2]}\n'):
+            remote._file.write(line)
+            remote._file.flush()
+            assert "error" in protocol.decode(remote._file.readline())
+        remote.reset()
+        assert not remote.finished
+    finally:
+        remote.close()
+
+
+def test_remote_engine_plays_a_session(served, bank):
+    with RemoteEngine("127.0.0.1", served, session_size=3) as remote:
+        asked = []
+        while not remote.finished:
+            asked.append(remote.current.id)
+            q = bank[remote.current.id]
+            assert not remote.answered
+            assert remote.answer(remote.current_choices.index(q.choices[q.answer])) is True
+            assert remote.answered
+            with pytest.raises(RemoteError):
+                remote.answer(0)
+            remote.advance()
+        assert len(set(asked)) == 3
+        assert (remote.score_correct, remote.total_attempted, remote.percent()) == (3, 3, 100.0)
+        verdicts = remote.grade([(0, bank[0].choices[bank[0].answer]), (len(bank), "x")])
+        assert verdicts[0].correct and verdicts[1] is None
+    assert remote._sock.fileno() == -1
@@ -0,0 +1,82 @@
+import os
+
+from apfrench.bank import DEFAULT_BANK_PATH
+from apfrench.srs import DAY, DEFAULT_SCHEDULE_PATH, MIN_EASE, RELEARN_DELAY, Scheduler, grade, schedule_path
+
+NOW = 1_000_000.0
+
+
+def test_grade():
+    assert grade(False) == 0
+    assert grade(False, 3.0) == 1
+    assert grade(True) == 4
+    assert grade(True, 3.0) == 5
+    assert grade(True, 30.0) == 4
+
+
+def test_intervals_grow_and_reset():
+    s = Scheduler(3)
+    s.review(0, True, now=NOW)
+    assert s.due[0] == NOW + DAY
+    s.review(0, True, now=NOW)
+    assert s.due[0] == NOW + 6 * DAY
+    s.review(0, True, now=NOW)
+    assert s.interval[0] > 6
+    s.review(0, False, now=NOW)
+    assert (s.reps[0], s.due[0]) == (0, NOW + RELEARN_DELAY)
+
+
+def test_ease_has_a_floor():
+    s = Scheduler(1)
+    for _ in range(20):
+        s.review(0, False, now=NOW)
+    assert abs(s.ease[0] - MIN_EASE) < 1e-6
+
+
+def test_pick_session_order():
+    s = Scheduler(6)
+    s.review(0, True, now=NOW)                     # due in a day
+    s.review(1, False, now=NOW)                    # due in 10 minutes
+    s.review(2, False, now=NOW - 2 * RELEARN_DELAY)  # overdue
+    later = NOW + RELEARN_DELAY + 1
+    assert list(s.pick_session(3, now=later)) == [2, 1, 3]
+    assert list(s.pick_session(6, now=later)) == [2, 1, 3, 4, 5, 0]
+    # picking does not review: the same session comes back
+    assert list(s.pick_session(3, now=later)) == [2, 1, 3]
+
+
+def test_new_questions_come_in_bank_order():
+    s = Scheduler(4)
+    assert list(s.pick_session(10, now=NOW)) == [0, 1, 2, 3]
+    s.review(0, True, now=NOW)
+    assert list(s.pick_session(2, now=NOW)) == [1, 2]
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "bank.srs")
+    s = Scheduler(5)
+    s.review(3, True, now=NOW)
+    s.review(1, False, now=NOW)
+    s.save(path)
+    loaded = Scheduler.load(path, 5)
+    for name in ("due", "interval", "ease", "reps"):
+        assert getattr(loaded, name) == getattr(s, name)
+    assert list(loaded.pick_session(5, now=NOW + DAY)) == list(s.pick_session(5, now=NOW + DAY))
+
+
+def test_load_fits_the_bank(tmp_path):
+    path = str(tmp_path / "bank.srs")
+    s = Scheduler(5)
+    s.review(4, False, now=NOW)
+    s.save(path)
+    grown = Scheduler.load(path, 8)
+    assert len(grown) == 8 and grown.due[4] == s.due[4]
+    shrunk = Scheduler.load(path, 3)
+    assert len(shrunk) == 3
+    assert list(shrunk.pick_session(5, now=NOW + DAY)) == [0, 1, 2]
+    assert len(Scheduler.load(str(tmp_path / "missing.srs"), 4)) == 4
+
+
+def test_schedule_path():
+    assert schedule_path(DEFAULT_BANK_PATH) == DEFAULT_SCHEDULE_PATH
+    assert schedule_path(os.path.join("x", "mine.apfq")) == os.path.join("x", "mine.srs")
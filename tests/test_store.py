@@ -0,0 +1,73 @@
+import pytest
+
+from apfrench.engine import QuizEngine
+from apfrench.journal import TIMED_OUT, Journal
+from apfrench.store import Store, import_journal
+
+
+@pytest.fixture
+def store(tmp_path):
+    with Store(str(tmp_path / "progress.sqlite"), batch_size=4, sync_interval=0.05) as s:
+        yield s
+
+
+def test_students_get_stable_ids(store):
+    camille = store.student("Camille")
+    other = store.student("Noé")
+    assert camille != other
+    assert store.student("Camille") == camille
+
+
+def test_answers_are_committed(store):
+    session = store.start_session(1, seed=5, length=3)
+    store.append(1, 10, 0, 1, 1200, session_id=session)
+    store.append(1, 11, TIMED_OUT, 0, 30000, session_id=session)
+    store.append(1, 10, 2, 0, 2000, session_id=session)
+    store.flush()
+    assert store.counts() == {"students": 0, "sessions": 1, "answers": 3}
+    [(session_id, _started, length, answered, correct)] = store.student_sessions(1)
+    assert (session_id, length, answered, correct) == (session, 3, 3, 1)
+    answered, correct, mean_ms = store.student_totals(1)
+    assert (answered, correct) == (3, 1) and mean_ms == pytest.approx(11066.67, abs=0.01)
+    assert store.weak_questions(1) == [(10, 2, 1)]
+    assert store.question_stats(10)[:2] == (2, 1)
+    assert store.question_stats(10, since=2e10) == (0, 0, 0)
+
+
+def test_full_and_partial_batches_are_committed(store):
+    for i in range(4):
+        store.append(2, i, 0, 1, 100)
+    store.append(2, 9, 0, 1, 100)
+    store.close()
+    with Store(store.path) as reopened:
+        assert reopened.counts()["answers"] == 5
+
+
+def test_engines_file_answers_under_their_own_session(store, questions):
+    engines = [QuizEngine(questions, session_size=3, journal=store, student_id=0, seed=s) for s in (1, 2)]
+    for _ in range(3):
+        for engine in engines:
+            engine.answer(engine.current_answer_index)
+            engine.advance()
+    store.flush()
+    assert engines[0].session_id != engines[1].session_id
+    sessions = store.student_sessions(0)
+    assert sorted(s[0] for s in sessions) == sorted(e.session_id for e in engines)
+    assert [(s[3], s[4]) for s in sessions] == [(3, 3), (3, 3)]
+
+
+def test_two_stores_share_a_file(tmp_path):
+    path = str(tmp_path / "progress.sqlite")
+    with Store(path) as first, Store(path) as second:
+        ids = {first.start_session(1, 0, 1), second.start_session(1, 0, 1)}
+        assert len(ids) == 2
+        assert first.student("Camille") == second.student("Camille")
+
+
+def test_import_journal(store, tmp_path):
+    path = str(tmp_path / "results.journal")
+    with Journal(path) as journal:
+        for i in range(10):
+            journal.append(3, i, 0, i % 2, 500, timestamp=1000.0 + i)
+    assert import_journal(store, path) == 10
+    assert store.student_totals(3)[:2] == (10, 5)
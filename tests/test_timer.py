@@ -0,0 +1,67 @@
+from apfrench.timer import Countdown
+
+
+class Loop:
+    """A simulated event loop with a settable clock."""
+    def __init__(self):
+        self.now = 0.0
+        self.pending = {}
+        self.next_handle = 0
+
+    def after(self, ms, callback):
+        self.next_handle += 1
+        self.pending[self.next_handle] = (self.now + ms / 1000, callback)
+        return self.next_handle
+
+    def after_cancel(self, handle):
+        del self.pending[handle]
+
+    def run(self, until, lag=0.0):
+        while self.pending:
+            handle, (when, callback) = min(self.pending.items(), key=lambda item: item[1][0])
+            if when > until:
+                break
+            del self.pending[handle]
+            self.now = when + lag
+            callback()
+        self.now = max(self.now, until)
+
+
+def countdown(loop, ticks, expired):
+    return Countdown(loop.after, loop.after_cancel, ticks.append, lambda: expired.append(loop.now),
+                     clock=lambda: loop.now)
+
+
+def test_ticks_every_second_and_expires_on_time():
+    loop, ticks, expired = Loop(), [], []
+    timer = countdown(loop, ticks, expired)
+    timer.start(3)
+    assert timer.running and timer.remaining() == 3
+    loop.run(10)
+    assert ticks == [3, 2, 1, 0]
+    assert len(expired) == 1 and 3.0 <= expired[0] < 3.01
+    assert not timer.running and timer.remaining() == 0.0
+
+
+def test_late_ticks_do_not_make_it_run_long():
+    loop, ticks, expired = Loop(), [], []
+    countdown(loop, ticks, expired).start(5)
+    loop.run(20, lag=0.3)
+    assert ticks[-1] == 0 and expired[0] < 5.4
+
+
+def test_cancel_and_call_later():
+    loop, ticks, expired = Loop(), [], []
+    timer = countdown(loop, ticks, expired)
+    timer.start(3)
+    timer.cancel()
+    loop.run(10)
+    assert ticks == [3] and expired == [] and not loop.pending
+    fired = []
+    timer.call_later(500, lambda: fired.append(loop.now))
+    timer.start(2)      # a new question cancels the pending callback
+    loop.run(20)
+    assert fired == [] and len(expired) == 1
+    timer.call_later(500, lambda: fired.append(loop.now))
+    loop.run(30)
+    assert fired == [20.5]